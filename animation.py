@@ -0,0 +1,124 @@
+"""
+Animation support for Athkar Reminder application.
+Tracks every scheduled Tk callback so nothing is left running after a
+window is hidden or destroyed.
+"""
+
+import time
+
+# Easing functions mapping progress 0..1 to eased progress 0..1
+EASINGS = {
+    "linear": lambda t: t,
+    "ease_in": lambda t: t * t,
+    "ease_out": lambda t: 1 - (1 - t) * (1 - t),
+    "ease_in_out": lambda t: 2 * t * t if t < 0.5 else 1 - 2 * (1 - t) * (1 - t),
+}
+
+
+class Animator:
+    """
+    Runs animations and delayed callbacks on a Tk widget.
+
+    Every after() handle is tracked and cancelled by cancel_all() or when
+    the widget is destroyed. Window alpha is kept in Python so fades never
+    read it back from Tk.
+
+    Args:
+        widget: The Tk widget (usually a Toplevel) that owns the callbacks
+        frame_budget (int): Maximum number of frames drawn per animation
+        min_frame_ms (int): Shortest delay between two frames
+    """
+
+    def __init__(self, widget, frame_budget=12, min_frame_ms=15):
+        self.widget = widget
+        self.frame_budget = frame_budget
+        self.min_frame_ms = min_frame_ms
+        self.alpha = 0.0
+        self._after_ids = set()
+        self._animation = None
+
+        widget.bind("<Destroy>", self._on_destroy, add="+")
+
+    def after(self, delay_ms, callback):
+        """Schedule a tracked one-shot callback and return its handle"""
+        def run():
+            self._after_ids.discard(after_id)
+            callback()
+
+        after_id = self.widget.after(delay_ms, run)
+        self._after_ids.add(after_id)
+        return after_id
+
+    def cancel(self, after_id):
+        """Cancel one tracked callback"""
+        if after_id in self._after_ids:
+            self._after_ids.discard(after_id)
+            self.widget.after_cancel(after_id)
+
+    def cancel_all(self):
+        """Cancel every pending callback, including running animations"""
+        for after_id in list(self._after_ids):
+            try:
+                self.widget.after_cancel(after_id)
+            except Exception:
+                pass
+        self._after_ids.clear()
+        self._animation = None
+
+    def set_alpha(self, alpha):
+        """Set the window alpha immediately, stopping any fade"""
+        self.stop()
+        self._apply_alpha(alpha)
+
+    def fade_to(self, target, duration=200, easing="ease_out", on_done=None):
+        """
+        Fade the window alpha to target over duration milliseconds.
+
+        Starting a new fade replaces the running one, so two fades can never
+        fight over the same window.
+        """
+        self.stop()
+        frames = max(1, min(self.frame_budget, duration // self.min_frame_ms))
+        self._animation = {
+            "start": self.alpha,
+            "target": target,
+            "begin": time.perf_counter(),
+            "duration": max(duration, 1) / 1000,
+            "frame_ms": max(self.min_frame_ms, duration // frames),
+            "ease": EASINGS.get(easing, EASINGS["linear"]),
+            "on_done": on_done,
+            "after_id": None,
+        }
+        self._step(self._animation)
+
+    def stop(self):
+        """Stop the running animation, leaving alpha where it is"""
+        if self._animation is not None:
+            self.cancel(self._animation["after_id"])
+            self._animation = None
+
+    def _step(self, animation):
+        if animation is not self._animation:
+            return
+
+        # Time based progress so a busy event loop drops frames instead of slowing down
+        progress = min(1.0, (time.perf_counter() - animation["begin"]) / animation["duration"])
+        eased = animation["ease"](progress)
+        self._apply_alpha(animation["start"] + (animation["target"] - animation["start"]) * eased)
+
+        if progress < 1.0:
+            animation["after_id"] = self.after(animation["frame_ms"], lambda: self._step(animation))
+        else:
+            self._animation = None
+            if animation["on_done"]:
+                animation["on_done"]()
+
+    def _apply_alpha(self, alpha):
+        alpha = max(0.0, min(1.0, alpha))
+        if alpha != self.alpha:
+            self.alpha = alpha
+            self.widget.attributes('-alpha', alpha)
+
+    def _on_destroy(self, event):
+        if event.widget is self.widget:
+            self.cancel_all()
@@ -0,0 +1,46 @@
+"""
+Arabic text helpers for Athkar Reminder application.
+Normalises fully vowelled duaa text so it can be searched and compared
+without caring about tashkeel or spelling variants.
+"""
+
+# Harakat, tanween, shadda, sukun, superscript alef and Quranic marks
+TASHKEEL_RANGES = [(0x0610, 0x061A), (0x064B, 0x065F), (0x0670, 0x0670), (0x06D6, 0x06ED)]
+
+# Tatweel (kashida) used to stretch words
+TATWEEL = "\u0640"
+
+# Letter variants folded to one form
+LETTER_FOLDING = {
+    "أ": "ا",
+    "إ": "ا",
+    "آ": "ا",
+    "ٱ": "ا",
+    "ى": "ي",
+    "ؤ": "و",
+    "ئ": "ي",
+    "ة": "ه",
+}
+
+# One translation table doing all of the above in a single pass
+NORMALIZE_TABLE = str.maketrans(LETTER_FOLDING)
+NORMALIZE_TABLE[ord(TATWEEL)] = None
+for first, last in TASHKEEL_RANGES:
+    for code in range(first, last + 1):
+        NORMALIZE_TABLE[code] = None
+
+
+def normalize(text):
+    """
+    Normalise Arabic text for searching and comparison.
+
+    Removes harakat and tatweel, folds alef/hamza, alef maqsura and
+    ta marbuta variants and lowercases any Latin text.
+
+    Args:
+        text (str): Text to normalise
+
+    Returns:
+        str: Normalised text
+    """
+    return text.translate(NORMALIZE_TABLE).lower()
@@ -0,0 +1,167 @@
+"""
+Image asset cache for Athkar Reminder application.
+
+Widget backgrounds and the tray icon are rendered once per size and
+colour, kept in memory and saved as PNG files so later runs load them
+without drawing anything. Pillow is only imported when an image actually
+has to be rendered (or handed to pystray); Tk reads the cached PNGs
+itself.
+"""
+
+import base64
+import hashlib
+import io
+import os
+import tempfile
+
+# Bump when a renderer changes so stale PNGs on disk are not reused
+ASSET_VERSION = 1
+
+
+def render_rounded_rectangle(width, height, radius, fill_color):
+    """Render a rounded rectangle for modern buttons/widgets"""
+    from PIL import Image, ImageDraw
+    image = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    draw.rounded_rectangle([(0, 0), (width-1, height-1)], radius, fill=fill_color)
+    return image
+
+
+def render_circle(diameter, fill_color):
+    """Render a circle"""
+    from PIL import Image, ImageDraw
+    image = Image.new("RGBA", (diameter, diameter), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    draw.ellipse([(0, 0), (diameter-1, diameter-1)], fill=fill_color)
+    return image
+
+
+def render_tray_icon(size, color, text):
+    """Render the default tray icon, a coloured square with text"""
+    from PIL import Image, ImageDraw
+    img = Image.new('RGBA', (size, size), color=color)
+    d = ImageDraw.Draw(img)
+
+    # Try to use a system font
+    try:
+        from PIL import ImageFont
+        font = ImageFont.truetype("arial.ttf", size // 2)
+        d.text((size // 4, size // 4), text, fill="white", font=font)
+    except Exception:
+        # Fallback if font loading fails
+        d.text((size // 4, size // 4), text, fill="white")
+
+    return img
+
+
+# Renderers by asset kind, each returns a PIL image
+RENDERERS = {
+    "rounded_rectangle": render_rounded_rectangle,
+    "circle": render_circle,
+    "tray_icon": render_tray_icon,
+}
+
+
+class AssetCache:
+    """
+    Two-level (memory + disk) cache of rendered images.
+
+    Assets are identified by their kind and render parameters, e.g.
+    ("rounded_rectangle", 120, 36, 18, "#4a6cd4").
+
+    Args:
+        directory (str): Folder for the PNG files, None to keep them in memory only
+    """
+
+    def __init__(self, directory="asset_cache"):
+        self.directory = directory
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._png = {}      # key -> PNG bytes
+        self._photos = {}   # key -> tk.PhotoImage
+
+    def png(self, kind, *params):
+        """Return the PNG bytes of an asset, rendering it only if no cache has it"""
+        key = (kind,) + params
+        data = self._png.get(key)
+        if data is not None:
+            self.hits += 1
+            return data
+
+        path = self._path(key)
+        if path and os.path.exists(path):
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+                self.disk_hits += 1
+            except OSError as e:
+                print(f"Error reading cached asset: {e}")
+                data = None
+
+        if data is None:
+            self.misses += 1
+            buffer = io.BytesIO()
+            RENDERERS[kind](*params).save(buffer, format="PNG")
+            data = buffer.getvalue()
+            self._store(path, data)
+
+        self._png[key] = data
+        return data
+
+    def photo(self, kind, *params):
+        """Return a Tk PhotoImage of an asset (shared, so it is never garbage collected)"""
+        key = (kind,) + params
+        photo = self._photos.get(key)
+        if photo is None:
+            import tkinter as tk
+            # Tk 8.6 decodes PNG natively, no Pillow needed
+            photo = tk.PhotoImage(data=base64.b64encode(self.png(kind, *params)), format="png")
+            self._photos[key] = photo
+        return photo
+
+    def pil_image(self, kind, *params):
+        """Return an asset as a PIL image (for pystray)"""
+        from PIL import Image
+        return Image.open(io.BytesIO(self.png(kind, *params)))
+
+    def stats(self):
+        """Return the memory hit, disk hit and render counters"""
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses}
+
+    def clear(self):
+        """Forget the in-memory copies (the PNG files are kept)"""
+        self._png.clear()
+        self._photos.clear()
+
+    def _path(self, key):
+        """Return the PNG file for a key, named by its kind and a parameter hash"""
+        if not self.directory:
+            return None
+        digest = hashlib.sha1(repr((ASSET_VERSION,) + key).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.directory, f"{key[0]}-{digest}.png")
+
+    def _store(self, path, data):
+        """Write a rendered PNG atomically so a crash never leaves half a file"""
+        if not path:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(prefix=".tmp-", dir=self.directory)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Error caching asset: {e}")
+
+
+# Shared cache used by the widgets
+_cache = None
+
+
+def get_asset_cache():
+    """Return the shared asset cache"""
+    global _cache
+    if _cache is None:
+        _cache = AssetCache()
+    return _cache
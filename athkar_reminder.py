@@ -1,23 +1,41 @@
 import tkinter as tk
-from tkinter import ttk, font, PhotoImage, messagebox
+from tkinter import ttk, font, PhotoImage, filedialog, messagebox
 import json
 import os
-import random
 import time
 import threading
 from datetime import datetime
-import winreg
-import ctypes
 import sys
-from PIL import Image, ImageTk, ImageDraw  # For modern UI elements
 import io
 
 # Import language support
-from languages import get_text, LANGUAGES
+from languages import get_text, is_rtl, language_names
 
 # Import version information
 from version import get_version
 
+# Import the headless reminder engine and its Tk timer backend
+from engine import ReminderEngine, SettingsStore
+from scheduler import TkTimer
+
+# Import the duaa search index
+from search import DuaaSearchIndex, SearchResults
+
+# Import the animation engine used by notifications
+from animation import Animator
+
+# Import theme detection and style tables
+from theme import CachedThemeSource, ThemeManager
+
+# Import the platform adapters (OS modules are imported on demand)
+from platforms import get_platform
+
+# Import the image asset cache (Pillow is imported on demand)
+from assets import get_asset_cache
+
+# Import single-instance support (later launches forward their command)
+from instance import InstanceError, SingleInstance, send_command
+
 # Try to import pystray for system tray functionality
 try:
     import pystray
@@ -26,64 +44,84 @@ try:
 except ImportError:
     SYSTEM_TRAY_AVAILABLE = False
 
+# File types offered when importing or exporting duaas
+DUAA_FILE_TYPES = [
+    ("JSON", "*.json"),
+    ("JSON Lines", "*.jsonl"),
+    ("CSV", "*.csv"),
+    ("Text", "*.txt"),
+]
+
+# Windows 11 style notification colors
+NOTIFICATION_COLORS = {
+    "dark": {
+        "bg": "#202020",
+        "fg": "#FFFFFF",
+        "accent": "#2D2D2D",
+        "hover": "#404040",
+        "button_hover": "#404040"
+    },
+    "light": {
+        "bg": "#FFFFFF",
+        "fg": "#202020",
+        "accent": "#F5F5F5",
+        "hover": "#E8E8E8",
+        "button_hover": "#E8E8E8"
+    }
+}
+
 class NotificationWindow:
-    def __init__(self, message, is_dark_mode):
-        self.root = tk.Toplevel()
+    """
+    Notification popup that is built once and reused for every reminder.
+
+    Between reminders the window is only withdrawn; show() swaps the
+    message text and, if the theme changed, the colours.
+    """
+    def __init__(self, master=None, platform=None):
+        self.platform = platform or get_platform()
+        self.root = tk.Toplevel(master)
+        self.root.withdraw()
         self.root.title("")
         self.root.attributes('-topmost', True)
         self.root.overrideredirect(True)
         self.root.attributes('-alpha', 0.0)
 
-        # Windows 11 style colors
-        if is_dark_mode:
-            bg_color = "#202020"
-            fg_color = "#FFFFFF"
-            accent_color = "#2D2D2D"
-            hover_color = "#404040"
-            button_hover = "#404040"
-        else:
-            bg_color = "#FFFFFF"
-            fg_color = "#202020"
-            accent_color = "#F5F5F5"
-            hover_color = "#E8E8E8"
-            button_hover = "#E8E8E8"
+        self.message = ""
+        self.mode = None
+        self.colors = NOTIFICATION_COLORS["light"]
+        self.x = None
+        self.y = None
+        self._auto_close_id = None
+        self._rounded_size = None
 
-        # Set the background color for the window
-        self.root.configure(bg=bg_color)
+        # Tracks every after() handle of this window and keeps alpha in Python
+        self.animator = Animator(self.root)
 
         # Create main container
-        self.frame = tk.Frame(self.root, bg=bg_color)
+        self.frame = tk.Frame(self.root)
         self.frame.pack(fill=tk.BOTH, expand=True, padx=1, pady=1)
 
         # Title bar (Windows 11 style - smaller height)
-        title_bar = tk.Frame(self.frame, bg=bg_color, height=25)  # Reduced height
-        title_bar.pack(fill=tk.X)
-        title_bar.pack_propagate(False)
+        self.title_bar = tk.Frame(self.frame, height=25)  # Reduced height
+        self.title_bar.pack(fill=tk.X)
+        self.title_bar.pack_propagate(False)
 
         # Close button container (for hover effect)
-        close_container = tk.Frame(title_bar, bg=bg_color)
-        close_container.pack(side=tk.RIGHT)
+        self.close_container = tk.Frame(self.title_bar)
+        self.close_container.pack(side=tk.RIGHT)
 
         # Modern close button - smaller
-        close_button = tk.Button(close_container, text="✕", command=self.close,
-                               font=("Segoe UI", 9), bg=bg_color, fg=fg_color,  # Smaller font
+        self.close_button = tk.Button(self.close_container, text="✕", command=self.close,
+                               font=("Segoe UI", 9),  # Smaller font
                                relief=tk.FLAT, highlightthickness=0, borderwidth=0,
                                padx=10, pady=4, cursor="hand2")  # Reduced padding
-        close_button.pack(side=tk.RIGHT)
-
-        def on_close_enter(e):
-            close_container.configure(bg="#C42B1C")
-            close_button.configure(bg="#C42B1C", fg="#FFFFFF")
-        def on_close_leave(e):
-            close_container.configure(bg=bg_color)
-            close_button.configure(bg=bg_color, fg=fg_color)
+        self.close_button.pack(side=tk.RIGHT)
 
-        close_container.bind("<Enter>", on_close_enter)
-        close_container.bind("<Leave>", on_close_leave)
-        close_button.bind("<Enter>", on_close_enter)
-        close_button.bind("<Leave>", on_close_leave)
+        for widget in (self.close_container, self.close_button):
+            widget.bind("<Enter>", self._on_close_enter)
+            widget.bind("<Leave>", self._on_close_leave)
 
-        # Get available fonts
+        # Get available fonts (once per window instead of once per reminder)
         available_fonts = font.families()
         best_fonts = [
             "Segoe UI",
@@ -104,50 +142,59 @@ class NotificationWindow:
         message_font = next((f for f in best_fonts if f in available_fonts), "Arial")
 
         # Get screen dimensions
-        screen_width = self.root.winfo_screenwidth()
-        screen_height = self.root.winfo_screenheight()
-        desired_width = min(400, screen_width // 4)  # Reduce the width
+        self.screen_width = self.root.winfo_screenwidth()
+        self.screen_height = self.root.winfo_screenheight()
+        self.desired_width = min(400, self.screen_width // 4)  # Reduce the width
 
         # Content area with message
-        content_frame = tk.Frame(self.frame, bg=bg_color)
-        content_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(5, 5))
+        self.content_frame = tk.Frame(self.frame)
+        self.content_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(5, 5))
 
         # Message label with adaptive size
-        self.message = message
-        self.label = tk.Label(content_frame, text=message,
-                          bg=bg_color, fg=fg_color,
+        self.label = tk.Label(self.content_frame,
                           font=(message_font, 18, "bold"),  # Increased font size for better readability
                           justify="center",
-                          wraplength=desired_width - 40)  # More text per line
+                          wraplength=self.desired_width - 40)  # More text per line
         self.label.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)  # Smaller padding
 
         # Bottom frame (always visible but smaller)
-        self.bottom_frame = tk.Frame(self.frame, bg=bg_color, height=30)  # Reduced height
+        self.bottom_frame = tk.Frame(self.frame, height=30)  # Reduced height
         self.bottom_frame.pack(fill=tk.X, side=tk.BOTTOM)
         self.bottom_frame.pack_propagate(False)
 
         # Modern copy button with background hover effect - smaller
-        copy_container = tk.Frame(self.bottom_frame, bg=bg_color)
-        copy_container.pack(side=tk.RIGHT, padx=10, pady=2)  # Reduced padding
+        self.copy_container = tk.Frame(self.bottom_frame)
+        self.copy_container.pack(side=tk.RIGHT, padx=10, pady=2)  # Reduced padding
 
-        copy_button = tk.Button(copy_container, text="📋", command=self.copy_text,
-                               bg=bg_color, fg=fg_color,
+        self.copy_button = tk.Button(self.copy_container, text="📋", command=self.copy_text,
                                relief=tk.FLAT, borderwidth=0,
                                font=("Segoe UI", 12),  # Smaller font
                                cursor="hand2", padx=6, pady=1)  # Reduced padding
-        copy_button.pack()
+        self.copy_button.pack()
+
+        for widget in (self.copy_container, self.copy_button):
+            widget.bind("<Enter>", self._on_copy_enter)
+            widget.bind("<Leave>", self._on_copy_leave)
+
+        # Widgets recoloured when the theme changes
+        self.bg_widgets = [self.root, self.frame, self.title_bar, self.close_container,
+                           self.close_button, self.content_frame, self.label,
+                           self.bottom_frame, self.copy_container, self.copy_button]
+        self.fg_widgets = [self.close_button, self.label, self.copy_button]
 
-        def on_copy_enter(e):
-            copy_container.configure(bg=button_hover)
-            copy_button.configure(bg=button_hover)
-        def on_copy_leave(e):
-            copy_container.configure(bg=bg_color)
-            copy_button.configure(bg=bg_color)
+        # Window dragging
+        for widget in [self.title_bar, self.label, self.content_frame]:
+            widget.bind("<Button-1>", self.start_move)
+            widget.bind("<ButtonRelease-1>", self.stop_move)
+            widget.bind("<B1-Motion>", self.on_motion)
 
-        copy_container.bind("<Enter>", on_copy_enter)
-        copy_container.bind("<Leave>", on_copy_leave)
-        copy_button.bind("<Enter>", on_copy_enter)
-        copy_button.bind("<Leave>", on_copy_leave)
+    def show(self, message, is_dark_mode):
+        """Show a message, reusing the existing widgets"""
+        self.cancel_timers()
+        self.apply_colors(is_dark_mode)
+
+        self.message = message
+        self.label.configure(text=message)
 
         # Update UI for size calculation
         self.root.update_idletasks()
@@ -157,75 +204,99 @@ class NotificationWindow:
 
         # Determine content height based on text length - shorter text gets smaller window
         text_length = len(message)
+        content_height = label_height
         if text_length < 30:  # Very short text
-            content_height = label_height
             extra_space = 60  # Minimal extra space
         elif text_length < 100:  # Medium text
-            content_height = label_height
             extra_space = 65
         else:  # Longer text
-            content_height = label_height
             extra_space = 70
 
         # Set content frame height based on content
-        content_frame.configure(height=content_height)
-        content_frame.pack_propagate(False)
+        self.content_frame.configure(height=content_height)
+        self.content_frame.pack_propagate(False)
 
         # Calculate window size - truly adaptive
-        window_width = desired_width
+        window_width = self.desired_width
         window_height = content_height + extra_space  # Dynamic spacing
         window_height = max(90, min(400, window_height))  # Even lower minimum
 
         # Position window
-        x_position = screen_width - window_width - 20
-        y_position = screen_height - window_height - 40
+        x_position = self.screen_width - window_width - 20
+        y_position = self.screen_height - window_height - 40
 
         # Set window size and position
         self.root.geometry(f"{window_width}x{window_height}+{x_position}+{y_position}")
+        self.root.deiconify()
 
-        # Make window corners rounded (Windows 11 style)
-        self.root.after(10, lambda: self.make_rounded())
+        # Make window corners rounded (Windows 11 style), only needed when the size changed
+        if self._rounded_size != (window_width, window_height):
+            self.animator.after(10, lambda: self.make_rounded((window_width, window_height)))
 
         # Fade in animation
         self.fade_in()
 
         # Auto close after 2 minutes
-        self.root.after(120000, self.fade_out)
+        self._auto_close_id = self.animator.after(120000, self.fade_out)
 
-        # Window dragging
-        for widget in [title_bar, self.label, content_frame]:
-            widget.bind("<Button-1>", self.start_move)
-            widget.bind("<ButtonRelease-1>", self.stop_move)
-            widget.bind("<B1-Motion>", self.on_motion)
-
-    def make_rounded(self):
-        """Make window corners rounded using Windows API"""
+    def apply_colors(self, is_dark_mode):
+        """Recolour the widgets if the theme changed since the last show"""
+        mode = "dark" if is_dark_mode else "light"
+        if mode == self.mode:
+            return
+        self.mode = mode
+        self.colors = NOTIFICATION_COLORS[mode]
+        for widget in self.bg_widgets:
+            widget.configure(bg=self.colors["bg"])
+        for widget in self.fg_widgets:
+            widget.configure(fg=self.colors["fg"])
+
+    def _on_close_enter(self, event):
+        self.close_container.configure(bg="#C42B1C")
+        self.close_button.configure(bg="#C42B1C", fg="#FFFFFF")
+
+    def _on_close_leave(self, event):
+        self.close_container.configure(bg=self.colors["bg"])
+        self.close_button.configure(bg=self.colors["bg"], fg=self.colors["fg"])
+
+    def _on_copy_enter(self, event):
+        self.copy_container.configure(bg=self.colors["button_hover"])
+        self.copy_button.configure(bg=self.colors["button_hover"])
+
+    def _on_copy_leave(self, event):
+        self.copy_container.configure(bg=self.colors["bg"])
+        self.copy_button.configure(bg=self.colors["bg"])
+
+    def make_rounded(self, size=None):
+        """Make window corners rounded (Windows 11 style radius) where supported"""
+        self._rounded_size = size
         try:
-            from win32gui import GetWindowRect, SetWindowRgn, CreateRoundRectRgn
-            hwnd = self.root.winfo_id()
-            rect = GetWindowRect(hwnd)
-            width = rect[2] - rect[0]
-            height = rect[3] - rect[1]
-            region = CreateRoundRectRgn(0, 0, width, height, 12, 12)  # Windows 11 style corner radius
-            SetWindowRgn(hwnd, region, True)
-        except ImportError:
-            pass
+            self.platform.shape_window(self.root, radius=12)
+        except Exception as e:
+            print(f"Error shaping notification window: {e}")
+
+    def cancel_timers(self):
+        """Cancel pending fade and auto-close callbacks"""
+        self.animator.cancel_all()
+        self._auto_close_id = None
 
     def fade_in(self):
-        alpha = self.root.attributes('-alpha')
-        if alpha < 1.0:
-            alpha += 0.1
-            self.root.attributes('-alpha', alpha)
-            self.root.after(20, self.fade_in)
+        self.animator.fade_to(1.0, duration=200, easing="ease_out")
 
     def fade_out(self):
-        alpha = self.root.attributes('-alpha')
-        if alpha > 0.0:
-            alpha -= 0.1
-            self.root.attributes('-alpha', alpha)
-            self.root.after(20, self.fade_out)
-        else:
-            self.root.destroy()
+        # Replaces any running fade, so only one fade chain can exist
+        self.animator.fade_to(0.0, duration=200, easing="ease_in", on_done=self.hide)
+
+    def hide(self):
+        """Hide the window until the next reminder"""
+        self.cancel_timers()
+        self.animator.set_alpha(0.0)
+        self.root.withdraw()
+
+    def destroy(self):
+        """Destroy the window for good"""
+        self.cancel_timers()
+        self.root.destroy()
 
     def copy_text(self):
         self.root.clipboard_clear()
@@ -249,25 +320,20 @@ class NotificationWindow:
             self.root.geometry(f"+{x}+{y}")
 
     def close(self):
+        self.cancel_timers()
         self.fade_out()
 
 class ModernWidget:
     """Base class for creating modern-looking widgets"""
     @staticmethod
     def create_rounded_rectangle(width, height, radius, fill_color):
-        """Create a rounded rectangle image for modern buttons/widgets"""
-        image = Image.new("RGBA", (width, height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(image)
-        draw.rounded_rectangle([(0, 0), (width-1, height-1)], radius, fill=fill_color)
-        return ImageTk.PhotoImage(image)
+        """Get a rounded rectangle image for modern buttons/widgets (rendered once per size and colour)"""
+        return get_asset_cache().photo("rounded_rectangle", width, height, radius, fill_color)
 
     @staticmethod
     def create_circle(diameter, fill_color):
-        """Create a circle image"""
-        image = Image.new("RGBA", (diameter, diameter), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(image)
-        draw.ellipse([(0, 0), (diameter-1, diameter-1)], fill=fill_color)
-        return ImageTk.PhotoImage(image)
+        """Get a circle image (rendered once per size and colour)"""
+        return get_asset_cache().photo("circle", diameter, fill_color)
 
 class ModernButton(tk.Canvas):
     """A modern-looking button with rounded corners and hover effects"""
@@ -379,10 +445,313 @@ class ModernToggle(tk.Canvas):
         if self.is_on != state:
             self.toggle()
 
+class VirtualListbox(ttk.Frame):
+    """
+    A listbox that only materialises the rows currently visible.
+
+    Rows are pulled on demand from a data source, so the widget costs the
+    same for ten entries or a hundred thousand. The source needs:
+        __len__()             - number of rows
+        page(offset, limit)   - list of (key, text) pairs
+    """
+    def __init__(self, parent, source, **listbox_options):
+        super().__init__(parent)
+        self.source = source
+        self.first = 0            # Absolute index of the top visible row
+        self.visible_rows = listbox_options.get("height", 10)
+        self.selected_index = None
+        self._keys = []
+
+        self.scrollbar = ttk.Scrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.listbox = tk.Listbox(self, exportselection=False, activestyle="none",
+                                  **listbox_options)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # Height of one row, used to work out how many rows fit
+        row_font = font.Font(font=self.listbox.cget("font"))
+        self.row_height = row_font.metrics("linespace") + 2 * int(self.listbox.cget("selectborderwidth"))
+
+        self.listbox.bind("<Configure>", self._on_resize)
+        self.listbox.bind("<<ListboxSelect>>", self._on_select)
+        self.listbox.bind("<MouseWheel>", self._on_mousewheel)
+        self.listbox.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.listbox.bind("<Button-5>", lambda e: self.scroll(3))
+        self.listbox.bind("<Up>", lambda e: self._move_selection(-1))
+        self.listbox.bind("<Down>", lambda e: self._move_selection(1))
+        self.listbox.bind("<Prior>", lambda e: self._move_selection(-self.visible_rows))
+        self.listbox.bind("<Next>", lambda e: self._move_selection(self.visible_rows))
+
+    def set_source(self, source):
+        """Show rows from another data source"""
+        self.source = source
+        self.first = 0
+        self.selected_index = None
+        self.refresh()
+
+    def refresh(self):
+        """Re-read the visible rows from the data source"""
+        total = len(self.source)
+        self.first = max(0, min(self.first, total - self.visible_rows))
+
+        # One extra row so a partially visible last line is filled too
+        rows = self.source.page(self.first, self.visible_rows + 1)
+        self._keys = [key for key, text in rows]
+        self.listbox.delete(0, tk.END)
+        if rows:
+            self.listbox.insert(tk.END, *[text for key, text in rows])
+
+        # Restore the selection if it is on screen
+        if self.selected_index is not None:
+            if self.selected_index >= total:
+                self.selected_index = None
+            elif self.first <= self.selected_index < self.first + len(rows):
+                self.listbox.selection_set(self.selected_index - self.first)
+
+        if total:
+            self.scrollbar.set(self.first / total,
+                               min(1.0, (self.first + self.visible_rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll(self, rows):
+        """Scroll by a number of rows"""
+        self.first += rows
+        self.refresh()
+        return "break"
+
+    def see(self, index):
+        """Scroll so the row at index is visible"""
+        if index < self.first:
+            self.first = index
+        elif index >= self.first + self.visible_rows:
+            self.first = index - self.visible_rows + 1
+        self.refresh()
+
+    def curselection(self):
+        """Return the absolute index of the selected row as a tuple (like tk.Listbox)"""
+        return () if self.selected_index is None else (self.selected_index,)
+
+    def selected_key(self):
+        """Return the data source key of the selected row, or None"""
+        if self.selected_index is None:
+            return None
+        rows = self.source.page(self.selected_index, 1)
+        return rows[0][0] if rows else None
+
+    def clear_selection(self):
+        self.selected_index = None
+        self.listbox.selection_clear(0, tk.END)
+
+    def _on_scrollbar(self, action, *args):
+        total = len(self.source)
+        if action == "moveto":
+            self.first = int(float(args[0]) * total)
+        elif action == "scroll":
+            amount, unit = int(args[0]), args[1]
+            self.first += amount * (self.visible_rows if unit == "pages" else 1)
+        self.refresh()
+
+    def _on_resize(self, event):
+        inner = event.height - 2 * (int(self.listbox.cget("borderwidth")) +
+                                    int(self.listbox.cget("highlightthickness")))
+        rows = max(1, inner // self.row_height)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.refresh()
+
+    def _on_select(self, event):
+        selection = self.listbox.curselection()
+        if selection:
+            self.selected_index = self.first + selection[0]
+
+    def _on_mousewheel(self, event):
+        # Windows/macOS report multiples of 120 per notch
+        return self.scroll(-3 * (event.delta // 120 or (1 if event.delta > 0 else -1)))
+
+    def _move_selection(self, step):
+        total = len(self.source)
+        if not total:
+            return "break"
+        current = self.selected_index if self.selected_index is not None else self.first - 1
+        self.selected_index = max(0, min(total - 1, current + step))
+        self.see(self.selected_index)
+        return "break"
+
+class Localizer:
+    """
+    Keeps widget texts in sync with the selected language.
+
+    Widgets register the languages.py key they display, plus any options
+    that differ between left-to-right and right-to-left languages as
+    (ltr, rtl) pairs. A language switch re-texts the registered widgets in
+    place instead of rebuilding them.
+    """
+    def __init__(self, language):
+        self.language = language  # tk.StringVar holding the language name
+        self._bindings = []       # (widget, apply function) pairs
+
+    @property
+    def is_rtl(self):
+        return is_rtl(self.language.get())
+
+    def text(self, key, **kwargs):
+        """Get translated text for the current language"""
+        return get_text(self.language.get(), key, **kwargs)
+
+    def bind(self, widget, key=None, template="{text}", **variants):
+        """
+        Register a widget and apply the current language to it.
+
+        Args:
+            widget: The widget to keep translated
+            key: languages.py key (or a function returning one) for the text option
+            template (str): Format string for the text, {text} is the translation
+            **variants: Widget options given as (ltr_value, rtl_value) pairs
+
+        Returns:
+            The widget, so calls can be chained
+        """
+        def apply():
+            options = {name: values[self.is_rtl] for name, values in variants.items()}
+            if key is not None:
+                options["text"] = template.format(text=self.text(key() if callable(key) else key))
+            widget.configure(**options)
+
+        apply()
+        self._bindings.append((widget, apply))
+        return widget
+
+    def bind_tab(self, notebook, tab, key):
+        """Register a notebook tab label"""
+        def apply():
+            notebook.tab(tab, text=self.text(key))
+
+        apply()
+        self._bindings.append((tab, apply))
+
+    def relocalize(self):
+        """Re-text every registered widget, dropping ones that were destroyed"""
+        alive = []
+        for widget, apply in self._bindings:
+            if widget.winfo_exists():
+                apply()
+                alive.append((widget, apply))
+        self._bindings = alive
+
+# Translation table for Eastern Arabic numerals
+ARABIC_DIGITS = str.maketrans("0123456789", "٠١٢٣٤٥٦٧٨٩")
+
+class StatusCountdown:
+    """
+    Renders the time left until the next reminder into the status label.
+
+    Ticks are aligned to the second boundary the displayed value changes at,
+    switch to minute granularity above one hour, and stop completely while
+    the main window is withdrawn or iconified.
+    """
+    def __init__(self, app):
+        self.app = app
+        self.root = app.root
+        self._after_id = None
+        self._last_text = None
+
+        # Resume when the window is shown again, stop when it is hidden
+        self.root.bind("<Map>", self._on_map, add="+")
+        self.root.bind("<Unmap>", self._on_unmap, add="+")
+
+    def refresh(self):
+        """Render immediately and reschedule the next tick"""
+        self.cancel()
+        self._last_text = None
+        self._tick()
+
+    def cancel(self):
+        """Cancel the pending tick"""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _on_map(self, event):
+        if event.widget is self.root:
+            self.refresh()
+
+    def _on_unmap(self, event):
+        if event.widget is self.root:
+            self.cancel()
+
+    def _is_visible(self):
+        try:
+            return self.root.state() == "normal" and bool(self.root.winfo_viewable())
+        except tk.TclError:
+            return False
+
+    def _tick(self):
+        self._after_id = None
+        status_var = getattr(self.app, "status_var", None)
+        if status_var is None:
+            return
+
+        remaining = self.app.scheduler.remaining()
+        if remaining is None:
+            text = self.app.get_text("status_paused")
+            delay = None
+        else:
+            text_time, delay = self.format_remaining(remaining, self.app.language.get())
+            text = self.app.get_text("status_active", time=text_time)
+
+        # Only touch the Tcl variable when the text actually changed
+        if text != self._last_text:
+            status_var.set(text)
+            self._last_text = text
+
+        if delay is not None and self._is_visible():
+            # Small slack so the tick lands just after the boundary
+            self._after_id = self.root.after(int(delay * 1000) + 5, self._tick)
+
+    @staticmethod
+    def format_remaining(remaining, language):
+        """Return (text, seconds until the text changes) for a remaining time"""
+        if remaining >= 3600:
+            # Minute granularity above one hour
+            total_minutes = int(remaining // 60)
+            hours, minutes = divmod(total_minutes, 60)
+            delay = (remaining - total_minutes * 60) or 60
+            # Switch to seconds as soon as the countdown drops below one hour
+            delay = min(delay, remaining - 3599)
+            if language == "العربية":
+                text = f"{hours} ساعة {minutes} دقيقة".translate(ARABIC_DIGITS)
+            else:
+                text = f"{hours}h {minutes}m"
+            return text, delay
+
+        total_seconds = int(remaining)
+        minutes, seconds = divmod(total_seconds, 60)
+        delay = (remaining - total_seconds) or 1
+        if total_seconds == 0:
+            # Reminder is due - the scheduler will refresh us when it fires
+            delay = None
+        if language == "العربية":
+            text = f"{minutes} دقيقة {seconds} ثانية".translate(ARABIC_DIGITS)
+        else:
+            text = f"{minutes}m {seconds}s"
+        return text, delay
+
 class AthkarReminder:
-    def __init__(self):
+    def __init__(self, start_minimized=False, instance=None):
         self.root = tk.Tk()
 
+        # Theme detection, system notifications and window shaping for this OS
+        self.platform = get_platform()
+
+        # Starting straight into the tray: keep the window hidden and don't
+        # build any widgets until it is first shown
+        start_minimized = start_minimized and SYSTEM_TRAY_AVAILABLE
+        if start_minimized:
+            self.root.withdraw()
+        self.ui_built = False
+
         # Load settings or use defaults
         self.load_settings()
 
@@ -422,72 +791,75 @@ class AthkarReminder:
         if self.icon_path:
             self.root.iconbitmap(default=self.icon_path)
 
-        # Load or create duaas
-        self.load_duaas()
+        # Reminder engine: duaa store, selection policy and scheduler
+        self.engine = ReminderEngine(TkTimer(self.root), self.create_notification,
+                                     settings=self.settings)
+        self.duaa_store = self.engine.store
+        self.scheduler = self.engine.scheduler
+
+        # Search index, built on the first search and then kept up to date
+        self.search_index = None
+        self._search_after_id = None
 
         # Initialize timer variables
-        self.reminder_interval = tk.IntVar(value=30)  # Set default to 30 minutes
-        self.is_running = False
-        self.next_reminder_time = None
+        self.reminder_interval = tk.IntVar(value=self.engine.interval)
         self.notification_window = None
 
+        # Countdown renderer for the status label, refreshed on scheduler changes
+        self.countdown = StatusCountdown(self)
+        self.scheduler.add_listener(self.update_status)
+
         # Theme settings
         self.use_system_theme = True
+        # One memoized lookup shared by the main window and notifications
+        self.theme_source = CachedThemeSource(self.platform.theme_source())
+        self.theme = ThemeManager(self.root, self.theme_source)
+        self.theme.add_listener(self.on_theme_changed)
         self.dark_mode = self.is_dark_mode() if self.use_system_theme else False
 
         # Setup system tray if available
         if SYSTEM_TRAY_AVAILABLE:
             self.setup_tray_icon()
 
-        # Create UI
-        self.create_ui()
-
         # Apply the current system theme
         self.apply_system_theme()
 
+        # Create UI now, or on first show when starting in the tray
+        if start_minimized:
+            self.running_in_tray = True
+            self.tray_thread.start()
+        else:
+            self.create_ui()
+
         # Handle window close event
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
+        # Answer commands forwarded by later launches, on the Tk thread
+        self.instance = instance
+        if instance is not None:
+            instance.serve(self.instance_commands(), call_soon=lambda run: self.root.after(0, run))
+
         # Start the reminder service
         self.start_reminder_service()
 
     def load_settings(self):
         """Load application settings or use defaults"""
         self.settings_file = "settings.json"
+        self.settings = SettingsStore(self.settings_file)
 
-        # Default settings
-        self.settings = {
-            "language": "English"
-        }
-
-        # Try to load settings from file
-        if os.path.exists(self.settings_file):
-            try:
-                with open(self.settings_file, "r", encoding="utf-8") as f:
-                    loaded_settings = json.load(f)
-                    # Update settings with loaded values
-                    self.settings.update(loaded_settings)
-            except Exception as e:
-                print(f"Error loading settings: {e}")
-
-        # Create language variable
+        # Create language variable and the widget localisation bindings
         self.language = tk.StringVar(value=self.settings["language"])
+        self.localizer = Localizer(self.language)
 
     def save_settings(self):
         """Save application settings to file"""
-        # Update settings dictionary with current values
+        # Update settings with current values
         self.settings["language"] = self.language.get()
-
-        # Save to file
-        try:
-            with open(self.settings_file, "w", encoding="utf-8") as f:
-                json.dump(self.settings, f, ensure_ascii=False, indent=4)
-        except Exception as e:
-            print(f"Error saving settings: {e}")
+        self.settings.save()
 
     def get_text(self, key, **kwargs):
         """Get translated text for the current language"""
-        return get_text(self.language.get(), key, **kwargs)
+        return self.localizer.text(key, **kwargs)
 
     def change_language(self, *args):
         """Change the application language"""
@@ -497,17 +869,11 @@ class AthkarReminder:
         # Update the window title
         self.root.title(self.get_text("app_title"))
 
-        # Recreate the UI with the new language
-        self.recreate_ui()
+        # Re-text the existing widgets in place
+        self.localizer.relocalize()
 
-    def recreate_ui(self):
-        """Recreate the UI with the current language"""
-        # Clear the notebook tabs
-        for tab in self.notebook.tabs():
-            self.notebook.forget(tab)
-
-        # Recreate tabs
-        self.create_tabs()
+        # Render the status in the new language
+        self.update_status()
 
         # Update system tray menu if available
         if SYSTEM_TRAY_AVAILABLE and hasattr(self, 'tray_icon'):
@@ -518,20 +884,14 @@ class AthkarReminder:
         # Create icon image
         if self.icon_path:
             # Use existing icon if available
+            from PIL import Image
             icon_image = Image.open(self.icon_path)
         else:
             # Create a simple icon if no icon file exists
             icon_image = self.create_default_icon()
 
-        # Create system tray menu with translated text
-        menu = (
-            item(self.get_text('show'), self.show_window),
-            item(self.get_text('test_notification'), self.show_test_notification),
-            item(self.get_text('exit'), self.exit_app)
-        )
-
-        # Create system tray icon
-        self.tray_icon = pystray.Icon("AthkarReminder", icon_image, self.get_text("app_title"), menu)
+        # Create system tray icon with a translated menu
+        self.tray_icon = pystray.Icon("AthkarReminder", icon_image, self.get_text("app_title"), self.tray_menu())
 
         # Start tray icon in a separate thread
         self.tray_thread = threading.Thread(target=self.tray_icon.run)
@@ -540,48 +900,107 @@ class AthkarReminder:
     def update_tray_menu(self):
         """Update the system tray menu with the current language"""
         if hasattr(self, 'tray_icon'):
-            # Create updated menu with translated text
-            menu = (
-                item(self.get_text('show'), self.show_window),
-                item(self.get_text('test_notification'), self.show_test_notification),
-                item(self.get_text('exit'), self.exit_app)
-            )
-
-            # Update the tray icon
-            self.tray_icon.menu = menu
+            # Update the tray icon with the translated menu
+            self.tray_icon.menu = self.tray_menu()
             self.tray_icon.title = self.get_text("app_title")
 
-    def create_default_icon(self):
-        """Create a default icon if no icon file exists"""
-        # Create a simple colored square with 'AR' text
-        img = Image.new('RGBA', (64, 64), color=(74, 108, 212, 255))  # Using accent color
-        d = ImageDraw.Draw(img)
-
-        # Try to use a system font
-        try:
-            from PIL import ImageFont
-            font = ImageFont.truetype("arial.ttf", 32)
-            d.text((16, 16), "AR", fill="white", font=font)
-        except Exception:
-            # Fallback if font loading fails
-            d.text((16, 16), "AR", fill="white")
+    def tray_menu(self):
+        """Build the system tray menu in the current language"""
+        # pystray calls the items on its own thread; Tk may only be used
+        # from the main thread, so hand them over like instance commands
+        def on_tk_thread(callback):
+            return lambda: self.root.after(0, callback)
+
+        return (
+            item(self.get_text('show'), on_tk_thread(self.show_window)),
+            item(self.get_text('test_notification'), on_tk_thread(self.show_test_notification)),
+            item(self.get_text('exit'), on_tk_thread(self.exit_app))
+        )
 
-        return img
+    def create_default_icon(self):
+        """Get the default icon if no icon file exists (cached on disk after the first run)"""
+        # A simple square in the accent colour with 'AR' text
+        return get_asset_cache().pil_image("tray_icon", 64, (74, 108, 212, 255), "AR")
 
     def show_window(self):
         """Show the main window"""
         if self.running_in_tray:
             self.running_in_tray = False
+            self.create_ui()       # Built on first show when started in the tray
             self.root.deiconify()  # Show window
             self.root.lift()       # Bring to front
             self.root.focus_force()  # Focus the window
 
+    def activate(self):
+        """Show and focus the main window, whether it is in the tray or just hidden"""
+        if self.running_in_tray:
+            self.show_window()
+        else:
+            self.root.deiconify()
+            self.root.lift()
+            self.root.focus_force()
+
+    def instance_commands(self):
+        """Commands later launches and control.py can send to this instance"""
+        def set_running(running):
+            self.set_reminders_running(running)
+            return self.engine.status()
+
+        def toggle():
+            self.toggle_reminder_service()
+            return self.engine.status()
+
+        def set_interval(minutes):
+            self.reminder_interval.set(max(1, int(minutes)))
+            self.update_interval()
+            return self.engine.status()
+
+        def add_duaas(texts, category=None, skip_duplicates=False):
+            ids = self.engine.add_duaas(texts, category, skip_duplicates)
+            self.duaas_added(ids)
+            return {"added": len(ids), "duaas": len(self.duaa_store)}
+
+        def import_duaas(path, format=None, category=None):
+            report = self.engine.import_duaas(path, format, category, on_batch=self.duaas_added)
+            report["duaas"] = len(self.duaa_store)
+            return report
+
+        def clean_library(near=True, dry_run=False):
+            report = self.engine.clean_library(near, dry_run)
+            self.duaas_removed([duplicate[0] for duplicate in report.pop("duplicates")] if not dry_run else [])
+            report["duaas"] = len(self.duaa_store)
+            return report
+
+        # Engine commands, with the ones that touch the window wrapped
+        commands = self.engine.control_commands()
+        commands.update({
+            "show": self.activate,
+            "pause": lambda: set_running(False),
+            "resume": lambda: set_running(True),
+            "toggle": toggle,
+            "set_interval": set_interval,
+            "add_duaas": add_duaas,
+            "import_duaas": import_duaas,
+            "clean_library": clean_library
+        })
+        return commands
+
     def exit_app(self):
         """Exit the application completely"""
         # Stop the tray icon
         if hasattr(self, 'tray_icon'):
             self.tray_icon.stop()
 
+        # Stop the theme watcher (and its gsettings monitor process)
+        self.theme.close()
+
+        # Stop reminders and fold pending duaa operations into duaas.json
+        self.engine.close()
+
+        # Let the next launch become the running instance
+        if self.instance is not None:
+            self.instance.close()
+
         # Destroy the root window
         self.root.destroy()
 
@@ -607,52 +1026,23 @@ class AthkarReminder:
                 self.tray_thread.start()
         else:
             # If system tray is not available, just close normally
+            self.theme.close()
             self.root.destroy()
 
     def show_windows_notification(self, title, message):
-        """Show a Windows notification"""
-        try:
-            from win10toast import ToastNotifier
-            toaster = ToastNotifier()
-            toaster.show_toast(title, message, duration=5, threaded=True)
-        except ImportError:
-            # Fallback to a simpler notification if win10toast is not available
-            try:
-                # Use Windows API directly
-                ctypes.windll.user32.MessageBoxW(0, message, title, 0x40)
-            except:
-                # Last resort fallback
-                print(f"{title}: {message}")
-
-    def load_duaas(self):
-        """Load duaas from file or create default list"""
-        self.duaas_file = "duaas.json"
-
-        if os.path.exists(self.duaas_file):
-            with open(self.duaas_file, "r", encoding="utf-8") as f:
-                self.duaas = json.load(f)
-        else:
-            # Default duaas from Prophet Mohammed
-            self.duaas = [
-                "اللَّهُمَّ إِنِّي أَسْأَلُكَ الْهُدَى، وَالتُّقَى، وَالْعَفَافَ، وَالْغِنَى",
-                "رَبِّ اغْفِرْ لِي خَطِيئَتِي وَجَهْلِي، وَإِسْرَافِي فِي أَمْرِي كُلِّهِ، وَمَا أَنْتَ أَعْلَمُ بِهِ مِنِّي",
-                "اللَّهُمَّ اغْفِرْ لِي ذَنْبِي كُلَّهُ، دِقَّهُ وَجِلَّهُ، وَأَوَّلَهُ وَآخِرَهُ، وَعَلَانِيَتَهُ وَسِرَّهُ",
-                "اللَّهُمَّ إِنِّي أَعُوذُ بِكَ مِنْ شَرِّ مَا عَمِلْتُ، وَمِنْ شَرِّ مَا لَمْ أَعْمَلْ",
-                "اللَّهُمَّ إِنِّي أَعُوذُ بِكَ مِنَ الْهَمِّ وَالْحَزَنِ، وَالْعَجْزِ وَالْكَسَلِ، وَالْجُبْنِ وَالْبُخْلِ، وَضَلَعِ الدَّيْنِ وَغَلَبَةِ الرِّجَالِ",
-                "اللَّهُمَّ إِنِّي أَسْأَلُكَ الْجَنَّةَ وَأَعُوذُ بِكَ مِنَ النَّارِ",
-                "اللَّهُمَّ أَصْلِحْ لِي دِينِي الَّذِي هُوَ عِصْمَةُ أَمْرِي، وَأَصْلِحْ لِي دُنْيَايَ الَّتِي فِيهَا مَعَاشِي",
-                "اللَّهُمَّ إِنِّي أَعُوذُ بِكَ مِنْ زَوَالِ نِعْمَتِكَ، وَتَحَوُّلِ عَافِيَتِكَ، وَفُجَاءَةِ نِقْمَتِكَ، وَجَمِيعِ سَخَطِكَ",
-                "لَا إِلَهَ إِلَّا اللَّهُ وَحْدَهُ لَا شَرِيكَ لَهُ، لَهُ الْمُلْكُ وَلَهُ الْحَمْدُ وَهُوَ عَلَى كُلِّ شَيْءٍ قَدِيرٌ",
-                "سُبْحَانَ اللَّهِ وَبِحَمْدِهِ، سُبْحَانَ اللَّهِ الْعَظِيمِ"
-            ]
-            self.save_duaas()
+        """Show a system notification"""
+        self.platform.notify(title, message)
 
     def save_duaas(self):
-        """Save duaas to file"""
-        with open(self.duaas_file, "w", encoding="utf-8") as f:
-            json.dump(self.duaas, f, ensure_ascii=False, indent=4)
+        """Compact pending duaa edits into duaas.json"""
+        self.duaa_store.compact()
 
     def create_ui(self):
+        """Build the main window widgets (only the first tab is filled in)"""
+        if self.ui_built:
+            return
+        self.ui_built = True
+
         style = ttk.Style()
         style.configure("Title.TLabel", font=("Segoe UI", 20, "bold"))
         style.configure("Header.TLabel", font=("Segoe UI", 12))
@@ -673,10 +1063,8 @@ class AthkarReminder:
         main_frame.pack(fill=tk.BOTH, expand=True)
 
         # Title with modern font - use RTL style for Arabic
-        if self.language.get() == "العربية":
-            title_label = ttk.Label(main_frame, text=self.get_text("app_title"), style="RTL.Title.TLabel")
-        else:
-            title_label = ttk.Label(main_frame, text=self.get_text("app_title"), style="Title.TLabel")
+        title_label = self.localizer.bind(ttk.Label(main_frame), "app_title",
+                                          style=("Title.TLabel", "RTL.Title.TLabel"))
         title_label.pack(pady=(0, 15))
 
         # Create notebook for tabs
@@ -687,36 +1075,50 @@ class AthkarReminder:
         self.create_tabs()
 
     def create_tabs(self):
-        """Create all tabs with their content"""
+        """Create the tab frames, each tab's content is built on its first visit"""
         # Create tab frames
         self.home_tab = ttk.Frame(self.notebook)
         self.custom_duaas_tab = ttk.Frame(self.notebook)
         self.settings_tab = ttk.Frame(self.notebook)
         self.about_tab = ttk.Frame(self.notebook)
 
-        # Add tabs to notebook with translated text
-        self.notebook.add(self.home_tab, text=self.get_text("home_tab"))
-        self.notebook.add(self.custom_duaas_tab, text=self.get_text("custom_duaas_tab"))
-        self.notebook.add(self.settings_tab, text=self.get_text("settings_tab"))
-        self.notebook.add(self.about_tab, text=self.get_text("about_tab"))
+        # Content builders, removed once a tab has been built
+        self.tab_builders = {
+            str(self.home_tab): self.create_home_tab,
+            str(self.custom_duaas_tab): self.create_custom_duaas_tab,
+            str(self.settings_tab): self.create_settings_tab,
+            str(self.about_tab): self.create_about_tab
+        }
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
 
-        # Create content for each tab
-        self.create_home_tab()
-        self.create_custom_duaas_tab()
-        self.create_settings_tab()
-        self.create_about_tab()
+        # Add tabs to notebook with translated text
+        for tab, key in ((self.home_tab, "home_tab"),
+                         (self.custom_duaas_tab, "custom_duaas_tab"),
+                         (self.settings_tab, "settings_tab"),
+                         (self.about_tab, "about_tab")):
+            self.notebook.add(tab)
+            self.localizer.bind_tab(self.notebook, tab, key)
+
+        # Build the selected tab right away
+        self.on_tab_changed()
+
+    def on_tab_changed(self, event=None):
+        """Build a tab's content the first time it is selected"""
+        builder = self.tab_builders.pop(self.notebook.select(), None)
+        if builder:
+            builder()
 
     def create_home_tab(self):
         """Create content for the Home tab"""
         # Settings frame
-        settings_frame = ttk.LabelFrame(self.home_tab, text=self.get_text("settings_group"), padding="10")
+        settings_frame = self.localizer.bind(ttk.LabelFrame(self.home_tab, padding="10"), "settings_group")
         settings_frame.pack(fill=tk.X, padx=5, pady=5)
 
         # Interval setting
         interval_frame = ttk.Frame(settings_frame)
         interval_frame.pack(fill=tk.X, padx=5, pady=5)
 
-        interval_label = ttk.Label(interval_frame, text=self.get_text("reminder_interval"), style="Content.TLabel")
+        interval_label = self.localizer.bind(ttk.Label(interval_frame, style="Content.TLabel"), "reminder_interval")
         interval_label.pack(side=tk.LEFT, padx=(0, 5))
 
         interval_values = [1, 5, 10, 15, 30, 60, 120, 180, 240]
@@ -738,59 +1140,60 @@ class AthkarReminder:
         buttons_frame = ttk.Frame(self.home_tab)
         buttons_frame.pack(fill=tk.X, padx=5, pady=10)
 
-        self.toggle_button = ttk.Button(buttons_frame, text=self.get_text("pause_reminders"),
-                                      command=self.toggle_reminder_service)
+        self.toggle_button = ttk.Button(buttons_frame, command=self.toggle_reminder_service)
+        self.localizer.bind(self.toggle_button, self.toggle_button_key)
         self.toggle_button.pack(side=tk.LEFT, padx=5)
 
-        test_button = ttk.Button(buttons_frame, text=self.get_text("test_notification"),
-                                command=self.show_test_notification)
+        test_button = self.localizer.bind(ttk.Button(buttons_frame, command=self.show_test_notification),
+                                          "test_notification")
         test_button.pack(side=tk.LEFT, padx=5)
 
         # Status frame
-        status_frame = ttk.LabelFrame(self.home_tab, text=self.get_text("status_group"), padding="10")
+        status_frame = self.localizer.bind(ttk.LabelFrame(self.home_tab, padding="10"), "status_group")
         status_frame.pack(fill=tk.X, padx=5, pady=5)
 
         self.status_var = tk.StringVar(value=self.get_text("status_active", time=""))
 
-        # Use RTL style for Arabic
-        if self.language.get() == "العربية":
-            status_label = ttk.Label(status_frame, textvariable=self.status_var,
-                                  wraplength=350, style="RTL.Status.TLabel", anchor="e")
-            # Configure the frame to expand the label to full width for proper RTL alignment
-            status_frame.columnconfigure(0, weight=1)
-            status_label.grid(row=0, column=0, sticky="e", padx=5, pady=5)
-        else:
-            status_label = ttk.Label(status_frame, textvariable=self.status_var,
-                                  wraplength=350, style="Status.TLabel")
-            status_label.pack(fill=tk.X, padx=5, pady=5)
+        # Use RTL style and right alignment for Arabic
+        status_label = ttk.Label(status_frame, textvariable=self.status_var, wraplength=350)
+        self.localizer.bind(status_label, style=("Status.TLabel", "RTL.Status.TLabel"),
+                            anchor=("w", "e"))
+        status_label.pack(fill=tk.X, padx=5, pady=5)
+
+        # Render the current status into the new label
+        self.update_status()
 
     def create_custom_duaas_tab(self):
         """Create content for the Custom Duaas tab"""
         # Frame for the list of duaas
-        duaas_frame = ttk.LabelFrame(self.custom_duaas_tab, text=self.get_text("all_duaas"), padding="10")
+        duaas_frame = self.localizer.bind(ttk.LabelFrame(self.custom_duaas_tab, padding="10"), "all_duaas")
         duaas_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
-        # Create a frame for the listbox and scrollbar
-        list_frame = ttk.Frame(duaas_frame)
-        list_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        # Search box, filters the list as the user types
+        search_frame = ttk.Frame(duaas_frame)
+        search_frame.pack(fill=tk.X, padx=5, pady=(0, 5))
+
+        search_label = self.localizer.bind(ttk.Label(search_frame, style="Content.TLabel"), "search_duaas")
+        search_label.pack(side=tk.LEFT, padx=(0, 5))
+
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_frame, textvariable=self.search_var, style="Custom.TEntry")
+        search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        search_entry.bind("<KeyRelease>", self.schedule_search)
 
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(list_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # Virtual listbox, only the visible rows are read from the store
+        self.duaas_listbox = VirtualListbox(duaas_frame, self.duaa_store, height=10, width=50,
+                                            font=("Segoe UI", 12))  # Increased font size for better readability
+        self.duaas_listbox.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
-        # Listbox to display all duaas
-        self.duaas_listbox = tk.Listbox(list_frame, height=10, width=50,
-                                      yscrollcommand=scrollbar.set,
-                                      font=("Segoe UI", 12))  # Increased font size for better readability
-        self.duaas_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.config(command=self.duaas_listbox.yview)
+        # Listbox is a classic Tk widget, colour it from the current theme
+        if self.theme.mode:
+            self.duaas_listbox.listbox.configure(**self.theme.palette["listbox"])
 
-        # Populate the listbox with duaas
-        for duaa in self.duaas:
-            self.duaas_listbox.insert(tk.END, duaa)
+        self.duaas_listbox.refresh()
 
         # Frame for adding new duaas
-        add_frame = ttk.LabelFrame(self.custom_duaas_tab, text=self.get_text("add_new_duaa"), padding="10")
+        add_frame = self.localizer.bind(ttk.LabelFrame(self.custom_duaas_tab, padding="10"), "add_new_duaa")
         add_frame.pack(fill=tk.X, padx=5, pady=5)
 
         # Text entry for new duaa
@@ -805,28 +1208,42 @@ class AthkarReminder:
         duaa_buttons_frame.pack(fill=tk.X, padx=5, pady=5)
 
         # Add button
-        add_button = ttk.Button(duaa_buttons_frame, text=self.get_text("add_duaa"),
-                              command=self.add_duaa)
+        add_button = self.localizer.bind(ttk.Button(duaa_buttons_frame, command=self.add_duaa), "add_duaa")
         add_button.pack(side=tk.LEFT, padx=5)
 
         # Delete button
-        delete_button = ttk.Button(duaa_buttons_frame, text=self.get_text("delete_selected"),
-                                 command=self.delete_duaa)
+        delete_button = self.localizer.bind(ttk.Button(duaa_buttons_frame, command=self.delete_duaa),
+                                            "delete_selected")
         delete_button.pack(side=tk.LEFT, padx=5)
 
+        # Bulk import/export and duplicate removal buttons
+        clean_button = self.localizer.bind(ttk.Button(duaa_buttons_frame, command=self.clean_library),
+                                           "clean_library")
+        clean_button.pack(side=tk.RIGHT, padx=5)
+        export_button = self.localizer.bind(ttk.Button(duaa_buttons_frame, command=self.export_duaas),
+                                            "export_duaas")
+        export_button.pack(side=tk.RIGHT, padx=5)
+        import_button = self.localizer.bind(ttk.Button(duaa_buttons_frame, command=self.import_duaas),
+                                            "import_duaas")
+        import_button.pack(side=tk.RIGHT, padx=5)
+
+        # Start indexing the library for duplicate checks now that adding is
+        # likely, so the first Add already compares with most of it
+        self.engine.duplicate_index()
+
     def create_settings_tab(self):
         """Create content for the Settings tab"""
         # Settings frame
-        settings_frame = ttk.LabelFrame(self.settings_tab, text=self.get_text("app_settings"), padding="10")
+        settings_frame = self.localizer.bind(ttk.LabelFrame(self.settings_tab, padding="10"), "app_settings")
         settings_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
         # Language settings section
-        language_frame = ttk.LabelFrame(settings_frame, text=self.get_text("language_settings"), padding="10")
+        language_frame = self.localizer.bind(ttk.LabelFrame(settings_frame, padding="10"), "language_settings")
         language_frame.pack(fill=tk.X, padx=5, pady=5)
 
         # Language selection
-        language_label = ttk.Label(language_frame, text=self.get_text("choose_language"),
-                                  style="Content.TLabel")
+        language_label = self.localizer.bind(ttk.Label(language_frame, style="Content.TLabel"),
+                                             "choose_language")
         language_label.pack(side=tk.LEFT, padx=(0, 10), pady=5)
 
         # Create language dropdown with custom style for better readability
@@ -834,7 +1251,7 @@ class AthkarReminder:
         style.configure("Language.TCombobox", font=("Segoe UI", 12))
 
         language_combo = ttk.Combobox(language_frame, textvariable=self.language,
-                                     values=list(LANGUAGES.keys()), width=15,
+                                     values=language_names(), width=15,
                                      state="readonly", style="Language.TCombobox")
         language_combo.pack(side=tk.LEFT, padx=5, pady=5)
 
@@ -846,9 +1263,8 @@ class AthkarReminder:
         other_frame.pack(fill=tk.X, padx=5, pady=10)
 
         # Placeholder for future settings
-        settings_label = ttk.Label(other_frame,
-                                 text=self.get_text("future_settings"),
-                                 style="Content.TLabel", wraplength=350)
+        settings_label = self.localizer.bind(ttk.Label(other_frame, style="Content.TLabel", wraplength=350),
+                                             "future_settings")
         settings_label.pack(fill=tk.X, padx=5, pady=10)
 
         # Auto-start option could be added here
@@ -857,7 +1273,7 @@ class AthkarReminder:
 
     def create_about_tab(self):
         """Create content for the About tab"""
-        # All colors are now defined in the apply_system_theme method
+        # All colors are defined in the theme.STYLE_TABLES style tables
         # using specific styles for each element
 
         # Main container with padding
@@ -877,13 +1293,9 @@ class AthkarReminder:
         title_frame.pack(fill=tk.X, pady=(20, 5))
 
         # Use RTL style for Arabic
-        if self.language.get() == "العربية":
-            title_style = "RTL.AboutTitle.TLabel"
-        else:
-            title_style = "AboutTitle.TLabel"
-
-        app_title = ttk.Label(title_frame, text=self.get_text("app_title"),
-                           style=title_style, font=("Segoe UI", 24, "bold"))  # Increased font size
+        app_title = ttk.Label(title_frame, font=("Segoe UI", 24, "bold"))  # Increased font size
+        self.localizer.bind(app_title, "app_title",
+                            style=("AboutTitle.TLabel", "RTL.AboutTitle.TLabel"))
         app_title.pack(anchor=tk.CENTER)
 
         # App version - get from version file
@@ -902,17 +1314,12 @@ class AthkarReminder:
         about_text_frame.pack(fill=tk.X, padx=20, pady=5)
 
         # Use RTL style for Arabic
-        if self.language.get() == "العربية":
-            text_style = "RTL.AboutContent.TLabel"
-        else:
-            text_style = "AboutContent.TLabel"
+        text_style = ("AboutContent.TLabel", "RTL.AboutContent.TLabel")
 
         # Adjust wraplength based on language to accommodate Arabic text
-        wraplength = 450 if self.language.get() == "العربية" else 400
-        justify_style = "right" if self.language.get() == "العربية" else "center"
-
-        about_label = ttk.Label(about_text_frame, text=self.get_text("about_text"),
-                              wraplength=wraplength, justify=justify_style, style=text_style)
+        about_label = self.localizer.bind(ttk.Label(about_text_frame), "about_text",
+                                          wraplength=(400, 450), justify=("center", "right"),
+                                          style=text_style)
         about_label.pack(fill=tk.X, padx=10, pady=10)
 
         # Separator
@@ -925,17 +1332,14 @@ class AthkarReminder:
 
         # Developer title
         # Use appropriate font and style for Arabic
-        dev_title_font = ("Dubai", 15, "bold") if self.language.get() == "العربية" else ("Segoe UI", 14, "bold")
-        dev_title_style = "RTL.AboutDeveloperTitle.TLabel" if self.language.get() == "العربية" else "AboutDeveloperTitle.TLabel"
-
-        dev_title = ttk.Label(dev_frame, text=self.get_text("developer_title"),
-                           style=dev_title_style, font=dev_title_font)
+        dev_title = self.localizer.bind(ttk.Label(dev_frame), "developer_title",
+                                        style=("AboutDeveloperTitle.TLabel", "RTL.AboutDeveloperTitle.TLabel"),
+                                        font=(("Segoe UI", 14, "bold"), ("Dubai", 15, "bold")))
         dev_title.pack(anchor=tk.CENTER, pady=(5, 10))
 
         # Developer name
-        dev_name_font = ("Dubai", 14) if self.language.get() == "العربية" else ("Segoe UI", 13)
-        dev_name = ttk.Label(dev_frame, text=self.get_text("developer_name"),
-                          style=text_style, font=dev_name_font)
+        dev_name = self.localizer.bind(ttk.Label(dev_frame), "developer_name", style=text_style,
+                                       font=(("Segoe UI", 13), ("Dubai", 14)))
         dev_name.pack(anchor=tk.CENTER)
 
         # Copyright information
@@ -943,124 +1347,27 @@ class AthkarReminder:
         copyright_frame.pack(fill=tk.X, side=tk.BOTTOM, pady=20)  # Increased padding
 
         current_year = datetime.now().year
-        copyright_text = f"© {current_year} {self.get_text('copyright_text')}"
 
         # Use a larger font for better readability
-        font_size = 12 if self.language.get() == "العربية" else 11
-        font_family = "Dubai" if self.language.get() == "العربية" else "Segoe UI"
-
-        copyright_label = ttk.Label(copyright_frame, text=copyright_text,
-                                 style=text_style, font=(font_family, font_size))
+        copyright_label = self.localizer.bind(ttk.Label(copyright_frame), "copyright_text",
+                                              template=f"© {current_year} " + "{text}",
+                                              style=text_style,
+                                              font=(("Segoe UI", 11), ("Dubai", 12)))
         copyright_label.pack(anchor=tk.CENTER, pady=10)  # Increased padding
 
     def is_dark_mode(self):
-        """Check if Windows is in dark mode"""
-        try:
-            registry = winreg.ConnectRegistry(None, winreg.HKEY_CURRENT_USER)
-            key = winreg.OpenKey(registry, r"Software\Microsoft\Windows\CurrentVersion\Themes\Personalize")
-            value, regtype = winreg.QueryValueEx(key, "AppsUseLightTheme")
-            return value == 0
-        except Exception:
-            return False
+        """Check if the system is in dark mode (cached, see theme_source.stats())"""
+        return self.theme_source.is_dark()
 
     def apply_system_theme(self):
-        """Apply system theme to the application"""
-        if self.is_dark_mode():
-            # Dark mode
-            self.root.configure(bg="#1e1e1e")
-            style = ttk.Style()
-            style.theme_use("clam")
-            style.configure("TFrame", background="#1e1e1e")
-            style.configure("TLabel", background="#1e1e1e", foreground="#ffffff")
-            style.configure("TLabelframe", background="#1e1e1e", foreground="#ffffff")
-            style.configure("TLabelframe.Label", background="#1e1e1e", foreground="#ffffff")
-            style.configure("TButton", background="#333333", foreground="#ffffff")
-
-            # Style for card frames in About tab
-            style.configure("Card.TFrame", background="#343a40")
-
-            # Special styles for About tab
-            style.configure("About.TFrame", background="#1e1e1e")
-            style.configure("AboutCard.TFrame", background="#2d3339")
-            style.configure("AboutTitle.TLabel", background="#2d3339", foreground="#ffffff", font=("Segoe UI", 24, "bold"))
-            style.configure("AboutVersion.TLabel", background="#2d3339", foreground="#6c757d", font=("Segoe UI", 12))
-            style.configure("AboutContent.TLabel", background="#2d3339", foreground="#ffffff", font=("Segoe UI", 12))
-            style.configure("AboutDeveloperTitle.TLabel", background="#2d3339", foreground="#6c757d", font=("Segoe UI", 14, "bold"))
-
-            # Style for separators
-            style.configure("TSeparator", background="#495057")
-
-            # Style for notebook and tabs
-            style.configure("TNotebook", background="#1e1e1e", borderwidth=0)
-            style.configure("TNotebook.Tab", background="#2d2d2d", foreground="#ffffff",
-                          padding=[10, 2], font=("Segoe UI", 11))  # Added font size for better readability
-            style.map("TNotebook.Tab",
-                    background=[("selected", "#3d3d3d")],
-                    foreground=[("selected", "#ffffff")])
-
-            # Style for listbox
-            if hasattr(self, 'duaas_listbox'):
-                self.duaas_listbox.configure(bg="#2d2d2d", fg="#ffffff")
-
-            # Update RTL styles for Arabic
-            style.configure("RTL.TLabel", background="#1e1e1e", foreground="#ffffff")
-            style.configure("RTL.Title.TLabel", background="#1e1e1e", foreground="#ffffff")
-            style.configure("RTL.Header.TLabel", background="#1e1e1e", foreground="#ffffff")
-            style.configure("RTL.Content.TLabel", background="#1e1e1e", foreground="#ffffff")
-            style.configure("RTL.Status.TLabel", background="#1e1e1e", foreground="#ffffff")
-
-            # RTL styles for About tab
-            style.configure("RTL.AboutTitle.TLabel", background="#2d3339", foreground="#ffffff", font=("Dubai", 24, "bold"), justify="right")
-            style.configure("RTL.AboutContent.TLabel", background="#2d3339", foreground="#ffffff", font=("Dubai", 14), justify="right")
-            style.configure("RTL.AboutDeveloperTitle.TLabel", background="#2d3339", foreground="#6c757d", font=("Dubai", 16, "bold"), justify="right")
-        else:
-            # Light mode
-            self.root.configure(bg="#f0f0f0")
-            style = ttk.Style()
-            style.theme_use("clam")
-            style.configure("TFrame", background="#f0f0f0")
-            style.configure("TLabel", background="#f0f0f0", foreground="#000000")
-            style.configure("TLabelframe", background="#f0f0f0", foreground="#000000")
-            style.configure("TLabelframe.Label", background="#f0f0f0", foreground="#000000")
-            style.configure("TButton", background="#e1e1e1", foreground="#000000")
-
-            # Style for card frames in About tab
-            style.configure("Card.TFrame", background="#ffffff")
-
-            # Special styles for About tab
-            style.configure("About.TFrame", background="#f0f0f0")
-            style.configure("AboutCard.TFrame", background="#ffffff")
-            style.configure("AboutTitle.TLabel", background="#ffffff", foreground="#212529", font=("Segoe UI", 24, "bold"))
-            style.configure("AboutVersion.TLabel", background="#ffffff", foreground="#6c757d", font=("Segoe UI", 12))
-            style.configure("AboutContent.TLabel", background="#ffffff", foreground="#212529", font=("Segoe UI", 12))
-            style.configure("AboutDeveloperTitle.TLabel", background="#ffffff", foreground="#6c757d", font=("Segoe UI", 14, "bold"))
-
-            # Style for separators
-            style.configure("TSeparator", background="#dee2e6")
-
-            # Style for notebook and tabs
-            style.configure("TNotebook", background="#f0f0f0", borderwidth=0)
-            style.configure("TNotebook.Tab", background="#e1e1e1", foreground="#000000",
-                          padding=[10, 2], font=("Segoe UI", 11))  # Added font size for better readability
-            style.map("TNotebook.Tab",
-                    background=[("selected", "#ffffff")],
-                    foreground=[("selected", "#000000")])
-
-            # Style for listbox
-            if hasattr(self, 'duaas_listbox'):
-                self.duaas_listbox.configure(bg="#ffffff", fg="#000000")
-
-            # Update RTL styles for Arabic
-            style.configure("RTL.TLabel", background="#f0f0f0", foreground="#000000")
-            style.configure("RTL.Title.TLabel", background="#f0f0f0", foreground="#000000")
-            style.configure("RTL.Header.TLabel", background="#f0f0f0", foreground="#000000")
-            style.configure("RTL.Content.TLabel", background="#f0f0f0", foreground="#000000")
-            style.configure("RTL.Status.TLabel", background="#f0f0f0", foreground="#000000")
-
-            # RTL styles for About tab
-            style.configure("RTL.AboutTitle.TLabel", background="#ffffff", foreground="#212529", font=("Dubai", 24, "bold"), justify="right")
-            style.configure("RTL.AboutContent.TLabel", background="#ffffff", foreground="#212529", font=("Dubai", 14), justify="right")
-            style.configure("RTL.AboutDeveloperTitle.TLabel", background="#ffffff", foreground="#6c757d", font=("Dubai", 16, "bold"), justify="right")
+        """Apply system theme to the application (only pushes styles on change)"""
+        self.theme.apply()
+
+    def on_theme_changed(self, palette):
+        """Update classic Tk widgets that ttk styles don't cover"""
+        self.dark_mode = self.theme.is_dark
+        if hasattr(self, 'duaas_listbox'):
+            self.duaas_listbox.listbox.configure(**palette["listbox"])
 
     def get_validated_interval(self):
         """Get the current interval value, ensuring it's a valid integer"""
@@ -1090,132 +1397,58 @@ class AthkarReminder:
         interval_value = self.get_validated_interval()
 
         # Reset timer with new interval if the reminder service is running
-        if self.is_running:
-            self.next_reminder_time = time.time() + (interval_value * 60)
-            self.update_status()
+        self.engine.set_interval(interval_value)
 
     def update_status(self):
         """Update the status display"""
-        if self.is_running and self.next_reminder_time:
-            # Calculate time remaining in seconds
-            remaining_seconds = max(0, int(self.next_reminder_time - time.time()))
-
-            # Format as hours:minutes:seconds for better readability
-            hours, remainder = divmod(remaining_seconds, 3600)
-            minutes, seconds = divmod(remainder, 60)
-
-            # Format time string based on language
-            if self.language.get() == "العربية":
-                # Arabic format with Arabic numerals
-                arabic_numerals = {
-                    '0': '٠', '1': '١', '2': '٢', '3': '٣', '4': '٤',
-                    '5': '٥', '6': '٦', '7': '٧', '8': '٨', '9': '٩'
-                }
-
-                # Convert to Arabic numerals
-                hours_str = ''.join(arabic_numerals.get(c, c) for c in str(hours))
-                minutes_str = ''.join(arabic_numerals.get(c, c) for c in str(minutes))
-                seconds_str = ''.join(arabic_numerals.get(c, c) for c in str(seconds))
-
-                if hours > 0:
-                    remaining_str = f"{hours_str} ساعة {minutes_str} دقيقة {seconds_str} ثانية"
-                else:
-                    remaining_str = f"{minutes_str} دقيقة {seconds_str} ثانية"
-            else:
-                # English format
-                if hours > 0:
-                    remaining_str = f"{hours}h {minutes}m {seconds}s"
-                else:
-                    remaining_str = f"{minutes}m {seconds}s"
-
-            self.status_var.set(self.get_text("status_active", time=remaining_str))
+        self.countdown.refresh()
 
-            # Schedule regular updates to the countdown display (more frequent for smoother countdown)
-            self.root.after(500, self.update_status)
-        else:
-            self.status_var.set(self.get_text("status_paused"))
+    def toggle_button_key(self):
+        """Text key for the pause/resume button"""
+        return "pause_reminders" if self.scheduler.is_running else "resume_reminders"
 
     def toggle_reminder_service(self):
         """Toggle the reminder service on/off"""
-        if self.is_running:
+        if self.scheduler.is_running:
             self.stop_reminder_service()
-            self.toggle_button.configure(text=self.get_text("resume_reminders"))
         else:
             self.start_reminder_service()
-            self.toggle_button.configure(text=self.get_text("pause_reminders"))
-        self.update_status()
+        if hasattr(self, 'toggle_button'):
+            self.toggle_button.configure(text=self.get_text(self.toggle_button_key()))
+
+    def set_reminders_running(self, running):
+        """Pause or resume reminders, returns whether they are running"""
+        if running != self.scheduler.is_running:
+            self.toggle_reminder_service()
+        return self.scheduler.is_running
 
     def start_reminder_service(self):
         """Start the reminder service"""
-        self.is_running = True
-
         # Get validated interval value
         interval_value = self.get_validated_interval()
 
-        self.next_reminder_time = time.time() + (interval_value * 60)
-        self.update_status()  # Start updating the status immediately
-        self.check_reminder_time()
+        # Arm the scheduler, the status display is refreshed by its listener
+        self.engine.start(interval_value)
 
     def stop_reminder_service(self):
         """Stop the reminder service"""
-        self.is_running = False
-        self.next_reminder_time = None
-        self.update_status()
-
-    def check_reminder_time(self):
-        """Check if it's time to show a reminder"""
-        if not self.is_running:
-            self.root.after(1000, self.check_reminder_time)
-            return
-
-        current_time = time.time()
-
-        # First reminder or time to show next reminder
-        if current_time >= self.next_reminder_time:
-            self.show_notification()
-
-            # Get the current interval value, ensuring it's an integer
-            try:
-                interval_value = self.reminder_interval.get()
-                if isinstance(interval_value, str) and interval_value.strip():
-                    interval_value = int(interval_value.strip())
-                    self.reminder_interval.set(interval_value)
-
-                # Ensure the value is positive
-                if interval_value <= 0:
-                    interval_value = 1
-                    self.reminder_interval.set(interval_value)
-            except (ValueError, tk.TclError):
-                # If conversion fails, reset to default value
-                interval_value = 30
-                self.reminder_interval.set(interval_value)
-
-            self.next_reminder_time = current_time + (interval_value * 60)
-
-        # Schedule next check
-        self.root.after(1000, self.check_reminder_time)
+        self.engine.pause()
 
     def get_random_duaa(self):
-        """Get a random duaa from the list"""
-        return random.choice(self.duaas)
+        """Get the next duaa chosen by the selection policy"""
+        return self.engine.next_duaa()
 
     def show_notification(self):
-        """Show a notification with a random duaa"""
-        duaa = self.get_random_duaa()
-        self.create_notification(duaa)
+        """Show a notification with the next duaa (calls create_notification)"""
+        self.engine.fire()
 
     def create_notification(self, message):
-        """Create a custom notification window"""
-        # Close previous notification if it exists
-        if hasattr(self, 'notification_window') and self.notification_window is not None:
-            try:
-                self.notification_window.close()
-            except:
-                pass
+        """Show a message in the notification window, building it on first use"""
+        if self.notification_window is None:
+            self.notification_window = NotificationWindow(self.root, self.platform)
 
-        # Create new notification
-        dark_mode = self.is_dark_mode()
-        self.notification_window = NotificationWindow(message, dark_mode)
+        # Reuse the window, only the text and theme colours change
+        self.notification_window.show(message, self.is_dark_mode())
 
     def show_test_notification(self):
         """Show a test notification"""
@@ -1225,41 +1458,150 @@ class AthkarReminder:
         """Add a new duaa to the list"""
         new_duaa = self.new_duaa_var.get().strip()
         if new_duaa:
-            # Add to the list
-            self.duaas.append(new_duaa)
-            # Add to the listbox
-            self.duaas_listbox.insert(tk.END, new_duaa)
-            # Save to file
-            self.save_duaas()
+            # Ask before adding a duaa the library already has
+            match = self.engine.find_duplicate(new_duaa)
+            if match is not None and not messagebox.askyesno(
+                    self.get_text("app_title"),
+                    self.get_text("duplicate_found", similarity=round(match[2] * 100), text=match[1])):
+                return
+            # Add to the store (appends one line to the operation log)
+            duaa_id = self.engine.add_duaas([new_duaa])[0]
+            if self.search_index is not None:
+                self.search_index.add(duaa_id, new_duaa)
+            # Show the full list scrolled to the new entry
+            self.search_var.set("")
+            self.duaas_listbox.set_source(self.duaa_store)
+            self.duaas_listbox.see(len(self.duaa_store) - 1)
             # Clear the entry
             self.new_duaa_var.set("")
 
+    def duaas_added(self, ids):
+        """Update the search index and the list after duaas were added elsewhere"""
+        if self.search_index is not None:
+            for duaa_id in ids:
+                self.search_index.add(duaa_id, self.duaa_store.get(duaa_id))
+        if hasattr(self, 'duaas_listbox') and not self.search_var.get().strip():
+            self.duaas_listbox.refresh()
+
+    def import_duaas(self):
+        """Import duaas from a file chosen by the user"""
+        path = filedialog.askopenfilename(parent=self.root, title=self.get_text("import_duaas"),
+                                          filetypes=DUAA_FILE_TYPES)
+        if not path:
+            return
+        self.root.config(cursor="watch")
+        self.root.update_idletasks()
+        try:
+            report = self.engine.import_duaas(path, on_batch=self.duaas_added)
+        except (OSError, ValueError) as e:
+            print(f"Error importing duaas: {e}")
+            messagebox.showerror(self.get_text("app_title"), self.get_text("import_failed", error=e))
+            return
+        finally:
+            self.root.config(cursor="")
+        self.search_var.set("")
+        self.duaas_listbox.set_source(self.duaa_store)
+        messagebox.showinfo(self.get_text("app_title"), self.get_text(
+            "import_done", added=report["added"], duplicates=report["duplicates"], invalid=report["invalid"]))
+
+    def export_duaas(self):
+        """Export all duaas to a file chosen by the user"""
+        path = filedialog.asksaveasfilename(parent=self.root, title=self.get_text("export_duaas"),
+                                            filetypes=DUAA_FILE_TYPES, defaultextension=".json")
+        if not path:
+            return
+        try:
+            count = self.engine.export_duaas(path)
+        except (OSError, ValueError) as e:
+            print(f"Error exporting duaas: {e}")
+            messagebox.showerror(self.get_text("app_title"), self.get_text("export_failed", error=e))
+            return
+        messagebox.showinfo(self.get_text("app_title"), self.get_text("export_done", count=count))
+
+    def duaas_removed(self, ids):
+        """Update the search index and the list after duaas were removed elsewhere"""
+        if self.search_index is not None:
+            for duaa_id in ids:
+                self.search_index.remove(duaa_id)
+        if hasattr(self, 'duaas_listbox'):
+            self.duaas_listbox.clear_selection()
+            if self.search_var.get().strip():
+                self.search_duaas()
+            else:
+                self.duaas_listbox.refresh()
+
+    def clean_library(self):
+        """Remove duplicate duaas after showing the user how many there are"""
+        self.root.config(cursor="watch")
+        self.root.update_idletasks()
+        try:
+            report = self.engine.clean_library(dry_run=True)
+        finally:
+            self.root.config(cursor="")
+        if not report["duplicates"]:
+            messagebox.showinfo(self.get_text("app_title"), self.get_text("no_duplicates"))
+            return
+        if not messagebox.askyesno(self.get_text("app_title"), self.get_text(
+                "clean_confirm", exact=report["exact"], near=report["near"])):
+            return
+        # Delete what the dry run found rather than scanning the library again
+        removed = self.engine.remove_duplicates(report["duplicates"])
+        self.duaas_removed(removed)
+        messagebox.showinfo(self.get_text("app_title"), self.get_text("clean_done", removed=len(removed)))
+
     def delete_duaa(self):
         """Delete the selected duaa"""
-        selected = self.duaas_listbox.curselection()
-        if selected:
-            # Get the index
-            index = selected[0]
-            # Remove from the listbox
-            self.duaas_listbox.delete(index)
-            # Remove from the list
-            self.duaas.pop(index)
-            # Save to file
-            self.save_duaas()
+        duaa_id = self.duaas_listbox.selected_key()
+        if duaa_id is not None:
+            # Remove from the store (appends one line to the operation log)
+            self.engine.delete_duaas([duaa_id])
+            if self.search_index is not None:
+                self.search_index.remove(duaa_id)
+            # Re-read the visible rows (re-running the search if filtered)
+            self.duaas_listbox.clear_selection()
+            if self.search_var.get().strip():
+                self.search_duaas()
+            else:
+                self.duaas_listbox.refresh()
+
+    def schedule_search(self, event=None):
+        """Run the search shortly after the user stops typing"""
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(150, self.search_duaas)
+
+    def search_duaas(self):
+        """Filter the duaa list by the search box text"""
+        self._search_after_id = None
+        query = self.search_var.get().strip()
+        if not query:
+            self.duaas_listbox.set_source(self.duaa_store)
+            return
+
+        if hasattr(self.duaa_store, "search"):
+            # The SQLite backend has its own full-text index
+            ids = [duaa_id for duaa_id, text in self.duaa_store.search(query, limit=10000)]
+        else:
+            if self.search_index is None:
+                self.search_index = DuaaSearchIndex()
+                self.search_index.build(self.duaa_store.page(0, len(self.duaa_store)))
+            ids = self.search_index.search(query)
+
+        self.duaas_listbox.set_source(SearchResults(self.duaa_store, ids))
 
     def run(self):
         """Run the application"""
         # Start timer display updates
         self.update_status()
 
-        # Check for theme changes every 5 seconds
-        def check_theme():
-            self.apply_system_theme()
-            self.root.after(5000, check_theme)
-
-        check_theme()
+        # Follow system theme changes (notified, or polled if unsupported)
+        self.theme.start()
         self.root.mainloop()
 
+        # The window was closed without the tray, release the instance lock
+        if self.instance is not None:
+            self.instance.close()
+
 if __name__ == "__main__":
     # Check if pystray is required but not installed
     if not SYSTEM_TRAY_AVAILABLE:
@@ -1267,5 +1609,26 @@ if __name__ == "__main__":
         print("Warning: pystray module not found. System tray functionality will be disabled.")
         print("To enable system tray functionality, install pystray with: pip install pystray")
 
-    app = AthkarReminder()
+    # Command for an instance that is already running: --minimized alone
+    # sends nothing, a plain launch brings the window to the front
+    arguments = sys.argv[1:]
+    command = None if "--minimized" in arguments else "show"
+    for flag, name in (("--test-notification", "test_notification"),
+                       ("--pause", "pause"),
+                       ("--resume", "resume")):
+        if flag in arguments:
+            command = name
+
+    # Only one instance runs, a later launch hands over its command and exits
+    instance = SingleInstance()
+    if not instance.acquire():
+        if command:
+            try:
+                send_command(command)
+            except InstanceError as e:
+                print(f"Error contacting the running instance: {e}")
+        sys.exit(0)
+
+    # --minimized starts straight into the system tray (e.g. on login)
+    app = AthkarReminder(start_minimized="--minimized" in arguments, instance=instance)
     app.run()
\ No newline at end of file
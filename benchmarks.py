@@ -0,0 +1,447 @@
+"""
+Micro-benchmarks for Athkar Reminder application.
+
+Usage:
+    python benchmarks.py            # run all benchmarks
+    python benchmarks.py NAME ...   # run the named benchmarks
+"""
+
+import sys
+import time
+
+# Registered benchmarks: name -> function
+BENCHMARKS = {}
+
+def benchmark(func):
+    """Register a benchmark function under its name"""
+    BENCHMARKS[func.__name__.replace("bench_", "")] = func
+    return func
+
+def timed(func, repeat):
+    """Return the mean seconds per call of func over repeat calls"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+def report(label, seconds):
+    if seconds < 0.001:
+        print(f"  {label:<40} {seconds * 1000000:10.3f} us")
+    else:
+        print(f"  {label:<40} {seconds * 1000:10.3f} ms")
+
+@benchmark
+def bench_notification():
+    """Construct a NotificationWindow per reminder vs reuse one window"""
+    import tkinter as tk
+    from athkar_reminder import NotificationWindow
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"  skipped: no display ({e})")
+        return
+    root.withdraw()
+    message = "سُبْحَانَ اللَّهِ وَبِحَمْدِهِ، سُبْحَانَ اللَّهِ الْعَظِيمِ"
+
+    def construct_per_show():
+        window = NotificationWindow(root)
+        window.show(message, False)
+        root.update_idletasks()
+        window.destroy()
+
+    pooled = NotificationWindow(root)
+    modes = [False, True]
+
+    def reuse():
+        modes.reverse()
+        pooled.show(message, modes[0])
+        root.update_idletasks()
+        pooled.hide()
+
+    report("construct per show", timed(construct_per_show, 50))
+    report("reuse pooled window", timed(reuse, 50))
+    root.destroy()
+
+def synthetic_duaas(count, seed=1):
+    """Build count distinct duaa-like strings from the default duaas' words"""
+    import json
+    import random
+
+    with open("duaas.json", "r", encoding="utf-8") as f:
+        words = " ".join(json.load(f)).split()
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(words) for _ in range(rng.randint(6, 14))) + f" {i}"
+            for i in range(count)]
+
+@benchmark
+def bench_search():
+    """Build the search index over 50k duaas and run queries"""
+    from search import DuaaSearchIndex
+
+    entries = list(enumerate(synthetic_duaas(50000)))
+    index = DuaaSearchIndex()
+    report("build index (50k)", timed(lambda: DuaaSearchIndex().build(entries), 1))
+    index.build(entries)
+
+    for query in ["اللهم", "اسالك الجنه", "اللَّهُمَّ إِنِّي", "ر", "سبحان الله العظيم"]:
+        hits = len(index.search(query))
+        report(f"query {query!r} ({hits} hits)", timed(lambda: index.search(query), 20))
+
+    report("incremental add + remove", timed(lambda: (index.add(-1, entries[0][1]), index.remove(-1)), 1000))
+
+@benchmark
+def bench_get_text():
+    """languages.get_text on the status hot path vs the previous lookup + str.format"""
+    from languages import ENGLISH, LANGUAGES, get_text
+
+    def legacy_get_text(language, key, **kwargs):
+        if language not in LANGUAGES:
+            language = "English"
+        text = LANGUAGES[language].get(key, ENGLISH.get(key, key))
+        if kwargs:
+            try:
+                return text.format(**kwargs)
+            except (KeyError, ValueError):
+                return text
+        return text
+
+    for language in ["English", "العربية"]:
+        report(f"legacy  {language} status_active",
+               timed(lambda: legacy_get_text(language, "status_active", time="12m 5s"), 100000))
+        report(f"catalog {language} status_active",
+               timed(lambda: get_text(language, "status_active", time="12m 5s"), 100000))
+        report(f"legacy  {language} plain key",
+               timed(lambda: legacy_get_text(language, "home_tab"), 100000))
+        report(f"catalog {language} plain key",
+               timed(lambda: get_text(language, "home_tab"), 100000))
+
+@benchmark
+def bench_engine():
+    """Headless engine: reminder throughput and LoopTimer wake-up latency"""
+    import os
+    import tempfile
+    import threading
+    from duaa_store import DuaaStore
+    from engine import LoopTimer, ReminderEngine, SettingsStore
+
+    class ManualTimer:
+        """Timer that never fires on its own, reminders are fired directly"""
+        def call_later(self, delay, callback):
+            return object()
+
+        def cancel(self, handle):
+            pass
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = DuaaStore(os.path.join(directory, "duaas.json"), defaults=synthetic_duaas(50000))
+        settings = SettingsStore(os.path.join(directory, "settings.json"))
+        shown = []
+        now = [0.0]
+        engine = ReminderEngine(ManualTimer(), shown.append, settings=settings, store=store,
+                                clock=lambda: now[0], monotonic=lambda: now[0], selection_file=None)
+        engine.start(1)
+
+        def due_reminder():
+            # Jump to the due time and let the scheduler fire and re-arm
+            now[0] = engine.scheduler.next_due
+            engine.scheduler._fire()
+
+        report("fire due reminder (50k duaas)", timed(due_reminder, 10000))
+        print(f"  reminders shown: {len(shown)}")
+        report("status snapshot", timed(engine.status, 10000))
+        engine.close()
+
+    # Ask for a callback 5 ms out and measure how late it actually runs
+    timer = LoopTimer()
+    thread = threading.Thread(target=timer.run, daemon=True)
+    thread.start()
+    lateness = []
+    for _ in range(100):
+        done = threading.Event()
+        start = time.perf_counter()
+        timer.call_later(0.005, lambda: (lateness.append(time.perf_counter() - start - 0.005), done.set()))
+        done.wait()
+    timer.stop()
+    lateness.sort()
+    report("LoopTimer lateness median", lateness[len(lateness) // 2])
+    report("LoopTimer lateness p99", lateness[98])
+
+@benchmark
+def bench_import_time():
+    """Cold import time of the application modules (python -X importtime)"""
+    import subprocess
+
+    # Modules that must not be imported at startup
+    platform_modules = {"winreg", "ctypes", "win32gui", "win32api", "win10toast"}
+
+    for module in ["engine", "platforms", "theme", "athkar_reminder"]:
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                capture_output=True, text=True)
+        timings = {}
+        for line in result.stderr.splitlines():
+            if line.startswith("import time:") and "|" in line:
+                self_us, cumulative_us, name = line[len("import time:"):].split("|")
+                if cumulative_us.strip().isdigit():
+                    timings[name.strip()] = int(cumulative_us)
+        if result.returncode != 0:
+            print(f"  {module}: import failed: {result.stderr.strip().splitlines()[-1]}")
+            continue
+        report(f"import {module}", timings.get(module, 0) / 1000000)
+        loaded = sorted(platform_modules & set(timings))
+        if loaded:
+            print(f"    also imported: {', '.join(loaded)}")
+
+@benchmark
+def bench_assets():
+    """Render widget images vs memory and disk asset cache hits"""
+    import tempfile
+    from assets import AssetCache
+
+    try:
+        import PIL
+    except ImportError:
+        print("  skipped: Pillow is not installed")
+        return
+
+    params = ("rounded_rectangle", 120, 36, 18, "#4a6cd4")
+    with tempfile.TemporaryDirectory() as directory:
+        def cold():
+            AssetCache(None).png(*params)
+
+        warm = AssetCache(directory)
+        warm.png(*params)
+
+        def from_disk():
+            AssetCache(directory).png(*params)
+
+        report("render (no cache)", timed(cold, 200))
+        report("disk cache hit", timed(from_disk, 200))
+        report("memory cache hit", timed(lambda: warm.png(*params), 100000))
+        report("render tray icon", timed(lambda: AssetCache(None).png("tray_icon", 64, (74, 108, 212, 255), "AR"), 20))
+
+@benchmark
+def bench_selection():
+    """Pick cost of each selection policy on 100k duaas"""
+    import os
+    import tempfile
+    from duaa_store import DuaaStore
+    from selection import SELECTIONS
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = DuaaStore(os.path.join(directory, "duaas.json"), defaults=synthetic_duaas(100000))
+        for name, policy_class in SELECTIONS.items():
+            policy = policy_class(seed=1)
+            report(f"{name}: first pick (builds state)", timed(lambda: policy.pick(store), 1))
+            report(f"{name}: pick", timed(lambda: policy.pick(store), 100000))
+
+@benchmark
+def bench_prayer_times():
+    """Prayer times: one day cold, memoised, and a whole year in one pass"""
+    from datetime import date, timedelta
+    from prayer_times import PrayerTimes
+
+    day = date(2024, 6, 21)
+    report("one day (cold)", timed(lambda: PrayerTimes(21.4225, 39.8262).hours(day, 3), 1000))
+    cached = PrayerTimes(21.4225, 39.8262)
+    cached.hours(day, 3)
+    report("one day (memoised)", timed(lambda: cached.hours(day, 3), 100000))
+
+    def day_by_day():
+        times = PrayerTimes(21.4225, 39.8262)
+        for i in range(366):
+            times.hours(date(2024, 1, 1) + timedelta(days=i), 3)
+
+    report("year, day by day", timed(day_by_day, 5))
+    report("year, one pass", timed(lambda: PrayerTimes(21.4225, 39.8262).year(2024, 3), 5))
+
+@benchmark
+def bench_control():
+    """Control API round trips to a running engine over the instance socket"""
+    import os
+    import tempfile
+    import threading
+    from duaa_store import DuaaStore
+    from engine import LoopTimer, ReminderEngine, SettingsStore
+    from instance import InstanceClient, SingleInstance, send_command
+
+    with tempfile.TemporaryDirectory() as directory:
+        lock = os.path.join(directory, "athkar_reminder.lock")
+        store = DuaaStore(os.path.join(directory, "duaas.json"), defaults=synthetic_duaas(1000))
+        settings = SettingsStore(os.path.join(directory, "settings.json"))
+        timer = LoopTimer()
+        engine = ReminderEngine(timer, lambda duaa: None, settings=settings, store=store,
+                                selection_file=None)
+        instance = SingleInstance(lock)
+        instance.acquire()
+        instance.serve(engine.control_commands(), call_soon=timer.call_soon)
+        thread = threading.Thread(target=timer.run, daemon=True)
+        thread.start()
+        engine.start(30)
+
+        def percentiles(label, func, repeat):
+            samples = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                func()
+                samples.append(time.perf_counter() - start)
+            samples.sort()
+            report(f"{label} p50", samples[len(samples) // 2])
+            report(f"{label} p99", samples[int(len(samples) * 0.99)])
+
+        percentiles("status, new connection", lambda: send_command("status", lock), 500)
+        with InstanceClient(lock) as client:
+            percentiles("status, persistent connection", lambda: client.send("status"), 5000)
+            percentiles("toggle, persistent connection", lambda: client.send("toggle"), 1000)
+            texts = [f"Imported duaa {i}" for i in range(10000)]
+            report("add_duaas, 10k in one request", timed(lambda: client.send("add_duaas", texts=texts), 1))
+            print(f"  duaas: {client.send('status')['duaas']}")
+
+        timer.stop()
+        thread.join()
+        engine.close()
+        instance.close()
+
+@benchmark
+def bench_import():
+    """Bulk import and export of 100k duaas in each format, JSON and SQLite stores"""
+    import os
+    import tempfile
+    from duaa_io import FORMATS, export_duaas, import_duaas
+    from duaa_store import DuaaStore, SQLiteDuaaStore
+
+    with tempfile.TemporaryDirectory() as directory:
+        # 100k entries, a tenth of them repeated with different spacing
+        corpus = DuaaStore(os.path.join(directory, "corpus.json"), defaults=synthetic_duaas(90000))
+        corpus.add_many(["  " + text.replace(" ", "  ") for text in synthetic_duaas(10000)])
+        for format in FORMATS:
+            path = os.path.join(directory, "corpus." + format)
+            report(f"export 100k, {format}", timed(lambda: export_duaas(corpus, path), 1))
+
+        for format in FORMATS:
+            path = os.path.join(directory, "corpus." + format)
+            for name, open_store in [("json store", lambda: DuaaStore(os.path.join(directory, "duaas.json"))),
+                                     ("sqlite store", lambda: SQLiteDuaaStore(os.path.join(directory, "duaas.db"),
+                                                                              json_path=None))]:
+                store = open_store()
+                start = time.perf_counter()
+                result = import_duaas(store, path)
+                report(f"import 100k, {format}, {name}", time.perf_counter() - start)
+                store.close()
+                for leftover in ("duaas.json", "duaas.json.log", "duaas.db"):
+                    if os.path.exists(os.path.join(directory, leftover)):
+                        os.remove(os.path.join(directory, leftover))
+        print(f"  added {result['added']}, duplicates {result['duplicates']}, invalid {result['invalid']}")
+
+@benchmark
+def bench_dedup():
+    """Duplicate detection on 100k duaas with planted exact and near duplicates"""
+    import os
+    import random
+    import tempfile
+    from dedup import DuplicateIndex
+    from duaa_store import DuaaStore
+
+    originals = synthetic_duaas(90000)
+    rng = random.Random(7)
+    texts = list(originals)
+    planted = {}
+    for i in range(10000):
+        original = rng.randrange(len(originals))
+        if i % 2:
+            # Same words, different punctuation and spacing
+            texts.append(originals[original].replace(" ", "،  ", 1) + ".")
+        else:
+            # One extra word
+            words = originals[original].split()
+            words.insert(rng.randrange(len(words)), "و")
+            texts.append(" ".join(words))
+        planted[len(texts) - 1] = original
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = DuaaStore(os.path.join(directory, "duaas.json"), defaults=texts)
+        for near in (False, True):
+            index = DuplicateIndex(store, near=near)
+            start = time.perf_counter()
+            duplicates = index.build()
+            report(f"clean 100k ({'exact and near' if near else 'exact only'})", time.perf_counter() - start)
+
+        # Background indexing as the engine does it, one slice per callback
+        background = DuplicateIndex(store)
+        background.queue(store.ids())
+        slices = []
+        while True:
+            start = time.perf_counter()
+            done = background.index_pending(200)
+            slices.append(time.perf_counter() - start)
+            if done:
+                break
+        slices.sort()
+        report("index 100k in background (total)", sum(slices))
+        report("index slice of 200 (median)", slices[len(slices) // 2])
+
+        found = {store.index_of(duplicate): store.index_of(original) for duplicate, original, similarity in duplicates}
+        recall = sum(1 for position, original in planted.items() if found.get(position) == original) / len(planted)
+        false = sum(1 for position in found if position not in planted)
+        print(f"  planted found: {recall:.1%}, other pairs flagged: {false}")
+
+        queries = [rng.choice(originals) + " آمين" for _ in range(2000)]
+        report("check one duaa (100k indexed)", timed(lambda: index.check(queries[rng.randrange(2000)]), 2000))
+        small = DuplicateIndex(DuaaStore(os.path.join(directory, "small.json"), defaults=originals[:1000]))
+        small.build()
+        report("check one duaa (1k indexed)", timed(lambda: small.check(queries[rng.randrange(2000)]), 2000))
+
+@benchmark
+def bench_records():
+    """Duaa records: memory, legacy vs structured loading, per-category picks"""
+    import gc
+    import json
+    import os
+    import tempfile
+    import tracemalloc
+    from duaa_store import CategoryView, DuaaStore
+    from selection import ShuffleBagSelection
+
+    texts = synthetic_duaas(100000)
+    categories = [f"category {i}" for i in range(50)]
+    entries = [{"text": text, "category": categories[i % 50], "source": f"Source {i % 200}"}
+               for i, text in enumerate(texts)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        legacy_path = os.path.join(directory, "legacy.json")
+        records_path = os.path.join(directory, "records.json")
+        with open(legacy_path, "w", encoding="utf-8") as f:
+            json.dump(texts, f, ensure_ascii=False, indent=4)
+        DuaaStore(records_path, defaults=entries).close()
+
+        report("load 100k legacy strings", timed(lambda: DuaaStore(legacy_path), 3))
+        report("load 100k records (50 categories)", timed(lambda: DuaaStore(records_path), 3))
+
+        for label, path in [("legacy strings", legacy_path), ("records", records_path)]:
+            gc.collect()
+            tracemalloc.start()
+            store = DuaaStore(path)
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            print(f"  memory, 100k {label:<26} {size / 1000000:10.1f} MB")
+
+        small = DuaaStore(os.path.join(directory, "small.json"), defaults=entries[:1000])
+        for label, source in [("1k library", small), ("100k library", store)]:
+            view = CategoryView(source, "category 7")
+            policy = ShuffleBagSelection(seed=1)
+            policy.pick(view)
+            report(f"category pick, {label}", timed(lambda: policy.pick(view), 20000))
+        report("category count, 100k library", timed(lambda: store.count("category 7"), 100000))
+
+def main(argv):
+    names = argv or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name}")
+            return 1
+        print(f"{name}: {BENCHMARKS[name].__doc__}")
+        BENCHMARKS[name]()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,175 @@
+"""
+Command line control for a running Athkar Reminder (GUI or engine.py daemon).
+
+Usage:
+    python control.py status [--json]
+    python control.py pause | resume | toggle
+    python control.py interval MINUTES
+    python control.py test
+    python control.py show
+    python control.py add [--category NAME] [--allow-duplicates] [TEXT ...]   # stdin lines without TEXT
+    python control.py import FILE [--format FORMAT] [--category NAME]
+    python control.py export FILE [--format FORMAT]
+    python control.py categories
+    python control.py weight WEIGHT [--id ID]      # "weighted" policy, last shown duaa without ID
+    python control.py review [--id ID]             # "spaced" policy, last shown duaa without ID
+    python control.py check TEXT
+    python control.py clean [--dry-run] [--exact-only]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from duaa_io import FORMATS
+from instance import LOCK_FILE, InstanceClient, InstanceError
+
+# Duaas sent per add_duaas request when reading from stdin
+ADD_BATCH = 1000
+
+
+def format_status(status):
+    """Render a status() dict for people"""
+    if not isinstance(status, dict):
+        return str(status)
+    if not status.get("running"):
+        state = "paused"
+    elif status.get("remaining") is None:
+        state = "running, nothing scheduled"
+    else:
+        minutes, seconds = divmod(int(status["remaining"]), 60)
+        state = f"running, next reminder in {minutes}m {seconds}s"
+    mode = "schedule rules" if status.get("scheduled") else f"every {status.get('interval')} minutes"
+    return (f"{state}\n"
+            f"mode: {mode}\n"
+            f"duaas: {status.get('duaas')}, shown this session: {status.get('shown')}")
+
+
+def read_lines(stream):
+    """Yield the non-empty lines of a text stream"""
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield line
+
+
+def add_batch(client, texts, args, total):
+    """Send one add_duaas request and add its count to the running total"""
+    result = client.send("add_duaas", texts=texts, category=args.category,
+                         skip_duplicates=not args.allow_duplicates)
+    return {"added": total["added"] + result["added"], "duaas": result["duaas"]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Control a running Athkar Reminder")
+    parser.add_argument("--lock", default=LOCK_FILE, help="lock file of the running instance")
+    parser.add_argument("--json", action="store_true", help="print raw JSON results")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("status", help="show the reminder status")
+    commands.add_parser("pause", help="pause reminders")
+    commands.add_parser("resume", help="resume reminders")
+    commands.add_parser("toggle", help="pause or resume reminders")
+    commands.add_parser("test", help="show a reminder now")
+    commands.add_parser("show", help="bring the main window to the front (GUI only)")
+    interval = commands.add_parser("interval", help="set the reminder interval")
+    interval.add_argument("minutes", type=int)
+    add = commands.add_parser("add", help="add duaas (from arguments or stdin, one per line)")
+    add.add_argument("--category")
+    add.add_argument("--allow-duplicates", action="store_true",
+                     help="also add duaas that duplicate existing ones")
+    add.add_argument("texts", nargs="*")
+    import_parser = commands.add_parser("import", help="import duaas from a JSON, JSONL, CSV or text file")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--format", choices=FORMATS)
+    import_parser.add_argument("--category")
+    export = commands.add_parser("export", help="export all duaas to a JSON, JSONL, CSV or text file")
+    export.add_argument("path")
+    export.add_argument("--format", choices=FORMATS)
+    commands.add_parser("categories", help="list the categories and how many duaas each has")
+    weight = commands.add_parser("weight", help="show a duaa more or less often (weighted selection)")
+    weight.add_argument("weight", type=float, help="relative weight, 1 is normal, 0 never")
+    weight.add_argument("--id", type=int, help="duaa id (see check), the last shown duaa if omitted")
+    review = commands.add_parser("review", help="show a duaa often again (spaced selection)")
+    review.add_argument("--id", type=int, help="duaa id (see check), the last shown duaa if omitted")
+    check = commands.add_parser("check", help="look for an existing duplicate of a duaa")
+    check.add_argument("text")
+    clean = commands.add_parser("clean", help="remove duplicate duaas from the library")
+    clean.add_argument("--dry-run", action="store_true", help="only report the duplicates")
+    clean.add_argument("--exact-only", action="store_true", help="keep near-duplicates")
+    args = parser.parse_args(argv)
+
+    try:
+        with InstanceClient(args.lock) as client:
+            if args.command == "add":
+                texts = args.texts or read_lines(sys.stdin)
+                batch = []
+                result = {"added": 0, "duaas": None}
+                for text in texts:
+                    batch.append(text)
+                    if len(batch) >= ADD_BATCH:
+                        result = add_batch(client, batch, args, result)
+                        batch = []
+                if batch:
+                    result = add_batch(client, batch, args, result)
+            elif args.command == "import":
+                # The running instance resolves paths from its own directory
+                result = client.send("import_duaas", path=os.path.abspath(args.path),
+                                     format=args.format, category=args.category)
+            elif args.command == "export":
+                result = client.send("export_duaas", path=os.path.abspath(args.path), format=args.format)
+            elif args.command == "check":
+                result = client.send("find_duplicate", text=args.text)
+            elif args.command == "clean":
+                result = client.send("clean_library", near=not args.exact_only, dry_run=args.dry_run)
+            elif args.command == "weight":
+                result = client.send("set_weight", weight=args.weight, id=args.id)
+            elif args.command == "review":
+                result = client.send("review_again", id=args.id)
+            elif args.command == "interval":
+                result = client.send("set_interval", minutes=args.minutes)
+            else:
+                name = {"test": "test_notification"}.get(args.command, args.command)
+                result = client.send(name)
+    except InstanceError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False))
+    elif args.command == "add":
+        print(f"Added {result['added']} duaas")
+    elif args.command == "import":
+        print(f"Added {result['added']} of {result['read']} entries "
+              f"({result['duplicates']} duplicates, {result['invalid']} invalid)")
+        for error in result["errors"]:
+            print(f"  {error}")
+    elif args.command == "export":
+        print(f"Exported {result['exported']} duaas")
+    elif args.command == "categories":
+        if not result:
+            print("No categories")
+        for category, count in sorted(result.items()):
+            print(f"{category}: {count}")
+    elif args.command == "weight":
+        print(f"Weight {args.weight:g} for #{result['id']}: {result['text']}")
+    elif args.command == "review":
+        print(f"#{result['id']} will be shown often again: {result['text']}")
+    elif args.command == "check":
+        if result is None:
+            print("No duplicate found")
+        else:
+            print(f"Duplicate of #{result['id']} ({result['similarity']:.0%} similar): {result['text']}")
+    elif args.command == "clean":
+        found = result["exact"] + result["near"]
+        verb = "Found" if args.dry_run else "Removed"
+        print(f"{verb} {found} duplicates ({result['exact']} exact, {result['near']} near)")
+        for duplicate, original, similarity in result["examples"]:
+            print(f"  {similarity:.0%}: {duplicate}\n        {original}")
+    elif result is not None:
+        print(format_status(result))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+"""
+Duplicate detection for Athkar Reminder application.
+
+Exact duplicates are found by hashing each duaa's normalised text (no
+tashkeel, letter variants folded, punctuation and spacing ignored).
+Near-duplicates (a word added or dropped, a spelling variant) are found
+with MinHash over character shingles: each duaa gets a short signature,
+the signature is cut into bands, and only duaas sharing a band are
+compared exactly. Checking one duaa therefore costs about the same for
+10 or 100k duaas, and cleaning a whole library is linear.
+"""
+
+import hashlib
+import operator
+import re
+import zlib
+from array import array
+
+from arabic import normalize
+
+# Anything that is not a letter, digit or space
+PUNCTUATION = re.compile(r"[^\w\s]|_")
+
+# Characters per shingle
+SHINGLE = 4
+
+# MinHash signature: one permutation hashing into BINS bins, split into
+# BANDS bands of BINS // BANDS values for locality sensitive hashing
+BINS = 32
+BANDS = 8
+VALUE_BITS = 27
+EMPTY = 1 << VALUE_BITS
+
+# Shingle similarity (Jaccard) from which two duaas are near-duplicates
+THRESHOLD = 0.8
+
+# Candidates whose estimated similarity (share of equal signature bins)
+# is this far below the threshold are not compared exactly
+ESTIMATE_MARGIN = 0.2
+
+# Most candidates considered for one check
+MAX_CANDIDATES = 64
+
+
+def exact_key(text):
+    """Return the text two duaas are exact duplicates by"""
+    # Punctuation becomes a space so "a،b" and "a، b" agree
+    return " ".join(PUNCTUATION.sub(" ", normalize(text)).split())
+
+
+def fingerprint(key):
+    """Return a 64-bit hash of an exact key"""
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+
+
+def shingles(key):
+    """Return the set of hashed character shingles of an exact key"""
+    # Fixed-width encoding, so each shingle is a 16 byte slice
+    raw = key.encode("utf-32-le")
+    width = 4 * SHINGLE
+    if len(raw) <= width:
+        return {zlib.crc32(raw)}
+    return {zlib.crc32(raw[i:i + width]) for i in range(0, len(raw) - width + 4, 4)}
+
+
+def signature(hashes):
+    """
+    Return the MinHash signature of a shingle set.
+
+    One permutation hashing: each shingle hash is scrambled once, its top
+    bits pick a bin and each bin keeps its smallest value. Empty bins
+    borrow the value of the next filled bin (rotation densification).
+    """
+    bins = [EMPTY] * BINS
+    for h in hashes:
+        h = (h * 0x9E3779B1) & 0xFFFFFFFF
+        index = h >> VALUE_BITS
+        value = h & (EMPTY - 1)
+        if value < bins[index]:
+            bins[index] = value
+
+    if EMPTY in bins and any(value != EMPTY for value in bins):
+        filled = list(bins)
+        for index, value in enumerate(bins):
+            if value == EMPTY:
+                distance = 1
+                while bins[(index + distance) % BINS] == EMPTY:
+                    distance += 1
+                filled[index] = bins[(index + distance) % BINS] + distance * EMPTY
+        bins = filled
+    return bins
+
+
+def bands(bins):
+    """Return the LSH band keys of a signature"""
+    # Interleaved, so the neighbouring bins an empty bin borrows from end
+    # up in other bands
+    return [(band,) + tuple(bins[band::BANDS]) for band in range(BANDS)]
+
+
+def similarity(first, second):
+    """Return the Jaccard similarity of two shingle sets"""
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+class DuplicateIndex:
+    """
+    Incremental duplicate index over a store.
+
+    Only the hashes and band buckets are kept in memory; candidate texts
+    are read back from the store when they are compared, so deleted
+    duaas simply stop matching.
+
+    Args:
+        store: DuaaStore or SQLiteDuaaStore the ids refer to
+        threshold (float): Shingle similarity from which duaas are near-duplicates
+        near (bool): Also look for near-duplicates, not only exact ones
+    """
+
+    def __init__(self, store, threshold=THRESHOLD, near=True):
+        self.store = store
+        self.threshold = threshold
+        self.near = near
+        self._exact = {}        # fingerprint -> id of the first copy
+        self._copies = {}       # fingerprint -> ids of later exact copies
+        self._fingerprints = {} # id -> fingerprint
+        self._buckets = {}      # band key -> ids
+        self._signatures = {}   # id -> signature
+        self._pending = []      # ids still to index, see queue()
+        self._position = 0
+
+    def __len__(self):
+        return len(self._exact)
+
+    @property
+    def ready(self):
+        """Whether every queued duaa has been indexed"""
+        return self._position >= len(self._pending)
+
+    def build(self, page_size=1000):
+        """
+        Index every duaa of the store (the bulk "clean library" pass).
+
+        The first of each group of duplicates is indexed, the others are
+        returned.
+
+        Returns:
+            list: (duplicate id, original id, similarity) for each duplicate
+        """
+        duplicates = []
+        offset = 0
+        while True:
+            rows = self.store.page(offset, page_size)
+            if not rows:
+                return duplicates
+            offset += len(rows)
+            for duaa_id, text in rows:
+                key = exact_key(text)
+                match, bins = self._match(key)
+                if match is None:
+                    self._insert(duaa_id, key, bins)
+                else:
+                    duplicates.append((duaa_id,) + match)
+
+    def queue(self, duaa_ids):
+        """
+        Queue stored duaas to be indexed a slice at a time by index_pending().
+
+        Until they are, check() only compares with the duaas indexed so far.
+        """
+        self._pending = list(duaa_ids)
+        self._position = 0
+
+    def index_pending(self, limit=500):
+        """
+        Index up to limit queued duaas.
+
+        Returns:
+            bool: Whether the queue is now empty
+        """
+        end = min(self._position + limit, len(self._pending))
+        for duaa_id in self._pending[self._position:end]:
+            text = self._text(duaa_id)
+            if text is not None:
+                self.add(duaa_id, text)
+        self._position = end
+        if self.ready:
+            self._pending = []
+            self._position = 0
+            return True
+        return False
+
+    def check(self, text):
+        """
+        Look for an indexed duplicate of a text.
+
+        Returns:
+            tuple: (original id, similarity) of the closest match, None if
+                   there is none. Exact duplicates have similarity 1.0.
+        """
+        return self._match(exact_key(text))[0]
+
+    def add(self, duaa_id, text):
+        """Index a duaa that was added to the store"""
+        key = exact_key(text)
+        bins = signature(shingles(key)) if self.near and key else None
+        self._insert(duaa_id, key, bins)
+
+    def remove(self, duaa_id):
+        """Forget a deleted duaa, an exact copy of it (if indexed) takes its place"""
+        digest = self._fingerprints.pop(duaa_id, None)
+        if digest is not None:
+            copies = self._copies.get(digest)
+            if self._exact.get(digest) == duaa_id:
+                if copies:
+                    self._exact[digest] = copies.pop(0)
+                else:
+                    del self._exact[digest]
+            elif copies and duaa_id in copies:
+                copies.remove(duaa_id)
+            if copies is not None and not copies:
+                del self._copies[digest]
+
+        bins = self._signatures.pop(duaa_id, None)
+        if bins is not None:
+            for band in bands(bins):
+                bucket = self._buckets.get(band)
+                if bucket is not None and duaa_id in bucket:
+                    bucket.remove(duaa_id)
+                    if not bucket:
+                        del self._buckets[band]
+
+    def _insert(self, duaa_id, key, bins):
+        digest = fingerprint(key)
+        self._fingerprints[duaa_id] = digest
+        if digest not in self._exact:
+            self._exact[digest] = duaa_id
+        else:
+            self._copies.setdefault(digest, []).append(duaa_id)
+        if bins is not None:
+            self._signatures[duaa_id] = array("I", bins)
+            for band in bands(bins):
+                bucket = self._buckets.get(band)
+                if bucket is None:
+                    self._buckets[band] = [duaa_id]
+                else:
+                    bucket.append(duaa_id)
+
+    def _match(self, key):
+        """Return (match or None, signature or None) for an exact key"""
+        digest = fingerprint(key)
+        original = self._exact.get(digest)
+        while original is not None:
+            if self._text(original) is not None:
+                return (original, 1.0), None
+            # Deleted without remove() being called
+            self.remove(original)
+            original = self._exact.get(digest)
+        if not self.near or not key:
+            return None, None
+
+        hashes = shingles(key)
+        bins = signature(hashes)
+        candidates = {}
+        for band in bands(bins):
+            for candidate in self._buckets.get(band, ()):
+                candidates[candidate] = True
+            if len(candidates) >= MAX_CANDIDATES:
+                break
+
+        # Estimate from the signatures first, compare the text only if close
+        best = None
+        cutoff = (self.threshold - ESTIMATE_MARGIN) * BINS
+        for candidate in candidates:
+            other = self._signatures.get(candidate)
+            if other is None or sum(map(operator.eq, bins, other)) < cutoff:
+                continue
+            text = self._text(candidate)
+            if text is None:
+                self.remove(candidate)
+                continue
+            score = similarity(hashes, shingles(exact_key(text)))
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (candidate, score)
+        return best, bins
+
+    def _text(self, duaa_id):
+        try:
+            return self.store.get(duaa_id)
+        except (KeyError, IndexError):
+            return None
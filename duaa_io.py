@@ -0,0 +1,317 @@
+"""
+Bulk import and export for Athkar Reminder application.
+
+Duaa collections are read and written as JSON (an array of strings or
+{"text", "category", "source", "translation"} objects, the same format
+as duaas.json), JSON Lines, CSV (a "text" column plus optional
+"category", "source" and "translation") or plain text with one duaa per
+line.
+
+Files are streamed rather than loaded whole. Imported entries are
+validated, compared with the collection (and each other) by their
+normalised text (see dedup.exact_key) so the same duaa is never added
+twice, and committed in batches with one store write per batch.
+"""
+
+import csv
+import json
+import os
+import re
+import tempfile
+
+from dedup import exact_key
+from duaa_store import RECORD_FIELDS, file_mode
+
+# Supported formats and the file extensions they are detected from
+FORMATS = ("json", "jsonl", "csv", "txt")
+EXTENSIONS = {".json": "json", ".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv", ".txt": "txt"}
+
+# Entries longer than this are rejected as invalid
+MAX_LENGTH = 5000
+
+# New duaas committed per store write
+BATCH_SIZE = 5000
+
+# Error messages kept in an import report
+MAX_ERRORS = 20
+
+# Whitespace and commas between the elements of a JSON array
+SEPARATOR = re.compile(r"[\s,]*")
+
+
+def detect_format(path, format=None):
+    """Return the format of a file, from format if given, else from its extension"""
+    if format is None:
+        format = EXTENSIONS.get(os.path.splitext(path)[1].lower())
+        if format is None:
+            raise ValueError(f"Cannot tell the format of {path}, use one of: {', '.join(FORMATS)}")
+    if format not in FORMATS:
+        raise ValueError(f"Unknown format: {format!r}")
+    return format
+
+
+def validate(entry, category=None):
+    """
+    Turn one raw entry into a duaa record.
+
+    Args:
+        entry: A string or a dict with "text" and optional "category",
+               "source" and "translation"
+        category (str): Category used when the entry has none
+
+    Returns:
+        dict: text, category, source and translation
+
+    Raises:
+        ValueError: If the entry is not a usable duaa
+    """
+    if isinstance(entry, str):
+        entry = {"text": entry}
+    if not isinstance(entry, dict):
+        raise ValueError(f"expected a string or an object, got {type(entry).__name__}")
+    text = entry.get("text")
+    if not isinstance(text, str):
+        raise ValueError("missing text")
+    text = text.strip()
+    if not text:
+        raise ValueError("empty text")
+    if len(text) > MAX_LENGTH:
+        raise ValueError(f"text longer than {MAX_LENGTH} characters")
+    if "\x00" in text:
+        raise ValueError("text contains a NUL character")
+
+    record = {"text": text, "category": category, "source": None, "translation": None}
+    for field in RECORD_FIELDS[1:]:
+        value = entry.get(field)
+        if value is None or value == "":
+            continue
+        if not isinstance(value, str):
+            raise ValueError(f"{field} must be a string")
+        record[field] = value.strip()
+    return record
+
+
+# Readers yield (line number, raw entry); a raw entry that could not be
+# parsed is yielded as a ValueError so one bad line does not end the import
+
+def _read_text(f):
+    for line_number, line in enumerate(f, 1):
+        if line.strip():
+            yield line_number, line
+
+
+def _read_jsonl(f):
+    for line_number, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as e:
+            yield line_number, ValueError(f"invalid JSON: {e}")
+
+
+def _read_csv(f):
+    reader = csv.reader(f)
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = [name.strip().lower() for name in header]
+    if "text" not in columns:
+        # No header row, the first column is the text
+        yield reader.line_num, {"text": header[0] if header else ""}
+        columns = ["text"]
+    for row in reader:
+        if not any(cell.strip() for cell in row):
+            continue
+        yield reader.line_num, dict(zip(columns, row))
+
+
+def _read_json(f, chunk_size=65536):
+    """Yield the elements of a JSON array without loading the whole file"""
+    decoder = json.JSONDecoder()
+    buffer = f.read(chunk_size)
+    position = len(buffer) - len(buffer.lstrip())
+    if not buffer.startswith("[", position):
+        raise ValueError("a JSON import file must contain an array")
+    position += 1
+    line_number = 1
+    counted = 0
+    while True:
+        # Skip whitespace and the comma between elements
+        position = SEPARATOR.match(buffer, position).end()
+        if position == len(buffer):
+            chunk = f.read(chunk_size)
+            if not chunk:
+                raise ValueError("unexpected end of the JSON array")
+            line_number += buffer.count("\n", counted)
+            buffer, position, counted = chunk, 0, 0
+            continue
+        if buffer[position] == "]":
+            return
+
+        try:
+            element, end = decoder.raw_decode(buffer, position)
+        except ValueError:
+            end = None
+        if end is None or end == len(buffer):
+            # The element may continue in the next chunk
+            chunk = f.read(chunk_size)
+            if chunk:
+                line_number += buffer.count("\n", counted, position)
+                buffer, position, counted = buffer[position:] + chunk, 0, 0
+                continue
+            if end is None:
+                line_number += buffer.count("\n", counted, position)
+                raise ValueError(f"invalid JSON at line {line_number}")
+
+        line_number += buffer.count("\n", counted, position)
+        counted = position
+        yield line_number, element
+        position = end
+
+
+READERS = {
+    "json": _read_json,
+    "jsonl": _read_jsonl,
+    "csv": _read_csv,
+    "txt": _read_text,
+}
+
+
+def read_duaas(path, format=None):
+    """
+    Stream the raw entries of a file.
+
+    Yields:
+        tuple: (line number, raw entry or ValueError)
+    """
+    format = detect_format(path, format)
+    newline = "" if format == "csv" else None
+    with open(path, "r", encoding="utf-8-sig", newline=newline) as f:
+        yield from READERS[format](f)
+
+
+def import_duaas(store, path, format=None, category=None, batch_size=BATCH_SIZE, on_batch=None):
+    """
+    Import duaas from a file into a store.
+
+    Args:
+        store: DuaaStore or SQLiteDuaaStore
+        path (str): File to import
+        format (str): One of FORMATS, detected from the extension if None
+        category (str): Category for entries that do not name one
+        batch_size (int): New duaas committed per store write
+        on_batch: Called with the ids of each committed batch
+
+    Returns:
+        dict: read, added, duplicates and invalid counts, and the first
+              few error messages
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the format is unknown or the file is not valid at all
+    """
+    report = {"read": 0, "added": 0, "duplicates": 0, "invalid": 0, "errors": []}
+    seen = {exact_key(text) for text in store}
+    batch = []
+
+    def commit():
+        ids = store.add_records(batch)
+        report["added"] += len(ids)
+        batch.clear()
+        if on_batch is not None:
+            on_batch(ids)
+
+    entries = read_duaas(path, format)
+    while True:
+        try:
+            line_number, entry = next(entries)
+        except StopIteration:
+            break
+        except ValueError as e:
+            # The rest of the file cannot be parsed, keep what was read so far
+            if not report["read"]:
+                raise
+            report["invalid"] += 1
+            report["errors"].append(f"stopped reading: {e}")
+            break
+
+        report["read"] += 1
+        try:
+            if isinstance(entry, ValueError):
+                raise entry
+            record = validate(entry, category)
+        except ValueError as e:
+            report["invalid"] += 1
+            if len(report["errors"]) < MAX_ERRORS:
+                report["errors"].append(f"line {line_number}: {e}")
+            continue
+
+        key = exact_key(record["text"])
+        if key in seen:
+            report["duplicates"] += 1
+            continue
+        seen.add(key)
+        # Reused by the SQLite full-text index (punctuation is a separator there too)
+        record["norm"] = key
+        batch.append(record)
+        if len(batch) >= batch_size:
+            commit()
+
+    if batch:
+        commit()
+    return report
+
+
+def export_duaas(store, path, format=None):
+    """
+    Export a store to a file, replacing it atomically.
+
+    Args:
+        store: DuaaStore or SQLiteDuaaStore
+        path (str): File to write
+        format (str): One of FORMATS, detected from the extension if None
+
+    Returns:
+        int: Number of duaas written
+    """
+    format = detect_format(path, format)
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    count = 0
+    try:
+        os.chmod(temp_path, file_mode(path))
+        with os.fdopen(fd, "w", encoding="utf-8", newline="" if format == "csv" else None) as f:
+            if format == "csv":
+                writer = csv.writer(f)
+                writer.writerow(RECORD_FIELDS)
+            elif format == "json":
+                f.write("[")
+
+            for record in store.records():
+                if format == "csv":
+                    writer.writerow([getattr(record, field) or "" for field in RECORD_FIELDS])
+                elif format == "txt":
+                    # One duaa per line, so line breaks inside a duaa become spaces
+                    f.write(" ".join(record.text.split()) + "\n")
+                else:
+                    # Records without metadata stay plain strings, as in duaas.json
+                    line = json.dumps(record.to_json(), ensure_ascii=False)
+                    if format == "json":
+                        f.write(("\n    " if count == 0 else ",\n    ") + line)
+                    else:
+                        f.write(line + "\n")
+                count += 1
+
+            if format == "json":
+                f.write("\n]\n" if count else "]\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    return count
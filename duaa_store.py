@@ -0,0 +1,745 @@
+"""
+Duaa storage for Athkar Reminder application.
+
+Each duaa is a DuaaRecord: its text plus an optional category (e.g.
+"morning"), source (a hadith reference) and translation.
+
+The default backend keeps the collection in a JSON array (duaas.json)
+plus an append-only operation log next to it. Entries without metadata
+are stored as plain strings, so a legacy array of strings loads as is.
+Edits only append one line to the log; the log is periodically
+compacted into a new snapshot that is written atomically.
+
+The optional SQLite backend keeps the collection on disk with stable ids,
+category/source/translation columns and a full-text index, and reads it
+a page at a time.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import stat
+import sys
+import tempfile
+import threading
+
+from arabic import normalize
+
+
+def atomic_write_json(path, data, indent=4):
+    """
+    Write JSON to path atomically (temp file + fsync + replace).
+
+    Returns:
+        bytes: The bytes that were written
+    """
+    return atomic_write_bytes(path, json.dumps(data, ensure_ascii=False, indent=indent).encode("utf-8"))
+
+
+def file_mode(path):
+    """Return the permissions for a file replacing path: its own, or the umask default if new"""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def atomic_write_bytes(path, raw):
+    """Write bytes to path atomically (temp file + fsync + replace) and return them"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        # mkstemp creates the file private (0600), give it the permissions of what it replaces
+        os.chmod(temp_path, file_mode(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        return raw
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+# Fields of a duaa record, in snapshot order
+RECORD_FIELDS = ("text", "category", "source", "translation")
+
+
+class DuaaRecord:
+    """
+    One duaa and its optional metadata.
+
+    Uses __slots__ and interns the category and source, which repeat
+    throughout a library, so large collections stay small in memory.
+
+    Args:
+        text (str): The duaa
+        category (str): Category such as "morning" or "evening"
+        source (str): Where the duaa is narrated (e.g. a hadith reference)
+        translation (str): Translation of the duaa
+    """
+
+    __slots__ = RECORD_FIELDS
+
+    def __init__(self, text, category=None, source=None, translation=None):
+        self.text = text
+        self.category = sys.intern(category) if category else None
+        self.source = sys.intern(source) if source else None
+        self.translation = translation or None
+
+    @classmethod
+    def from_json(cls, entry):
+        """Create a record from a plain string (the legacy format) or a dict"""
+        if isinstance(entry, str):
+            return cls(entry)
+        return cls(entry["text"], entry.get("category"), entry.get("source"), entry.get("translation"))
+
+    def to_json(self):
+        """Return the record as JSON data, the plain text when there is no metadata"""
+        if self.category is None and self.source is None and self.translation is None:
+            return self.text
+        return {field: getattr(self, field) for field in RECORD_FIELDS if getattr(self, field) is not None}
+
+    def __eq__(self, other):
+        return isinstance(other, DuaaRecord) and all(
+            getattr(self, field) == getattr(other, field) for field in RECORD_FIELDS)
+
+    def __repr__(self):
+        return f"DuaaRecord({self.text!r}, category={self.category!r})"
+
+
+def dump_snapshot(entries):
+    """
+    Encode a snapshot array of strings and record dicts.
+
+    An array of strings comes out exactly like json.dumps(entries,
+    indent=4, ensure_ascii=False). The indenting encoder is pure Python;
+    encoding each entry with the C encoder and joining is several times
+    faster for large collections.
+    """
+    if not entries:
+        return b"[]"
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    return ("[\n    " + ",\n    ".join(map(encode, entries)) + "\n]").encode("utf-8")
+
+
+class DuaaStore:
+    """
+    JSON snapshot + operation log storage for the duaa collection.
+
+    Entries get an id that is stable for the lifetime of the store, and are
+    also addressable by position. An index by category keeps per-category
+    counts and lookups O(1).
+
+    Args:
+        path (str): Path of the JSON snapshot (duaas.json)
+        defaults (list): Duaas (strings or record dicts) used when no snapshot exists yet
+        compact_every (int): Number of logged operations that triggers compaction
+                             (at least; the log may grow to half the collection)
+    """
+
+    def __init__(self, path="duaas.json", defaults=None, compact_every=500):
+        self.path = path
+        self.log_path = path + ".log"
+        self.compact_every = compact_every
+        # Incremented on every change, lets views cache what they read
+        self.changes = 0
+        self._records = []
+        self._ids = []
+        self._by_id = {}
+        self._categories = {}   # category -> {id: None}, in insertion order
+        self._next_id = 1
+        self._log_ops = 0
+        self._base_hash = None
+        self.load(defaults or [])
+
+    # Loading and compaction
+
+    def load(self, defaults):
+        """Load the snapshot and replay the operation log on top of it"""
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as f:
+                raw = f.read()
+            entries = json.loads(raw.decode("utf-8"))
+            self._base_hash = hashlib.sha1(raw).hexdigest()
+        else:
+            entries = list(defaults)
+            self._base_hash = None
+
+        self._records = []
+        self._ids = []
+        self._by_id = {}
+        self._categories = {}
+        for entry in entries:
+            self._append(DuaaRecord.from_json(entry))
+
+        replayed, complete = self._replay_log()
+        if self._base_hash is None or not complete or self._compaction_due():
+            # Start from a clean snapshot (also drops a torn log tail)
+            self.compact()
+
+    def _replay_log(self):
+        """Apply logged operations, returns (number replayed, whether the log was intact)"""
+        if not os.path.exists(self.log_path):
+            return 0, True
+
+        replayed = 0
+        complete = True
+        with open(self.log_path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn last line from a crash mid-append, ignore it
+                    complete = False
+                    break
+                if line_number == 0:
+                    # The header names the snapshot the log applies to. A
+                    # mismatch means compaction finished but the old log
+                    # was not removed yet; report it as not intact so load()
+                    # compacts and new operations start a fresh log.
+                    if record.get("base") != self._base_hash:
+                        complete = False
+                        break
+                    continue
+                if record["op"] == "add":
+                    self._append(DuaaRecord.from_json(record))
+                elif record["op"] == "delete":
+                    self._remove_at(record["index"])
+                elif record["op"] == "category":
+                    self._recategorise(self._ids[record["index"]], record["category"])
+                replayed += 1
+
+        self._log_ops = replayed
+        return replayed, complete
+
+    def compact(self):
+        """Write the full collection as a new snapshot and drop the log"""
+        raw = atomic_write_bytes(self.path, dump_snapshot([record.to_json() for record in self._records]))
+        self._base_hash = hashlib.sha1(raw).hexdigest()
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+        self._log_ops = 0
+
+    def close(self):
+        """Compact pending operations (called on exit)"""
+        if self._log_ops:
+            self.compact()
+
+    def _log(self, *records):
+        """Append operation records to the log with a single write"""
+        lines = []
+        if not os.path.exists(self.log_path):
+            lines.append(json.dumps({"base": self._base_hash}))
+        lines.extend(json.dumps(record, ensure_ascii=False) for record in records)
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._log_ops += len(records)
+        if self._compaction_due():
+            self.compact()
+
+    def _compaction_due(self, pending=0):
+        """Whether the log (plus pending operations) should be folded into the snapshot"""
+        # Compaction rewrites the whole collection, so let the log grow with
+        # it; bulk imports then cost linear time instead of quadratic
+        return self._log_ops + pending >= max(self.compact_every, len(self._records) // 2)
+
+    # Collection access
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        return (record.text for record in self._records)
+
+    def __getitem__(self, index):
+        return self._records[index].text
+
+    def ids(self, category=None):
+        """Return the ids of all entries (optionally of one category) in order"""
+        if category is None:
+            return list(self._ids)
+        return list(self._categories.get(category, ()))
+
+    def count(self, category=None):
+        """Return the number of entries (optionally of one category)"""
+        if category is None:
+            return len(self._records)
+        return len(self._categories.get(category, ()))
+
+    def categories(self):
+        """Return the number of entries per category"""
+        return {category: len(ids) for category, ids in self._categories.items()}
+
+    def id_at(self, index):
+        """Return the id of the entry at a position"""
+        return self._ids[index]
+
+    def index_of(self, duaa_id):
+        """Return the position of an entry by id"""
+        return self._ids.index(duaa_id)
+
+    def get(self, duaa_id):
+        """Return the text of an entry by id"""
+        return self._by_id[duaa_id].text
+
+    def record(self, duaa_id):
+        """Return the DuaaRecord of an entry by id"""
+        return self._by_id[duaa_id]
+
+    def records(self):
+        """Iterate over the DuaaRecords of all entries in order"""
+        return iter(self._records)
+
+    def page(self, offset, limit):
+        """Return up to limit (id, text) pairs starting at offset"""
+        return [(duaa_id, record.text) for duaa_id, record in
+                zip(self._ids[offset:offset + limit], self._records[offset:offset + limit])]
+
+    # Editing
+
+    def add(self, text, category=None, source=None, translation=None):
+        """Add a duaa and return its id"""
+        return self.add_records([DuaaRecord(text, category, source, translation)])[0]
+
+    def add_many(self, texts, category=None, source=None):
+        """Add several duaas with a single write and return their ids"""
+        return self.add_records([DuaaRecord(text, category, source) for text in texts])
+
+    def add_records(self, records):
+        """Add DuaaRecords (or record dicts) with a single write and return their ids"""
+        records = [record if isinstance(record, DuaaRecord) else DuaaRecord.from_json(record)
+                   for record in records]
+        ids = [self._append(record) for record in records]
+        if self._compaction_due(len(ids)):
+            # The log would be compacted straight away, write the snapshot once instead
+            self.compact()
+        elif ids:
+            self._log(*(self._add_operation(record) for record in records))
+        return ids
+
+    @staticmethod
+    def _add_operation(record):
+        entry = record.to_json()
+        if isinstance(entry, str):
+            return {"op": "add", "text": entry}
+        return {"op": "add", **entry}
+
+    def delete(self, duaa_id):
+        """Delete a duaa by id"""
+        index = self.index_of(duaa_id)
+        self._remove_at(index)
+        self._log({"op": "delete", "index": index})
+
+    def delete_many(self, duaa_ids):
+        """Delete several duaas by id with a single write"""
+        remove = set(duaa_ids) & self._by_id.keys()
+        if not remove:
+            return
+        # Highest position first, so each logged index is still valid on replay
+        indexes = [index for index, duaa_id in enumerate(self._ids) if duaa_id in remove]
+        records = [{"op": "delete", "index": index} for index in reversed(indexes)]
+        kept = [(duaa_id, record) for duaa_id, record in zip(self._ids, self._records) if duaa_id not in remove]
+        self._ids = [duaa_id for duaa_id, record in kept]
+        self._records = [record for duaa_id, record in kept]
+        for duaa_id in remove:
+            self._unindex(duaa_id, self._by_id.pop(duaa_id))
+        self.changes += 1
+        if self._compaction_due(len(records)):
+            self.compact()
+        else:
+            self._log(*records)
+
+    def set_category(self, duaa_id, category):
+        """Move a duaa to another category (None for no category)"""
+        index = self.index_of(duaa_id)
+        if self._recategorise(duaa_id, category):
+            self._log({"op": "category", "index": index, "category": category or None})
+
+    def _append(self, record):
+        duaa_id = self._next_id
+        self._next_id += 1
+        self._records.append(record)
+        self._ids.append(duaa_id)
+        self._by_id[duaa_id] = record
+        self._index(duaa_id, record)
+        self.changes += 1
+        return duaa_id
+
+    def _recategorise(self, duaa_id, category):
+        """Change the category of an entry, returns False if it already had it"""
+        record = self._by_id[duaa_id]
+        category = sys.intern(category) if category else None
+        if category == record.category:
+            return False
+        self._unindex(duaa_id, record)
+        record.category = category
+        self._index(duaa_id, record)
+        self.changes += 1
+        return True
+
+    def _remove_at(self, index):
+        self._records.pop(index)
+        duaa_id = self._ids.pop(index)
+        self._unindex(duaa_id, self._by_id.pop(duaa_id))
+        self.changes += 1
+
+    def _index(self, duaa_id, record):
+        """Add an entry to the category index, keeping each category in id order"""
+        if record.category is None:
+            return
+        ids = self._categories.get(record.category)
+        if ids is None:
+            self._categories[record.category] = {duaa_id: None}
+        elif duaa_id > next(reversed(ids)):
+            ids[duaa_id] = None
+        else:
+            # Only a recategorised entry lands before the end
+            self._categories[record.category] = dict.fromkeys(sorted([*ids, duaa_id]))
+
+    def _unindex(self, duaa_id, record):
+        """Drop an entry from the category index"""
+        if record.category is not None:
+            ids = self._categories[record.category]
+            del ids[duaa_id]
+            if not ids:
+                del self._categories[record.category]
+
+
+class SQLiteDuaaStore:
+    """
+    SQLite storage for large duaa collections.
+
+    Offers the same interface as DuaaStore, but only the requested pages
+    are read into memory. On first run the collection is imported from
+    the JSON snapshot (or the defaults).
+
+    Args:
+        path (str): Path of the SQLite database (duaas.db)
+        json_path (str): JSON snapshot to import from when the database is empty
+        defaults (list): Duaas used when there is nothing to import
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS duaas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            text TEXT NOT NULL,
+            category TEXT,
+            source TEXT,
+            translation TEXT
+        );
+        CREATE INDEX IF NOT EXISTS duaas_category ON duaas(category);
+    """
+
+    # PRAGMA user_version once the first-run import is done
+    IMPORTED = 1
+
+    def __init__(self, path="duaas.db", json_path="duaas.json", defaults=None):
+        self.path = path
+        # The tray thread reads from the store too, serialise access
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(self.SCHEMA)
+        self._migrate()
+        self.has_fts = self._create_fts()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM duaas").fetchone()[0]
+        # Entries per category, kept up to date by every edit
+        self._category_counts = dict(self._conn.execute(
+            "SELECT category, COUNT(*) FROM duaas WHERE category IS NOT NULL GROUP BY category"))
+        # Incremented on every change, lets views cache what they read
+        self.changes = 0
+
+        # The first run imports the collection; an empty library later on
+        # is one the user emptied, so it is recorded rather than guessed
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < self.IMPORTED:
+            if self._count == 0:
+                self._import(json_path, defaults or [])
+            # Databases from older versions were imported when first filled
+            self._conn.execute(f"PRAGMA user_version = {self.IMPORTED}")
+
+    def _migrate(self):
+        """Add columns missing from databases created by older versions"""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(duaas)")}
+        if "translation" not in columns:
+            with self._conn:
+                self._conn.execute("ALTER TABLE duaas ADD COLUMN translation TEXT")
+
+    def _create_fts(self):
+        """Create the full-text index over normalised text, if FTS5 is available"""
+        try:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS duaas_fts USING fts5(norm)")
+            return True
+        except sqlite3.OperationalError:
+            return False
+
+    def _import(self, json_path, defaults):
+        """Import the JSON snapshot on first run"""
+        records = defaults
+        if json_path and os.path.exists(json_path):
+            # Also picks up edits still waiting in the JSON operation log
+            records = list(DuaaStore(json_path).records())
+        self.add_records(records)
+
+    # Collection access
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        # Stream in pages so iteration never loads the whole table
+        offset = 0
+        while True:
+            rows = self.page(offset, 500)
+            if not rows:
+                return
+            for duaa_id, text in rows:
+                yield text
+            offset += len(rows)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        rows = self.page(index, 1)
+        if not rows:
+            raise IndexError("duaa index out of range")
+        return rows[0][1]
+
+    def ids(self, category=None):
+        """Return the ids of all entries (optionally of one category) in order"""
+        with self._lock:
+            if category is None:
+                cursor = self._conn.execute("SELECT id FROM duaas ORDER BY id")
+            else:
+                cursor = self._conn.execute(
+                    "SELECT id FROM duaas WHERE category = ? ORDER BY id", (category,))
+            return [row[0] for row in cursor]
+
+    def count(self, category=None):
+        """Return the number of entries (optionally of one category)"""
+        if category is None:
+            return self._count
+        return self._category_counts.get(category, 0)
+
+    def categories(self):
+        """Return the number of entries per category"""
+        return dict(self._category_counts)
+
+    def id_at(self, index):
+        """Return the id of the entry at a position"""
+        rows = self.page(index, 1)
+        if not rows:
+            raise IndexError("duaa index out of range")
+        return rows[0][0]
+
+    def index_of(self, duaa_id):
+        """Return the position of an entry by id"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM duaas WHERE id < ?", (duaa_id,)).fetchone()[0]
+
+    def get(self, duaa_id):
+        """Return the text of an entry by id"""
+        with self._lock:
+            row = self._conn.execute("SELECT text FROM duaas WHERE id = ?", (duaa_id,)).fetchone()
+        if row is None:
+            raise KeyError(duaa_id)
+        return row[0]
+
+    def page(self, offset, limit):
+        """Return up to limit (id, text) pairs starting at offset"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, text FROM duaas ORDER BY id LIMIT ? OFFSET ?",
+                (limit, offset)).fetchall()
+
+    def record(self, duaa_id):
+        """Return the DuaaRecord of an entry by id"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, category, source, translation FROM duaas WHERE id = ?", (duaa_id,)).fetchone()
+        if row is None:
+            raise KeyError(duaa_id)
+        return DuaaRecord(*row)
+
+    def records(self, page_size=500):
+        """Stream the DuaaRecords of all entries in order, a page at a time"""
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, text, category, source, translation FROM duaas "
+                    "WHERE id > ? ORDER BY id LIMIT ?", (last_id, page_size)).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                last_id = row[0]
+                yield DuaaRecord(*row[1:])
+
+    def search(self, query, limit=100):
+        """Return (id, text) pairs whose normalised text contains all query words"""
+        words = normalize(query).split()
+        if not words:
+            return []
+        with self._lock:
+            if self.has_fts:
+                # Quote each word so FTS operators in user input are literal
+                match = " ".join('"' + word.replace('"', '""') + '"*' for word in words)
+                return self._conn.execute(
+                    "SELECT duaas.id, duaas.text FROM duaas_fts "
+                    "JOIN duaas ON duaas.id = duaas_fts.rowid "
+                    "WHERE duaas_fts MATCH ? ORDER BY duaas.id LIMIT ?",
+                    (match, limit)).fetchall()
+            rows = self._conn.execute("SELECT id, text FROM duaas ORDER BY id")
+            return [(duaa_id, text) for duaa_id, text in rows
+                    if all(word in normalize(text) for word in words)][:limit]
+
+    # Editing
+
+    def add(self, text, category=None, source=None, translation=None):
+        """Add a duaa and return its id"""
+        return self.add_records([DuaaRecord(text, category, source, translation)])[0]
+
+    def add_many(self, texts, category=None, source=None):
+        """Add several duaas in one transaction and return their ids"""
+        return self.add_records([DuaaRecord(text, category, source) for text in texts])
+
+    def add_records(self, records):
+        """
+        Add DuaaRecords (or record dicts) in one transaction and return their ids.
+
+        A record dict may carry its normalised text as "norm" (the importer
+        already computed it) so the full-text index does not redo it.
+        """
+        ids = []
+        indexed = []
+        categories = {}
+        with self._lock, self._conn:
+            for entry in records:
+                norm = None
+                record = entry
+                if not isinstance(entry, DuaaRecord):
+                    norm = entry.get("norm") if isinstance(entry, dict) else None
+                    record = DuaaRecord.from_json(entry)
+                cursor = self._conn.execute(
+                    "INSERT INTO duaas (text, category, source, translation) VALUES (?, ?, ?, ?)",
+                    (record.text, record.category, record.source, record.translation))
+                ids.append(cursor.lastrowid)
+                if record.category is not None:
+                    categories[record.category] = categories.get(record.category, 0) + 1
+                if self.has_fts:
+                    indexed.append((cursor.lastrowid, norm or normalize(record.text)))
+            if indexed:
+                self._conn.executemany("INSERT INTO duaas_fts (rowid, norm) VALUES (?, ?)", indexed)
+        self._count += len(ids)
+        self._counted(categories, 1)
+        return ids
+
+    def delete(self, duaa_id):
+        """Delete a duaa by id"""
+        self.delete_many([duaa_id])
+
+    def delete_many(self, duaa_ids):
+        """Delete several duaas by id in one transaction"""
+        rows = [(duaa_id,) for duaa_id in duaa_ids]
+        categories = {}
+        with self._lock, self._conn:
+            for duaa_id, in rows:
+                row = self._conn.execute("SELECT category FROM duaas WHERE id = ?", (duaa_id,)).fetchone()
+                if row is not None and row[0] is not None:
+                    categories[row[0]] = categories.get(row[0], 0) + 1
+            cursor = self._conn.executemany("DELETE FROM duaas WHERE id = ?", rows)
+            deleted = cursor.rowcount
+            if self.has_fts:
+                self._conn.executemany("DELETE FROM duaas_fts WHERE rowid = ?", rows)
+        self._count -= deleted
+        self._counted(categories, -1)
+
+    def set_category(self, duaa_id, category):
+        """Move a duaa to another category (None for no category)"""
+        category = category or None
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT category FROM duaas WHERE id = ?", (duaa_id,)).fetchone()
+            if row is None:
+                raise KeyError(duaa_id)
+            if row[0] == category:
+                return
+            self._conn.execute("UPDATE duaas SET category = ? WHERE id = ?", (category, duaa_id))
+        if row[0] is not None:
+            self._counted({row[0]: 1}, -1)
+        if category is not None:
+            self._counted({category: 1}, 1)
+
+    def _counted(self, categories, sign):
+        """Apply added (sign 1) or deleted (sign -1) entries to the category counts"""
+        for category, count in categories.items():
+            count = self._category_counts.get(category, 0) + sign * count
+            if count > 0:
+                self._category_counts[category] = count
+            else:
+                self._category_counts.pop(category, None)
+        self.changes += 1
+
+    def compact(self):
+        """Nothing to compact, every edit is committed immediately"""
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+class CategoryView:
+    """
+    Read-only view of the duaas of one category.
+
+    Selection policies accept it in place of a store, so each schedule
+    rule can rotate through its own category. The category's ids are
+    read once and cached until the store changes, so positional access
+    is O(1).
+
+    Args:
+        store: A store with ids(category), count(category) and changes
+        category (str): The category to show
+    """
+
+    def __init__(self, store, category):
+        self.store = store
+        self.category = category
+        self._ids = None
+        self._changes = None
+
+    @property
+    def changes(self):
+        """The store's change counter, the view changes with it"""
+        return self.store.changes
+
+    def __len__(self):
+        return self.store.count(self.category)
+
+    def __getitem__(self, index):
+        return self.store.get(self._cached_ids()[index])
+
+    def ids(self):
+        """Return the ids of the category's entries in order"""
+        return list(self._cached_ids())
+
+    def get(self, duaa_id):
+        """Return the text of an entry by id"""
+        return self.store.get(duaa_id)
+
+    def _cached_ids(self):
+        if self._ids is None or self._changes != self.store.changes:
+            self._ids = self.store.ids(self.category)
+            self._changes = self.store.changes
+        return self._ids
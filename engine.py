@@ -0,0 +1,728 @@
+"""
+Headless reminder engine for Athkar Reminder application.
+
+Holds everything that does not need a display: the settings store, the
+duaa repository, the selection policy and the scheduler. The Tk front-end
+drives a ReminderEngine with a TkTimer; without a display the engine runs
+on a LoopTimer as a small daemon:
+
+    python engine.py [--interval MINUTES]
+"""
+
+import argparse
+import heapq
+import itertools
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from datetime import datetime
+
+import duaa_io
+from dedup import DuplicateIndex, exact_key
+from duaa_store import CategoryView, DuaaStore, SQLiteDuaaStore, atomic_write_json
+from instance import SingleInstance
+from scheduler import CATCH_UP_POLICIES, ReminderScheduler, RuleSchedule, suspend_aware_clock
+from selection import create_selection
+
+# Default duaas from Prophet Mohammed
+DEFAULT_DUAAS = [
+    "اللَّهُمَّ إِنِّي أَسْأَلُكَ الْهُدَى، وَالتُّقَى، وَالْعَفَافَ، وَالْغِنَى",
+    "رَبِّ اغْفِرْ لِي خَطِيئَتِي وَجَهْلِي، وَإِسْرَافِي فِي أَمْرِي كُلِّهِ، وَمَا أَنْتَ أَعْلَمُ بِهِ مِنِّي",
+    "اللَّهُمَّ اغْفِرْ لِي ذَنْبِي كُلَّهُ، دِقَّهُ وَجِلَّهُ، وَأَوَّلَهُ وَآخِرَهُ، وَعَلَانِيَتَهُ وَسِرَّهُ",
+    "اللَّهُمَّ إِنِّي أَعُوذُ بِكَ مِنْ شَرِّ مَا عَمِلْتُ، وَمِنْ شَرِّ مَا لَمْ أَعْمَلْ",
+    "اللَّهُمَّ إِنِّي أَعُوذُ بِكَ مِنَ الْهَمِّ وَالْحَزَنِ، وَالْعَجْزِ وَالْكَسَلِ، وَالْجُبْنِ وَالْبُخْلِ، وَضَلَعِ الدَّيْنِ وَغَلَبَةِ الرِّجَالِ",
+    "اللَّهُمَّ إِنِّي أَسْأَلُكَ الْجَنَّةَ وَأَعُوذُ بِكَ مِنَ النَّارِ",
+    "اللَّهُمَّ أَصْلِحْ لِي دِينِي الَّذِي هُوَ عِصْمَةُ أَمْرِي، وَأَصْلِحْ لِي دُنْيَايَ الَّتِي فِيهَا مَعَاشِي",
+    "اللَّهُمَّ إِنِّي أَعُوذُ بِكَ مِنْ زَوَالِ نِعْمَتِكَ، وَتَحَوُّلِ عَافِيَتِكَ، وَفُجَاءَةِ نِقْمَتِكَ، وَجَمِيعِ سَخَطِكَ",
+    "لَا إِلَهَ إِلَّا اللَّهُ وَحْدَهُ لَا شَرِيكَ لَهُ، لَهُ الْمُلْكُ وَلَهُ الْحَمْدُ وَهُوَ عَلَى كُلِّ شَيْءٍ قَدِيرٌ",
+    "سُبْحَانَ اللَّهِ وَبِحَمْدِهِ، سُبْحَانَ اللَّهِ الْعَظِيمِ"
+]
+
+# Default settings
+DEFAULT_SETTINGS = {
+    "language": "English",
+    "storage": "json",  # "json" or "sqlite" for large libraries
+    "reminder_interval": 30,
+    "selection": "shuffle",  # "random", "shuffle", "weighted" or "spaced"
+    "selection_seed": None,
+    # Rule-based schedule used instead of the interval when not empty, e.g.
+    # {"start": "fajr", "end": "sunrise", "every": 20, "category": "morning"}
+    "schedule": [],
+    "quiet_hours": [],  # ["HH:MM", "HH:MM"] windows without reminders
+    "location": None,   # {"latitude": ..., "longitude": ...} for prayer times
+    "prayer_method": "MWL",  # "MWL", "UmmAlQura", "Egyptian" or "ISNA"
+    "asr_method": "standard",  # "standard" or "hanafi"
+    # Reminders missed during suspend or a clock jump: "skip", "fire_once" or "coalesce"
+    "catch_up": "fire_once",
+    # Shingle similarity (0-1) from which two duaas count as near-duplicates
+    "duplicate_threshold": 0.8
+}
+
+# Duaas indexed per timer callback while the duplicate index is built
+DUPLICATE_INDEX_SLICE = 200
+
+
+class SettingsStore:
+    """
+    Application settings backed by settings.json.
+
+    Behaves like a dict of settings; missing keys fall back to the
+    defaults, and save() writes the file atomically.
+
+    Args:
+        path (str): Path of the settings file
+        defaults (dict): Values used for settings missing from the file
+    """
+
+    def __init__(self, path="settings.json", defaults=None):
+        self.path = path
+        self.values = dict(DEFAULT_SETTINGS if defaults is None else defaults)
+        self.load()
+
+    def load(self):
+        """Load settings from file over the defaults"""
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.values.update(json.load(f))
+            except Exception as e:
+                print(f"Error loading settings: {e}")
+
+    def save(self):
+        """Save settings to file"""
+        try:
+            atomic_write_json(self.path, self.values)
+        except Exception as e:
+            print(f"Error saving settings: {e}")
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def update(self, values):
+        self.values.update(values)
+
+    def __getitem__(self, key):
+        return self.values[key]
+
+    def __setitem__(self, key, value):
+        self.values[key] = value
+
+    def __contains__(self, key):
+        return key in self.values
+
+
+def open_duaa_store(settings, duaas_file="duaas.json"):
+    """Open the duaa storage backend chosen in settings"""
+    if settings.get("storage") == "sqlite":
+        # Indexed database, imported from duaas.json on first run
+        return SQLiteDuaaStore("duaas.db", json_path=duaas_file, defaults=DEFAULT_DUAAS)
+    # Snapshot + append-only log, edits only append to duaas.json.log
+    return DuaaStore(duaas_file, defaults=DEFAULT_DUAAS)
+
+
+class LoopTimer:
+    """
+    Timer backend with its own event loop, for running without Tk.
+
+    run() executes due callbacks on the calling thread until stop() is
+    called. call_later() and cancel() may be used from any thread.
+    """
+
+    def __init__(self):
+        self._queue = []   # heap of (due monotonic time, handle, callback)
+        self._cancelled = set()
+        self._handles = itertools.count(1)
+        self._condition = threading.Condition()
+        self._running = False
+
+    def call_later(self, delay, callback):
+        """Schedule callback after delay seconds and return a handle"""
+        with self._condition:
+            handle = next(self._handles)
+            heapq.heappush(self._queue, (time.monotonic() + max(0.0, delay), handle, callback))
+            self._condition.notify()
+        return handle
+
+    def call_soon(self, callback):
+        """Run callback on the loop thread as soon as possible"""
+        return self.call_later(0, callback)
+
+    def cancel(self, handle):
+        """Cancel a handle returned by call_later"""
+        with self._condition:
+            self._cancelled.add(handle)
+
+    def run(self):
+        """Run due callbacks until stop() is called"""
+        self._running = True
+        while True:
+            with self._condition:
+                callback = None
+                while self._running and callback is None:
+                    if not self._queue:
+                        self._condition.wait()
+                        continue
+                    due, handle, queued = self._queue[0]
+                    wait = due - time.monotonic()
+                    if wait > 0:
+                        self._condition.wait(wait)
+                        continue
+                    heapq.heappop(self._queue)
+                    if handle in self._cancelled:
+                        self._cancelled.discard(handle)
+                    else:
+                        callback = queued
+                if not self._running:
+                    return
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in scheduled callback: {e}")
+
+    def stop(self):
+        """Make run() return"""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+
+
+class ReminderEngine:
+    """
+    The reminder service without any user interface.
+
+    Every interval the selection policy picks a duaa from the store and
+    notify(duaa) is called with it; the front-end decides how to show it.
+
+    Args:
+        timer: Timer backend for the scheduler (TkTimer or LoopTimer)
+        notify: Called with the duaa text each time a reminder is due
+        settings (SettingsStore): Settings, loaded from settings.json if not given
+        store: Duaa store, opened from the settings if not given
+        selection: Selection policy, chosen by the settings if not given
+        clock: Function returning the current wall time in seconds
+        monotonic: Function returning monotonic seconds (see suspend_aware_clock)
+        selection_file (str): Where the selection state is kept between runs,
+                              None to not persist it
+    """
+
+    def __init__(self, timer, notify, settings=None, store=None, selection=None, clock=time.time,
+                 monotonic=suspend_aware_clock, selection_file="selection_state.json"):
+        self.settings = settings if settings is not None else SettingsStore()
+        self.store = store if store is not None else open_duaa_store(self.settings)
+        if selection is None:
+            selection = create_selection(self.settings.get("selection"),
+                                         self.settings.get("selection_seed"))
+        self.selection = selection
+        # Each schedule rule category rotates on its own
+        self.category_selections = {}
+        self._category_states = {}
+        self._category_views = {}
+        self.selection_file = selection_file
+        self.load_selection_state()
+        self.notify = notify
+        self.shown = 0
+        # Id of the duaa picked last (None if the policy does not track it)
+        self.last_id = None
+        # Built on first use, a slice at a time, see duplicate_index()
+        self.timer = timer
+        self._duplicates = None
+
+        # Event-driven scheduler: one armed timer for the next due reminder,
+        # at the configured schedule times or every interval
+        catch_up = self.settings.get("catch_up")
+        if catch_up not in CATCH_UP_POLICIES:
+            catch_up = "fire_once"
+        self.scheduler = ReminderScheduler(timer, self._on_due,
+                                           interval=self.settings.get("reminder_interval", 30),
+                                           clock=clock, schedule=self._load_schedule(),
+                                           monotonic=monotonic, catch_up=catch_up)
+
+    @property
+    def interval(self):
+        return self.scheduler.interval
+
+    @property
+    def is_running(self):
+        return self.scheduler.is_running
+
+    def start(self, interval=None):
+        """Start (or resume) reminders"""
+        if interval is not None:
+            self._remember_interval(interval)
+        self.scheduler.start(interval)
+
+    def pause(self):
+        """Pause reminders"""
+        self.scheduler.pause()
+
+    def toggle(self):
+        """Pause if running, resume if paused; returns whether it is running now"""
+        if self.scheduler.is_running:
+            self.pause()
+        else:
+            self.start()
+        return self.scheduler.is_running
+
+    def set_interval(self, interval):
+        """Change the reminder interval in minutes"""
+        self._remember_interval(interval)
+        if self.scheduler.is_running:
+            self.scheduler.set_interval(interval)
+        else:
+            self.scheduler.interval = max(1, int(interval))
+
+    def set_schedule(self, rules, quiet_hours=None, location=None):
+        """
+        Replace the schedule rules (an empty list goes back to the interval).
+
+        Args:
+            rules (list): Rule dicts as stored in settings.json
+            quiet_hours (list): ["HH:MM", "HH:MM"] windows, unchanged if None
+            location (dict): latitude/longitude for prayer times, unchanged if None
+        """
+        self.settings["schedule"] = list(rules)
+        if quiet_hours is not None:
+            self.settings["quiet_hours"] = list(quiet_hours)
+        if location is not None:
+            self.settings["location"] = location
+        self.settings.save()
+        self.scheduler.set_schedule(self._load_schedule())
+
+    def next_duaa(self, category=None):
+        """Return the duaa the next reminder (of a category) would show"""
+        source = self.store
+        if category is not None and self.store.count(category):
+            # One view per category, so its cached ids survive between reminders
+            source = self._category_views.get(category)
+            if source is None:
+                source = self._category_views[category] = CategoryView(self.store, category)
+        else:
+            category = None
+        selection = self._selection_for(category)
+        duaa = selection.pick(source)
+        if duaa is not None:
+            self.last_id = selection.last
+        return duaa
+
+    def fire(self, category=None):
+        """Show a reminder now (also used for test notifications)"""
+        duaa = self.next_duaa(category)
+        if duaa is not None:
+            self.shown += 1
+            self.save_selection_state()
+            self.notify(duaa)
+
+    def _on_due(self):
+        """Scheduler callback, shows a duaa from the category of the rule that fired"""
+        rule = self.scheduler.fired_rule
+        self.fire(rule.category if rule is not None else None)
+
+    def _load_schedule(self):
+        try:
+            return RuleSchedule.from_settings(self.settings)
+        except (KeyError, ValueError) as e:
+            print(f"Error in schedule settings: {e}")
+            return None
+
+    def _selection_for(self, category):
+        """Return the selection policy of a category (the main one for None)"""
+        if category is None:
+            return self.selection
+        selection = self.category_selections.get(category)
+        if selection is None:
+            selection = create_selection(self.selection.name, self.settings.get("selection_seed"))
+            if category in self._category_states:
+                selection.restore(self._category_states.pop(category), self.store)
+            if hasattr(selection, "set_weight"):
+                # Weights belong to duaas, whichever rule shows them
+                for duaa_id, weight in self.selection.weights.items():
+                    selection.set_weight(duaa_id, weight)
+            self.category_selections[category] = selection
+        return selection
+
+    def load_selection_state(self):
+        """Continue the rotation saved by a previous run (if it used the same policy)"""
+        if not self.selection_file or not os.path.exists(self.selection_file):
+            return
+        try:
+            with open(self.selection_file, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved.get("policy") == self.selection.name:
+                self.selection.restore(saved.get("state", {}), self.store)
+                self._category_states = saved.get("categories", {})
+        except Exception as e:
+            print(f"Error loading selection state: {e}")
+
+    def save_selection_state(self):
+        """Save the selection state so a restart does not reset the rotation"""
+        if not self.selection_file:
+            return
+        try:
+            categories = dict(self._category_states)
+            categories.update((category, selection.state(self.store))
+                              for category, selection in self.category_selections.items())
+            atomic_write_json(self.selection_file,
+                              {"policy": self.selection.name, "state": self.selection.state(self.store),
+                               "categories": categories},
+                              indent=None)
+        except Exception as e:
+            print(f"Error saving selection state: {e}")
+
+    def set_weight(self, weight, duaa_id=None):
+        """
+        Make a duaa come up more (weight above 1) or less often (weighted policy).
+
+        Args:
+            weight (float): Relative weight, 0 to never show the duaa
+            duaa_id (int): The duaa, the one shown last if None
+
+        Returns:
+            int: Id of the weighted duaa
+
+        Raises:
+            ValueError: If the weighted policy is not in use or there is no duaa
+        """
+        if not hasattr(self.selection, "set_weight"):
+            raise ValueError('Weights need the "weighted" selection policy')
+        duaa_id = self._chosen_id(duaa_id)
+        for selection in [self.selection] + list(self.category_selections.values()):
+            selection.set_weight(duaa_id, weight)
+        self.save_selection_state()
+        return duaa_id
+
+    def review_again(self, duaa_id=None):
+        """
+        Send a duaa back to the first box so it is shown often again (spaced policy).
+
+        Args:
+            duaa_id (int): The duaa, the one shown last if None
+
+        Returns:
+            int: Id of the duaa
+
+        Raises:
+            ValueError: If the spaced policy is not in use or there is no duaa
+        """
+        if not hasattr(self.selection, "review_again"):
+            raise ValueError('Review needs the "spaced" selection policy')
+        duaa_id = self._chosen_id(duaa_id)
+        self.selection.review_again(duaa_id)
+        # The rule for its category rotates on its own
+        selection = self.category_selections.get(self.store.record(duaa_id).category)
+        if selection is not None:
+            selection.review_again(duaa_id)
+        self.save_selection_state()
+        return duaa_id
+
+    def _chosen_id(self, duaa_id):
+        """Return duaa_id, or the last shown duaa's if None, checking that it exists"""
+        if duaa_id is None:
+            # After a restart the policy may still know its last pick
+            duaa_id = self.last_id if self.last_id is not None else self.selection.last
+        if duaa_id is None:
+            raise ValueError("No duaa has been shown yet, give an id")
+        try:
+            self.store.get(duaa_id)
+        except (KeyError, IndexError):
+            raise ValueError(f"No duaa with id {duaa_id}")
+        return duaa_id
+
+    def status(self):
+        """
+        Return a snapshot of the engine state.
+
+        Returns:
+            dict: running, interval (minutes), scheduled (following rules),
+                  remaining (seconds or None), duaas (collection size) and
+                  shown (reminders shown)
+        """
+        return {
+            "running": self.scheduler.is_running,
+            "interval": self.scheduler.interval,
+            "scheduled": self.scheduler.schedule is not None,
+            "remaining": self.scheduler.remaining(),
+            "duaas": len(self.store),
+            "shown": self.shown
+        }
+
+    def add_duaas(self, texts, category=None, skip_duplicates=False):
+        """
+        Add several duaas at once.
+
+        Args:
+            texts (list): Duaa texts, blank ones are ignored
+            category (str): Category of the duaas
+            skip_duplicates (bool): Leave out texts that duplicate a stored
+                                    duaa or an earlier text of the batch
+
+        Returns:
+            list: Ids of the added duaas
+        """
+        texts = [text.strip() for text in texts if text and text.strip()]
+        if skip_duplicates:
+            index = self.duplicate_index()
+            keys = set()
+            unique = []
+            for text in texts:
+                key = exact_key(text)
+                if key not in keys and index.check(text) is None:
+                    keys.add(key)
+                    unique.append(text)
+            texts = unique
+        ids = self.store.add_many(texts, category)
+        self._index_added(ids, texts)
+        return ids
+
+    def import_duaas(self, path, format=None, category=None, on_batch=None):
+        """Import duaas from a JSON, JSON Lines, CSV or text file (see duaa_io)"""
+        def batch_added(ids):
+            self._index_added(ids)
+            if on_batch is not None:
+                on_batch(ids)
+
+        return duaa_io.import_duaas(self.store, path, format, category, on_batch=batch_added)
+
+    def export_duaas(self, path, format=None):
+        """Export the collection to a file and return the number of duaas written"""
+        return duaa_io.export_duaas(self.store, path, format)
+
+    def duplicate_index(self):
+        """
+        Return the duplicate index of the collection.
+
+        Nothing is indexed until the first add, check or clean needs it
+        (or a front-end asks for it ahead of time). The first call queues
+        the whole collection and indexes it a slice per timer callback, so
+        a large library never blocks the event loop; until it is done,
+        checks only see the duaas indexed so far.
+        """
+        if self._duplicates is None:
+            index = DuplicateIndex(self.store, self.settings.get("duplicate_threshold", 0.8))
+            # Duplicates already in the library are left for clean_library()
+            index.queue(self.store.ids())
+            self._duplicates = index
+            self._index_slice(index)
+        return self._duplicates
+
+    def _index_slice(self, index):
+        """Index the next slice of the collection and schedule the one after"""
+        # A clean pass may have replaced the index in the meantime
+        if index is self._duplicates and not index.index_pending(DUPLICATE_INDEX_SLICE):
+            self.timer.call_later(0, lambda: self._index_slice(index))
+
+    def find_duplicate(self, text):
+        """
+        Look for a stored duaa that duplicates a text.
+
+        Returns:
+            tuple: (id, text, similarity) of the closest match, or None.
+                   Exact duplicates (after normalisation) have similarity 1.0.
+        """
+        match = self.duplicate_index().check(text)
+        if match is None:
+            return None
+        duaa_id, similarity = match
+        return duaa_id, self.store.get(duaa_id), similarity
+
+    def clean_library(self, near=True, dry_run=False):
+        """
+        Find duplicate duaas and delete all but the first of each group.
+
+        Args:
+            near (bool): Also remove near-duplicates, not only exact ones
+            dry_run (bool): Only report what would be removed
+
+        Returns:
+            dict: exact and near counts, removed (number deleted),
+                  duplicates, a list of (duplicate id, original id, similarity),
+                  and examples, (duplicate text, original text, similarity)
+                  for the first few
+        """
+        index = DuplicateIndex(self.store, self.settings.get("duplicate_threshold", 0.8), near=near)
+        duplicates = index.build()
+        report = {
+            "exact": sum(1 for duplicate in duplicates if duplicate[2] == 1.0),
+            "near": sum(1 for duplicate in duplicates if duplicate[2] < 1.0),
+            "removed": 0,
+            "duplicates": duplicates,
+            "examples": [(self.store.get(duplicate_id), self.store.get(original_id), similarity)
+                         for duplicate_id, original_id, similarity in duplicates[:20]]
+        }
+        # The clean pass indexed exactly the duaas that are kept (checks
+        # against it find the originals of the duplicates too)
+        self._duplicates = index if near else None
+        if not dry_run:
+            report["removed"] = len(self.remove_duplicates(duplicates))
+        return report
+
+    def remove_duplicates(self, duplicates):
+        """
+        Delete the duplicates found by a clean_library() dry run.
+
+        Duplicates whose original was deleted since are kept.
+
+        Args:
+            duplicates (list): (duplicate id, original id, similarity) tuples
+
+        Returns:
+            list: Ids of the deleted duaas
+        """
+        ids = []
+        for duplicate_id, original_id, similarity in duplicates:
+            try:
+                self.store.get(original_id)
+            except (KeyError, IndexError):
+                continue
+            ids.append(duplicate_id)
+        self.delete_duaas(ids)
+        return ids
+
+    def delete_duaas(self, ids):
+        """Delete duaas by id, keeping the duplicate index in step"""
+        if not ids:
+            return
+        self.store.delete_many(ids)
+        if self._duplicates is not None:
+            for duaa_id in ids:
+                self._duplicates.remove(duaa_id)
+
+    def _index_added(self, ids, texts=None):
+        """Keep a built duplicate index up to date with added duaas"""
+        if self._duplicates is None:
+            return
+        for i, duaa_id in enumerate(ids):
+            self._duplicates.add(duaa_id, texts[i] if texts is not None else self.store.get(duaa_id))
+
+    def control_commands(self):
+        """
+        Commands served over the instance socket (see control.py).
+
+        Commands that change the state return the new status().
+        """
+        def pause():
+            self.pause()
+            return self.status()
+
+        def resume():
+            self.start()
+            return self.status()
+
+        def toggle():
+            self.toggle()
+            return self.status()
+
+        def set_interval(minutes):
+            self.set_interval(minutes)
+            return self.status()
+
+        def test_notification():
+            self.fire()
+            return self.status()
+
+        def add_duaas(texts, category=None, skip_duplicates=False):
+            ids = self.add_duaas(texts, category, skip_duplicates)
+            return {"added": len(ids), "duaas": len(self.store)}
+
+        def import_duaas(path, format=None, category=None):
+            report = self.import_duaas(path, format, category)
+            report["duaas"] = len(self.store)
+            return report
+
+        def export_duaas(path, format=None):
+            return {"exported": self.export_duaas(path, format)}
+
+        def categories():
+            return self.store.categories()
+
+        def set_weight(weight, id=None):
+            duaa_id = self.set_weight(weight, id)
+            return {"id": duaa_id, "text": self.store.get(duaa_id)}
+
+        def review_again(id=None):
+            duaa_id = self.review_again(id)
+            return {"id": duaa_id, "text": self.store.get(duaa_id)}
+
+        def find_duplicate(text):
+            match = self.find_duplicate(text)
+            if match is None:
+                return None
+            duaa_id, text, similarity = match
+            return {"id": duaa_id, "text": text, "similarity": similarity}
+
+        def clean_library(near=True, dry_run=False):
+            report = self.clean_library(near, dry_run)
+            # The examples are enough, the full list can be very long
+            del report["duplicates"]
+            report["duaas"] = len(self.store)
+            return report
+
+        return {
+            "status": self.status,
+            "pause": pause,
+            "resume": resume,
+            "toggle": toggle,
+            "set_interval": set_interval,
+            "test_notification": test_notification,
+            "add_duaas": add_duaas,
+            "import_duaas": import_duaas,
+            "export_duaas": export_duaas,
+            "categories": categories,
+            "set_weight": set_weight,
+            "review_again": review_again,
+            "find_duplicate": find_duplicate,
+            "clean_library": clean_library
+        }
+
+    def close(self):
+        """Stop the scheduler and flush the duaa store"""
+        self.scheduler.stop()
+        self.store.close()
+
+    def _remember_interval(self, interval):
+        interval = max(1, int(interval))
+        if self.settings.get("reminder_interval") != interval:
+            self.settings["reminder_interval"] = interval
+            self.settings.save()
+
+
+def print_reminder(duaa):
+    """Daemon notifier, writes the reminder to stdout"""
+    print(f"[{datetime.now():%H:%M:%S}] {duaa}", flush=True)
+
+
+def main(argv=None):
+    """Run the reminder engine as a headless daemon"""
+    parser = argparse.ArgumentParser(description="Athkar Reminder without a window")
+    parser.add_argument("--interval", type=int, help="reminder interval in minutes")
+    args = parser.parse_args(argv)
+
+    # Share the lock with the GUI so the two never run on the same files
+    instance = SingleInstance()
+    if not instance.acquire():
+        print("Athkar Reminder is already running", file=sys.stderr)
+        return 1
+
+    timer = LoopTimer()
+    engine = ReminderEngine(timer, print_reminder)
+    instance.serve(engine.control_commands(), call_soon=timer.call_soon)
+
+    # Shut down cleanly (flush the store, release the lock) when terminated
+    signal.signal(signal.SIGTERM, lambda signum, frame: timer.stop())
+
+    engine.start(args.interval)
+    print(f"Reminding every {engine.interval} minutes, press Ctrl+C to stop", flush=True)
+    try:
+        timer.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        engine.close()
+        instance.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
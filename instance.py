@@ -0,0 +1,332 @@
+"""
+Single-instance support for Athkar Reminder application.
+
+The first instance listens on a localhost socket and records its port
+(and a random token) in a lock file. A later launch finds the lock file,
+forwards its command to the running instance and exits straight away.
+
+Requests and responses are JSON objects, one per line:
+
+    -> {"token": "...", "command": "show", "args": {}}
+    <- {"ok": true, "result": null}
+    <- {"ok": false, "error": "Unknown command: foo"}
+"""
+
+import json
+import os
+import secrets
+import socket
+import threading
+import time
+
+# Lock file naming the running instance's port and token
+LOCK_FILE = "athkar_reminder.lock"
+
+# Seconds a command may wait for the UI/event thread to pick it up; one
+# that is still waiting then is dropped without running
+START_TIMEOUT = 10
+
+# Seconds a client waits for a reply, longer than START_TIMEOUT so the
+# instance reports a dropped command itself
+RESPONSE_TIMEOUT = 15.0
+
+# Commands that may run for a long time on large libraries; clients wait
+# for their reply without a time limit
+LONG_COMMANDS = {"add_duaas", "import_duaas", "export_duaas", "clean_library"}
+
+
+class InstanceError(Exception):
+    """Raised when a command cannot be delivered to the running instance"""
+
+
+def read_lock(path=LOCK_FILE):
+    """Return the running instance's lock info, or None if there is none (yet)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            info = json.loads(f.read() or "null")
+        if isinstance(info, dict) and "port" in info and "token" in info:
+            return info
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+class InstanceClient:
+    """
+    Connection to the running instance, reusable for several commands.
+
+    Args:
+        path (str): Lock file of the running instance
+        timeout (float): Seconds to wait for a response (LONG_COMMANDS wait
+                         as long as they take)
+    """
+
+    def __init__(self, path=LOCK_FILE, timeout=RESPONSE_TIMEOUT):
+        self.timeout = timeout
+        self.info = read_lock(path)
+        if self.info is None:
+            raise InstanceError("Athkar Reminder is not running")
+        try:
+            self._socket = socket.create_connection(("127.0.0.1", self.info["port"]), timeout=timeout)
+        except OSError as e:
+            raise InstanceError(f"Athkar Reminder is not responding: {e}")
+        self._reader = self._socket.makefile("r", encoding="utf-8")
+
+    def send(self, command, **args):
+        """
+        Run a command in the running instance.
+
+        Returns:
+            The command's result
+
+        Raises:
+            InstanceError: If the command could not be delivered or failed
+        """
+        request = {"token": self.info["token"], "command": command, "args": args}
+        self._socket.settimeout(None if command in LONG_COMMANDS else self.timeout)
+        try:
+            self._socket.sendall((json.dumps(request, ensure_ascii=False) + "\n").encode("utf-8"))
+            line = self._reader.readline()
+        except socket.timeout:
+            raise InstanceError(f"No reply from Athkar Reminder within {self.timeout:g} seconds, "
+                                "the command may still complete")
+        except OSError as e:
+            raise InstanceError(f"Lost connection to Athkar Reminder: {e}")
+        if not line:
+            raise InstanceError("Athkar Reminder closed the connection")
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise InstanceError(response.get("error", "Command failed"))
+        return response.get("result")
+
+    def close(self):
+        try:
+            self._reader.close()
+            self._socket.close()
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def send_command(command, path=LOCK_FILE, timeout=RESPONSE_TIMEOUT, **args):
+    """Send one command to the running instance and return its result"""
+    with InstanceClient(path, timeout) as client:
+        return client.send(command, **args)
+
+
+class SingleInstance:
+    """
+    Owns the lock file and serves commands from later launches.
+
+    Usage:
+        instance = SingleInstance()
+        if not instance.acquire():
+            send_command("show")  # another instance is running
+            sys.exit(0)
+        instance.serve({"show": show_window}, call_soon=root_after_0)
+
+    Args:
+        path (str): Lock file path
+    """
+
+    def __init__(self, path=LOCK_FILE):
+        self.path = path
+        self.token = secrets.token_hex(16)
+        self._server = None
+        self._commands = {}
+        self._call_soon = None
+        self._owned = False
+
+    def acquire(self):
+        """
+        Become the running instance.
+
+        Returns:
+            bool: False if another instance is already running
+        """
+        for _ in range(2):
+            try:
+                # Owner-only, the file holds the token that authorises commands
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+            except FileExistsError:
+                info = self._read_other()
+                if info is not None and self._is_alive(info):
+                    return False
+                # Left behind by a crashed instance
+                if not self._remove_stale(info):
+                    return False
+                continue
+
+            # Listen before publishing the port, so a second launch never
+            # sees a lock file it cannot connect to
+            self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._server.bind(("127.0.0.1", 0))
+            self._server.listen(8)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"pid": os.getpid(), "port": self._server.getsockname()[1],
+                           "token": self.token}, f)
+            self._owned = True
+            return True
+        return False
+
+    def _read_other(self):
+        """Return the lock info of the other instance, None if the file stays unreadable"""
+        # The owner may still be writing the file, give it a moment
+        for _ in range(20):
+            info = read_lock(self.path)
+            if info is not None:
+                return info
+            time.sleep(0.05)
+        return None
+
+    def _is_alive(self, info):
+        """Check whether the instance named by lock info responds"""
+        try:
+            socket.create_connection(("127.0.0.1", info["port"]), timeout=1.0).close()
+            return True
+        except OSError:
+            return False
+
+    @staticmethod
+    def _age(path):
+        """Seconds since a file was last written"""
+        try:
+            return time.time() - os.path.getmtime(path)
+        except OSError:
+            return 0.0
+
+    def _remove_stale(self, stale):
+        """
+        Remove a lock file found to be stale.
+
+        Another launch may have replaced it since it was read, so it is first
+        renamed (atomic, only one launch gets a given file) and only deleted
+        if it still holds the stale contents.
+
+        Returns:
+            bool: False if the file turned out to belong to a new instance
+        """
+        claimed = f"{self.path}.{self.token}"
+        try:
+            os.rename(self.path, claimed)
+        except OSError:
+            # Gone already, another launch is taking over too
+            return True
+        if read_lock(claimed) == stale and (stale is not None or self._age(claimed) > 2):
+            try:
+                os.remove(claimed)
+            except OSError:
+                pass
+            return True
+
+        # A new instance created it meanwhile: put it back unless yet
+        # another launch got there first
+        try:
+            os.link(claimed, self.path)
+        except OSError:
+            pass
+        try:
+            os.remove(claimed)
+        except OSError:
+            pass
+        return False
+
+    def serve(self, commands, call_soon=None):
+        """
+        Start answering commands on a background thread.
+
+        Args:
+            commands (dict): Command name -> function taking the request args
+            call_soon: Function scheduling a callable on the UI/event thread
+                       (e.g. root.after(0, ...)); None runs commands directly
+        """
+        self._commands = commands
+        self._call_soon = call_soon
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def add_commands(self, commands):
+        """Register more commands"""
+        self._commands.update(commands)
+
+    def close(self):
+        """Stop serving and release the lock file"""
+        if self._server is not None:
+            try:
+                self._server.close()
+            except OSError:
+                pass
+            self._server = None
+        if self._owned:
+            self._owned = False
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def _accept(self):
+        while self._server is not None:
+            try:
+                connection, address = self._server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle, args=(connection,), daemon=True).start()
+
+    def _handle(self, connection):
+        """Answer every request line of one connection"""
+        with connection, connection.makefile("r", encoding="utf-8") as reader:
+            for line in reader:
+                try:
+                    response = self._dispatch(json.loads(line))
+                except ValueError:
+                    response = {"ok": False, "error": "Invalid request"}
+                try:
+                    connection.sendall((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+                except OSError:
+                    return
+
+    def _dispatch(self, request):
+        if not isinstance(request, dict) or not secrets.compare_digest(str(request.get("token", "")), self.token):
+            return {"ok": False, "error": "Invalid token"}
+        handler = self._commands.get(request.get("command"))
+        if handler is None:
+            return {"ok": False, "error": f"Unknown command: {request.get('command')}"}
+        args = request.get("args") or {}
+        if self._call_soon is None:
+            return self._run(handler, args)
+
+        # Run on the UI thread and wait for the outcome. A command that has
+        # started is always waited for, so a reply never reports a failure
+        # for a command that went on to complete.
+        done = threading.Event()
+        lock = threading.Lock()
+        state = {"started": False, "dropped": False}
+        outcome = {}
+
+        def run():
+            with lock:
+                if state["dropped"]:
+                    return
+                state["started"] = True
+            outcome.update(self._run(handler, args))
+            done.set()
+
+        self._call_soon(run)
+        if not done.wait(START_TIMEOUT):
+            with lock:
+                if not state["started"]:
+                    state["dropped"] = True
+                    return {"ok": False, "error": "The application is busy, the command was not run"}
+            done.wait()
+        return outcome
+
+    def _run(self, handler, args):
+        try:
+            return {"ok": True, "result": handler(**args)}
+        except Exception as e:
+            print(f"Error running command: {e}")
+            return {"ok": False, "error": str(e)}
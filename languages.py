@@ -3,6 +3,10 @@ Language support module for Athkar Reminder application.
 Contains translations for all UI elements in different languages.
 """
 
+import json
+import os
+import string
+
 # English language dictionary
 ENGLISH = {
     # Application title and general terms
@@ -36,6 +40,18 @@ ENGLISH = {
     "add_new_duaa": "Add New Duaa",
     "add_duaa": "Add Duaa",
     "delete_selected": "Delete Selected",
+    "search_duaas": "Search:",
+    "import_duaas": "Import...",
+    "export_duaas": "Export...",
+    "import_done": "Added {added} duaas.\n{duplicates} duplicates and {invalid} invalid entries were skipped.",
+    "import_failed": "Could not import the file:\n{error}",
+    "export_done": "Exported {count} duaas.",
+    "export_failed": "Could not export the duaas:\n{error}",
+    "clean_library": "Remove Duplicates",
+    "duplicate_found": "This duaa is {similarity}% similar to one in your library:\n\n{text}\n\nAdd it anyway?",
+    "no_duplicates": "No duplicate duaas were found.",
+    "clean_confirm": "Found {exact} exact and {near} near duplicates.\nRemove them and keep the first of each?",
+    "clean_done": "Removed {removed} duplicate duaas.",
 
     # Settings tab
     "app_settings": "Application Settings",
@@ -92,6 +108,18 @@ ARABIC = {
     "add_new_duaa": "إضافة دعاء جديد",
     "add_duaa": "إضافة دعاء",
     "delete_selected": "حذف المحدد",
+    "search_duaas": "بحث:",
+    "import_duaas": "استيراد...",
+    "export_duaas": "تصدير...",
+    "import_done": "تمت إضافة {added} دعاء.\nتم تخطي {duplicates} مكرر و{invalid} إدخال غير صالح.",
+    "import_failed": "تعذر استيراد الملف:\n{error}",
+    "export_done": "تم تصدير {count} دعاء.",
+    "export_failed": "تعذر تصدير الأدعية:\n{error}",
+    "clean_library": "إزالة المكرر",
+    "duplicate_found": "هذا الدعاء مشابه بنسبة {similarity}% لدعاء في مكتبتك:\n\n{text}\n\nهل تريد إضافته على أي حال؟",
+    "no_duplicates": "لم يتم العثور على أدعية مكررة.",
+    "clean_confirm": "تم العثور على {exact} مكرر تمامًا و{near} مكرر تقريبًا.\nهل تريد إزالتها والإبقاء على الأول من كل منها؟",
+    "clean_done": "تمت إزالة {removed} دعاء مكرر.",
 
     # Settings tab
     "app_settings": "إعدادات التطبيق",
@@ -121,6 +149,135 @@ LANGUAGES = {
     "العربية": ARABIC
 }
 
+# Languages written right to left
+RTL_LANGUAGES = {"العربية"}
+
+# Folder searched for extra languages, one <Language name>.json file each
+# holding a dictionary of translations (an optional "_rtl": true marks a
+# right-to-left language). Files are only read when first used.
+LANGUAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "languages")
+
+# Extra language name -> file path, filled by the first directory scan
+_external_files = None
+
+# Compiled catalogs, one per language, built on first use
+_catalogs = {}
+
+
+class Template:
+    """A format string pre-parsed into literal text and field names"""
+    __slots__ = ("text", "parts", "prefix", "field", "suffix")
+
+    def __init__(self, text, parts):
+        self.text = text
+        self.parts = parts  # list of (literal, following field name or None)
+        self.field = None
+
+        # The common case, a single {name} field, renders by concatenation
+        fields = [field for literal, field in parts if field is not None]
+        if len(fields) == 1 and parts[0][1] is not None:
+            self.prefix = parts[0][0]
+            self.field = parts[0][1]
+            self.suffix = "".join(literal for literal, field in parts[1:])
+
+    def render(self, kwargs):
+        try:
+            if self.field is not None:
+                return self.prefix + str(kwargs[self.field]) + self.suffix
+            return "".join([literal if field is None else literal + str(kwargs[field])
+                            for literal, field in self.parts])
+        except KeyError:
+            return self.text
+
+
+def _compile_text(text):
+    """Return text itself, or a Template if it contains replacement fields"""
+    if "{" not in text:
+        return text
+    parts = []
+    try:
+        for literal, field, spec, conversion in string.Formatter().parse(text):
+            if spec or conversion or (field is not None and not field.isidentifier()):
+                # Anything beyond plain {name} fields goes through str.format
+                return _FormatTemplate(text)
+            parts.append((literal, field))
+    except ValueError:
+        # Malformed format string, substitution would fail anyway
+        return text
+    return Template(text, parts)
+
+
+class _FormatTemplate(Template):
+    """Fallback template using str.format for complex fields"""
+    __slots__ = ()
+
+    def __init__(self, text):
+        super().__init__(text, [])
+
+    def render(self, kwargs):
+        try:
+            return self.text.format(**kwargs)
+        except (KeyError, ValueError, IndexError):
+            return self.text
+
+
+def _external_languages():
+    """Return the extra language files, scanning the folder only once"""
+    global _external_files
+    if _external_files is None:
+        _external_files = {}
+        if os.path.isdir(LANGUAGES_DIR):
+            for filename in sorted(os.listdir(LANGUAGES_DIR)):
+                name, extension = os.path.splitext(filename)
+                if extension == ".json" and name not in LANGUAGES:
+                    _external_files[name] = os.path.join(LANGUAGES_DIR, filename)
+    return _external_files
+
+
+def _load_language(language):
+    """Return the translation dictionary for a language, or None if unknown"""
+    if language in LANGUAGES:
+        return LANGUAGES[language]
+    path = _external_languages().get(language)
+    if path is None:
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            translations = json.load(f)
+    except Exception as e:
+        print(f"Error loading language file {path}: {e}")
+        return None
+    if translations.pop("_rtl", False):
+        RTL_LANGUAGES.add(language)
+    LANGUAGES[language] = translations
+    return translations
+
+
+def _compile(language):
+    """Resolve the English fallback once and pre-parse every format string"""
+    translations = _load_language(language)
+    if translations is None:
+        catalog = _catalogs.get("English") or _compile("English")
+    else:
+        merged = dict(ENGLISH)
+        merged.update(translations)
+        catalog = {key: _compile_text(text) for key, text in merged.items()}
+    _catalogs[language] = catalog
+    return catalog
+
+
+def language_names():
+    """Return the names of all built-in and extra languages"""
+    return list(LANGUAGES) + [name for name in _external_languages() if name not in LANGUAGES]
+
+
+def is_rtl(language):
+    """Return True if the language is written right to left"""
+    if language not in LANGUAGES:
+        _load_language(language)
+    return language in RTL_LANGUAGES
+
+
 def get_text(language, key, **kwargs):
     """
     Get translated text for the given key in the specified language.
@@ -134,16 +291,13 @@ def get_text(language, key, **kwargs):
     Returns:
         str: Translated text
     """
-    if language not in LANGUAGES:
-        language = "English"  # Default to English if language not found
+    catalog = _catalogs.get(language) or _compile(language)
+    text = catalog.get(key, key)
 
-    text = LANGUAGES[language].get(key, LANGUAGES["English"].get(key, key))
+    if text.__class__ is str:
+        return text
 
     # Apply format string replacements if any kwargs provided
     if kwargs:
-        try:
-            return text.format(**kwargs)
-        except (KeyError, ValueError):
-            return text
-
-    return text
+        return text.render(kwargs)
+    return text.text
@@ -0,0 +1,185 @@
+"""
+Platform adapters for Athkar Reminder application.
+
+Everything that depends on the operating system (theme detection, system
+notifications and window shaping) goes through a platform object. Each
+backend imports its OS modules only when a method first needs them, so
+importing the application stays cheap and works on every platform.
+
+The backend can be forced with the ATHKAR_PLATFORM environment variable
+("windows", "freedesktop", "null" or "generic").
+"""
+
+import os
+import sys
+
+
+class Platform:
+    """Base class for platform backends, also used on unknown systems"""
+
+    name = "generic"
+
+    def theme_source(self):
+        """Return the ThemeSource for the system light/dark mode"""
+        from theme import StaticThemeSource
+        return StaticThemeSource()
+
+    def notify(self, title, message):
+        """Show a system notification (falls back to printing it)"""
+        print(f"{title}: {message}")
+
+    def shape_window(self, window, radius=12):
+        """
+        Round the corners of a Tk toplevel.
+
+        Returns:
+            bool: False if the platform cannot shape windows
+        """
+        return False
+
+
+class WindowsPlatform(Platform):
+    """Windows backend: registry theme, toast notifications, window regions"""
+
+    name = "windows"
+
+    def __init__(self):
+        self._win32gui = None
+        self._toaster = None
+
+    def theme_source(self):
+        from theme import RegistryThemeSource
+        return RegistryThemeSource()
+
+    def notify(self, title, message):
+        try:
+            if self._toaster is None:
+                from win10toast import ToastNotifier
+                self._toaster = ToastNotifier()
+            self._toaster.show_toast(title, message, duration=5, threaded=True)
+        except ImportError:
+            # Fallback to a simpler notification if win10toast is not available
+            try:
+                # Use Windows API directly
+                import ctypes
+                ctypes.windll.user32.MessageBoxW(0, message, title, 0x40)
+            except Exception:
+                # Last resort fallback
+                super().notify(title, message)
+
+    def shape_window(self, window, radius=12):
+        if self._win32gui is None:
+            try:
+                import win32gui
+            except ImportError:
+                self._win32gui = False
+                return False
+            self._win32gui = win32gui
+        if not self._win32gui:
+            return False
+
+        hwnd = window.winfo_id()
+        rect = self._win32gui.GetWindowRect(hwnd)
+        width = rect[2] - rect[0]
+        height = rect[3] - rect[1]
+        region = self._win32gui.CreateRoundRectRgn(0, 0, width, height, radius, radius)
+        self._win32gui.SetWindowRgn(hwnd, region, True)
+        return True
+
+
+class FreedesktopPlatform(Platform):
+    """Linux/BSD backend: gsettings theme and notify-send notifications"""
+
+    name = "freedesktop"
+
+    def __init__(self):
+        self._notify_send = None
+
+    def theme_source(self):
+        from theme import GSettingsThemeSource
+        return GSettingsThemeSource()
+
+    def notify(self, title, message):
+        import shutil
+        import subprocess
+
+        if self._notify_send is None:
+            self._notify_send = shutil.which("notify-send") or ""
+        if not self._notify_send:
+            super().notify(title, message)
+            return
+        try:
+            subprocess.Popen([self._notify_send, "--app-name=Athkar Reminder", title, message],
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except Exception as e:
+            print(f"Error showing notification: {e}")
+            super().notify(title, message)
+
+    # Compositors round the corners themselves, shape_window stays a no-op
+
+
+class NullPlatform(Platform):
+    """
+    Backend that touches nothing, for tests and headless runs.
+
+    Notifications and shaped windows are recorded instead of shown.
+
+    Args:
+        dark (bool): Mode reported by the theme source
+    """
+
+    name = "null"
+
+    def __init__(self, dark=False):
+        self.dark = dark
+        self.notifications = []
+        self.shaped = []
+
+    def theme_source(self):
+        from theme import StaticThemeSource
+        return StaticThemeSource(self.dark)
+
+    def notify(self, title, message):
+        self.notifications.append((title, message))
+
+    def shape_window(self, window, radius=12):
+        self.shaped.append((window, radius))
+        return True
+
+
+# Backend classes by name
+PLATFORMS = {
+    "windows": WindowsPlatform,
+    "freedesktop": FreedesktopPlatform,
+    "null": NullPlatform,
+    "generic": Platform,
+}
+
+# The platform in use, created on first request
+_current = None
+
+
+def detect_platform():
+    """Return the backend name for this system"""
+    name = os.environ.get("ATHKAR_PLATFORM")
+    if name in PLATFORMS:
+        return name
+    if sys.platform == "win32":
+        return "windows"
+    if sys.platform.startswith(("linux", "freebsd", "openbsd", "netbsd")):
+        return "freedesktop"
+    return "generic"
+
+
+def get_platform():
+    """Return the shared platform backend for this system"""
+    global _current
+    if _current is None:
+        _current = PLATFORMS[detect_platform()]()
+    return _current
+
+
+def set_platform(platform):
+    """Replace the shared platform backend (e.g. with a NullPlatform in tests)"""
+    global _current
+    _current = platform
@@ -0,0 +1,246 @@
+"""
+Prayer times for Athkar Reminder application.
+Computes the daily prayer times locally from the position of the sun, so
+prayer-relative reminders work without a network connection.
+
+Days are computed column by column (every day's fajr, then every day's
+sunrise, ...), so a whole year costs one pass and each day's result is
+memoised.
+"""
+
+import math
+from datetime import date as calendar_date, datetime, time as day_time, timedelta
+
+# Calculation methods: twilight angles in degrees below the horizon, or a
+# fixed number of minutes after maghrib for isha
+METHODS = {
+    "MWL": {"fajr": 18.0, "isha": 17.0},          # Muslim World League
+    "UmmAlQura": {"fajr": 18.5, "isha_minutes": 90},  # Umm al-Qura, Makkah
+    "Egyptian": {"fajr": 19.5, "isha": 17.5},     # Egyptian General Authority of Survey
+    "ISNA": {"fajr": 15.0, "isha": 15.0},         # Islamic Society of North America
+}
+
+# Asr starts when a shadow is this many times an object's length (plus its noon shadow)
+ASR_FACTORS = {
+    "standard": 1,  # Shafi'i, Maliki, Hanbali
+    "hanafi": 2,
+}
+
+# Times returned for each day, in order
+PRAYERS = ("fajr", "sunrise", "dhuhr", "asr", "sunset", "maghrib", "isha")
+
+# First estimates (hours) used to look up the sun's position for each time
+ESTIMATES = {"fajr": 5, "sunrise": 6, "dhuhr": 12, "asr": 13, "sunset": 18, "isha": 18}
+
+
+# Trigonometry in degrees
+
+def _sin(d):
+    return math.sin(math.radians(d))
+
+def _cos(d):
+    return math.cos(math.radians(d))
+
+def _tan(d):
+    return math.tan(math.radians(d))
+
+def _arcsin(x):
+    return math.degrees(math.asin(x))
+
+def _arccos(x):
+    return math.degrees(math.acos(x))
+
+def _arctan2(y, x):
+    return math.degrees(math.atan2(y, x))
+
+def _arccot(x):
+    return math.degrees(math.atan(1 / x))
+
+
+def julian_day(year, month, day):
+    """Return the Julian day number of a date (at midnight UTC)"""
+    if month <= 2:
+        year -= 1
+        month += 12
+    a = year // 100
+    b = 2 - a + a // 4
+    return math.floor(365.25 * (year + 4716)) + math.floor(30.6001 * (month + 1)) + day + b - 1524.5
+
+
+def sun_position(jd):
+    """
+    Return the sun's declination and the equation of time.
+
+    Args:
+        jd (float): Julian day
+
+    Returns:
+        tuple: (declination in degrees, equation of time in hours)
+    """
+    d = jd - 2451545.0
+    g = (357.529 + 0.98560028 * d) % 360
+    q = (280.459 + 0.98564736 * d) % 360
+    l = (q + 1.915 * _sin(g) + 0.020 * _sin(2 * g)) % 360
+    e = 23.439 - 0.00000036 * d
+
+    right_ascension = (_arctan2(_cos(e) * _sin(l), _cos(l)) / 15) % 24
+    equation = q / 15 - right_ascension
+    # Keep the equation of time in (-12, 12] hours
+    equation -= 24 * round(equation / 24)
+    return _arcsin(_sin(e) * _sin(l)), equation
+
+
+def local_utc_offset(day):
+    """Return the local time zone's UTC offset in hours on a day (follows DST)"""
+    return datetime.combine(day, day_time(12)).astimezone().utcoffset().total_seconds() / 3600
+
+
+class PrayerTimes:
+    """
+    Daily prayer times for one location, memoised per day.
+
+    Where the sun never gets low enough for fajr or isha (high latitudes in
+    summer), those times are placed by the angle-based night portion rule.
+
+    Args:
+        latitude (float): Degrees north
+        longitude (float): Degrees east
+        elevation (float): Metres above sea level (moves sunrise and sunset)
+        method (str): Calculation method, one of METHODS
+        asr (str): Asr convention, "standard" or "hanafi"
+        cache_days (int): Number of days kept in the memo
+    """
+
+    def __init__(self, latitude, longitude, elevation=0, method="MWL", asr="standard", cache_days=400):
+        if method not in METHODS:
+            raise ValueError(f"Unknown prayer time method: {method!r}")
+        if asr not in ASR_FACTORS:
+            raise ValueError(f"Unknown asr convention: {asr!r}")
+        self.latitude = latitude
+        self.longitude = longitude
+        self.elevation = elevation
+        self.method = method
+        self.asr = asr
+        self.cache_days = cache_days
+        self.hits = 0
+        self.misses = 0
+        self._days = {}
+
+    def hours(self, day, utc_offset=None):
+        """
+        Compute the prayer times of a day.
+
+        Args:
+            day (datetime.date): The date
+            utc_offset (float): Time zone offset from UTC in hours, local if None
+
+        Returns:
+            dict: Prayer name -> local time in hours after midnight, None where
+                  the sun never reaches the required angle (sunrise/sunset
+                  near the poles)
+        """
+        if utc_offset is None:
+            utc_offset = local_utc_offset(day)
+        key = (day, utc_offset)
+        times = self._days.get(key)
+        if times is not None:
+            self.hits += 1
+            return times
+        self.misses += 1
+        times = self._compute([day], [utc_offset])[0]
+        self._remember(key, times)
+        return times
+
+    def year(self, year, utc_offset=None):
+        """
+        Compute every day of a year in one pass and memoise the results.
+
+        Args:
+            year (int): The year
+            utc_offset (float): Time zone offset from UTC in hours, local (per day) if None
+
+        Returns:
+            list: (date, times dict) for each day of the year
+        """
+        first = calendar_date(year, 1, 1)
+        days = [first + timedelta(days=i) for i in range((calendar_date(year + 1, 1, 1) - first).days)]
+        offsets = [local_utc_offset(day) if utc_offset is None else utc_offset for day in days]
+        results = self._compute(days, offsets)
+
+        # Keep the whole year even if it is larger than the usual memo
+        self.cache_days = max(self.cache_days, len(days))
+        for day, offset, times in zip(days, offsets, results):
+            self._remember((day, offset), times)
+        return list(zip(days, results))
+
+    def stats(self):
+        """Return the memo hit/miss counters"""
+        return {"hits": self.hits, "misses": self.misses, "days": len(self._days)}
+
+    def _remember(self, key, times):
+        if len(self._days) >= self.cache_days:
+            self._days.clear()
+        self._days[key] = times
+
+    def _compute(self, days, offsets):
+        """Compute the times of several days, one prayer column at a time"""
+        method = METHODS[self.method]
+        latitude = self.latitude
+        horizon = 0.833 + 0.0347 * math.sqrt(max(0.0, self.elevation))
+        angles = {"fajr": method["fajr"], "sunrise": horizon, "sunset": horizon,
+                  "isha": method.get("isha", horizon)}
+        factor = ASR_FACTORS[self.asr]
+        jds = [julian_day(day.year, day.month, day.day) - self.longitude / (15 * 24) for day in days]
+
+        columns = {}
+        for name, estimate in ESTIMATES.items():
+            # The sun's position at each day's estimated time, then the time itself
+            positions = [sun_position(jd + estimate / 24) for jd in jds]
+            if name == "dhuhr":
+                columns[name] = [12 - equation for declination, equation in positions]
+            elif name == "asr":
+                columns[name] = [self._sun_angle_time(12 - equation,
+                                                      -_arccot(factor + _tan(abs(latitude - declination))),
+                                                      declination, 1)
+                                 for declination, equation in positions]
+            else:
+                direction = -1 if name in ("fajr", "sunrise") else 1
+                columns[name] = [self._sun_angle_time(12 - equation, angles[name], declination, direction)
+                                 for declination, equation in positions]
+        columns["maghrib"] = columns["sunset"]
+        if "isha_minutes" in method:
+            columns["isha"] = [None if sunset is None else sunset + method["isha_minutes"] / 60
+                               for sunset in columns["sunset"]]
+        self._adjust_high_latitudes(columns, method)
+
+        # Convert from solar time at the meridian to local clock time
+        results = []
+        for i, utc_offset in enumerate(offsets):
+            shift = utc_offset - self.longitude / 15
+            results.append({name: None if columns[name][i] is None else (columns[name][i] + shift) % 24
+                            for name in PRAYERS})
+        return results
+
+    def _adjust_high_latitudes(self, columns, method):
+        """Keep fajr and isha within an angle-based portion of the night"""
+        for i, (sunrise, sunset) in enumerate(zip(columns["sunrise"], columns["sunset"])):
+            if sunrise is None or sunset is None:
+                continue
+            night = 24 - (sunset - sunrise)
+            portion = method["fajr"] / 60 * night
+            fajr = columns["fajr"][i]
+            if fajr is None or sunrise - fajr > portion:
+                columns["fajr"][i] = sunrise - portion
+            if "isha" in method:
+                portion = method["isha"] / 60 * night
+                isha = columns["isha"][i]
+                if isha is None or isha - sunset > portion:
+                    columns["isha"][i] = sunset + portion
+
+    def _sun_angle_time(self, noon, angle, declination, direction):
+        """Time the sun is angle degrees below the horizon, before (-1) or after (1) noon"""
+        cosine = ((-_sin(angle) - _sin(declination) * _sin(self.latitude)) /
+                  (_cos(declination) * _cos(self.latitude)))
+        if not -1 <= cosine <= 1:
+            return None
+        return noon + direction * _arccos(cosine) / 15
@@ -0,0 +1,445 @@
+"""
+Reminder scheduling for Athkar Reminder application.
+Arms a single timer for the exact time the next reminder is due instead of
+polling the clock every second.
+
+Besides the fixed interval, reminders can follow a RuleSchedule: windows
+such as "every 15 minutes from 09:00 to 17:00" or "once between fajr and
+sunrise", each with its own duaa category. Each day's firing times are
+worked out once into a sorted timeline, so finding the next one is a
+binary search.
+"""
+
+import bisect
+import re
+import time
+from datetime import datetime, time as day_time, timedelta
+
+from prayer_times import PRAYERS, PrayerTimes
+
+# A rule anchor: "HH:MM" or a prayer name, with an optional +/- minutes offset
+ANCHOR = re.compile(r"^\s*(?:(\d{1,2}):(\d{2})|([a-z]+))\s*(?:([+-])\s*(\d+))?\s*$")
+
+# Weekday names accepted in rules, Monday first like date.weekday()
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+# What to do about reminders missed while suspended or across a clock jump
+CATCH_UP_POLICIES = ("skip", "fire_once", "coalesce")
+
+
+def suspend_aware_clock():
+    """Monotonic seconds that keep counting while the system is suspended (where supported)"""
+    if hasattr(time, "CLOCK_BOOTTIME"):
+        # Linux: CLOCK_MONOTONIC stops during suspend, CLOCK_BOOTTIME does not
+        return time.clock_gettime(time.CLOCK_BOOTTIME)
+    return time.monotonic()
+
+
+class TkTimer:
+    """Timer backend that uses the Tk event loop (root.after)"""
+
+    def __init__(self, root):
+        self.root = root
+
+    def call_later(self, delay, callback):
+        """Schedule callback after delay seconds and return a handle"""
+        return self.root.after(max(0, int(delay * 1000)), callback)
+
+    def cancel(self, handle):
+        """Cancel a handle returned by call_later"""
+        try:
+            self.root.after_cancel(handle)
+        except Exception:
+            # The window may already be destroyed
+            pass
+
+
+def parse_anchor(text):
+    """
+    Parse a rule anchor such as "09:30", "fajr" or "maghrib+10".
+
+    Returns:
+        tuple: (prayer name or None, minutes after midnight or offset in minutes)
+
+    Raises:
+        ValueError: If the anchor is not understood
+    """
+    match = ANCHOR.match(str(text).lower())
+    if not match:
+        raise ValueError(f"Invalid schedule time: {text!r}")
+    hours, minutes, prayer, sign, offset = match.groups()
+    offset = int(offset or 0) * (-1 if sign == "-" else 1)
+    if prayer is None:
+        return None, int(hours) * 60 + int(minutes) + offset
+    if prayer not in PRAYERS:
+        raise ValueError(f"Unknown prayer in schedule time: {text!r}")
+    return prayer, offset
+
+
+class ScheduleRule:
+    """
+    One reminder window.
+
+    Args:
+        start (str): When the window opens, "HH:MM" or a prayer ("fajr+15")
+        end (str): When it closes (exclusive), None for a single reminder at start
+        every (int): Minutes between reminders inside the window, None for one
+        category (str): Duaa category shown by this rule, None for any duaa
+        days (list): Weekdays ("mon".."sun") the rule applies on, None for every day
+    """
+
+    def __init__(self, start, end=None, every=None, category=None, days=None):
+        self.start = parse_anchor(start)
+        self.end = parse_anchor(end) if end is not None else None
+        self.every = max(1, int(every)) if every else None
+        self.category = category
+        self.days = None if days is None else {WEEKDAYS.index(day[:3].lower()) for day in days}
+        self.uses_prayers = self.start[0] is not None or (self.end is not None and self.end[0] is not None)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create a rule from its settings.json form"""
+        return cls(data["start"], data.get("end"), data.get("every"),
+                   data.get("category"), data.get("days"))
+
+    def minutes(self, day, prayers):
+        """Return the firing times of a day in minutes after midnight"""
+        if self.days is not None and day.weekday() not in self.days:
+            return []
+        start = _resolve(self.start, prayers)
+        if start is None:
+            return []
+        if self.end is None or self.every is None:
+            return [start]
+        end = _resolve(self.end, prayers)
+        if end is None:
+            return []
+        if end <= start:
+            # The window runs past midnight
+            end += 24 * 60
+        count = int((end - start) // self.every)
+        if start + count * self.every >= end:
+            count -= 1
+        return [start + k * self.every for k in range(count + 1)]
+
+
+def _resolve(anchor, prayers):
+    """Minutes after midnight of an anchor, None if its prayer time is undefined"""
+    prayer, minutes = anchor
+    if prayer is None:
+        return minutes
+    if prayers is None or prayers.get(prayer) is None:
+        return None
+    return prayers[prayer] * 60 + minutes
+
+
+class RuleSchedule:
+    """
+    Reminder times from a list of ScheduleRules.
+
+    Each day's firing times are merged into one sorted timeline the first
+    time that day is needed; quiet hours are removed from it.
+
+    Args:
+        rules (list): ScheduleRule objects
+        quiet_hours (list): ("HH:MM", "HH:MM") windows in which nothing fires
+        prayer_times (PrayerTimes): Needed by rules anchored on prayers
+    """
+
+    def __init__(self, rules, quiet_hours=(), prayer_times=None):
+        self.rules = list(rules)
+        self.quiet_hours = [(parse_anchor(start)[1], parse_anchor(end)[1]) for start, end in quiet_hours]
+        self.prayer_times = prayer_times
+        self._timelines = {}
+
+    @classmethod
+    def from_settings(cls, settings):
+        """
+        Build the schedule configured in settings.
+
+        Returns:
+            RuleSchedule: None if no rules are configured (use the interval)
+        """
+        rules = [ScheduleRule.from_dict(rule) for rule in settings.get("schedule") or []]
+        if not rules:
+            return None
+        location = settings.get("location") or {}
+        prayer_times = None
+        if "latitude" in location and "longitude" in location:
+            prayer_times = PrayerTimes(location["latitude"], location["longitude"],
+                                       location.get("elevation", 0),
+                                       method=settings.get("prayer_method") or "MWL",
+                                       asr=settings.get("asr_method") or "standard")
+        elif any(rule.uses_prayers for rule in rules):
+            print("Error in schedule: prayer-relative rules need a location, they are skipped")
+        return cls(rules, settings.get("quiet_hours") or (), prayer_times)
+
+    def timeline(self, day):
+        """Return the firing times of a day as (sorted timestamps, their rules)"""
+        timeline = self._timelines.get(day)
+        if timeline is None:
+            midnight = datetime.combine(day, day_time())
+            prayers = None
+            if self.prayer_times is not None:
+                prayers = self.prayer_times.hours(day)
+
+            entries = []
+            for rule in self.rules:
+                for minutes in rule.minutes(day, prayers):
+                    if not self._is_quiet(minutes % (24 * 60)):
+                        when = (midnight + timedelta(minutes=minutes)).timestamp()
+                        entries.append((when, rule))
+            entries.sort(key=lambda entry: entry[0])
+            timeline = ([when for when, rule in entries], [rule for when, rule in entries])
+
+            # Only a few days are ever needed at once
+            if len(self._timelines) > 7:
+                self._timelines.clear()
+            self._timelines[day] = timeline
+        return timeline
+
+    def next_after(self, timestamp):
+        """
+        Find the first firing time after timestamp.
+
+        Returns:
+            tuple: (timestamp, rule), or (None, None) if nothing fires within a week
+        """
+        day = datetime.fromtimestamp(timestamp).date()
+        best = (None, None)
+        # Start a day early, windows running past midnight belong to the day they opened
+        for offset in range(-1, 8):
+            current = day + timedelta(days=offset)
+            if best[0] is not None and datetime.combine(current, day_time()).timestamp() > best[0]:
+                break
+            times, rules = self.timeline(current)
+            index = bisect.bisect_right(times, timestamp)
+            if index < len(times) and (best[0] is None or times[index] < best[0]):
+                best = (times[index], rules[index])
+        return best
+
+    def count_between(self, start, end):
+        """Return the number of firing times in [start, end]"""
+        count = 0
+        first = datetime.fromtimestamp(start).date() - timedelta(days=1)
+        last = datetime.fromtimestamp(end).date()
+        day = first
+        while day <= last:
+            times, rules = self.timeline(day)
+            count += bisect.bisect_right(times, end) - bisect.bisect_left(times, start)
+            day += timedelta(days=1)
+        return count
+
+    def _is_quiet(self, minutes):
+        for start, end in self.quiet_hours:
+            if start <= end:
+                if start <= minutes < end:
+                    return True
+            elif minutes >= start or minutes < end:
+                return True
+        return False
+
+
+class ReminderScheduler:
+    """
+    Fires a callback every `interval` minutes, or at the times of a
+    RuleSchedule, using one armed timer.
+
+    The timer is only re-armed when the interval, the schedule, the pause
+    state or the wall clock changes. The clock and the timer backend are
+    injected so the scheduler can run (and be tested) without a display.
+
+    Interval reminders are timed on a monotonic clock, so wall clock jumps
+    (NTP, manual changes) neither fire them early nor delay them. Rule
+    schedules follow the wall clock. A reminder that is found more than
+    `grace` seconds late (the machine was suspended, or a schedule time
+    was jumped over) is handled by the catch-up policy:
+
+        skip       drop the missed reminders, wait for the next one
+        fire_once  show one reminder now and restart the countdown
+        coalesce   show one reminder now standing for all missed ones
+                   (see missed) and keep the original rhythm
+
+    Args:
+        timer: Object with call_later(delay_seconds, callback) and cancel(handle)
+        callback: Called with no arguments each time a reminder is due
+                  (fired_rule holds the schedule rule that fired, if any)
+        interval (int): Reminder interval in minutes
+        clock: Function returning the current wall time in seconds
+        schedule (RuleSchedule): Rule-based times used instead of the interval
+        monotonic: Function returning monotonic seconds that keep counting
+                   during suspend where the platform allows it
+        catch_up (str): Catch-up policy, one of CATCH_UP_POLICIES
+        grace (float): Seconds a reminder may be late before it counts as missed
+        max_sleep (float): Longest single timer wait, so a clock jump is
+                           noticed even if the timer backend follows the wall clock
+    """
+
+    def __init__(self, timer, callback, interval=30, clock=time.time, schedule=None,
+                 monotonic=suspend_aware_clock, catch_up="fire_once", grace=60, max_sleep=300):
+        if catch_up not in CATCH_UP_POLICIES:
+            raise ValueError(f"Unknown catch-up policy: {catch_up!r}")
+        self.timer = timer
+        self.callback = callback
+        self.clock = clock
+        self.monotonic = monotonic
+        self.interval = max(1, int(interval))
+        self.schedule = schedule
+        self.catch_up = catch_up
+        self.grace = grace
+        self.max_sleep = max_sleep
+        self.is_running = False
+        self.next_due = None      # wall time of the next reminder
+        self.next_rule = None
+        self.fired_rule = None
+        self.missed = 0           # reminders the last firing stands for
+        self.skipped = 0          # reminders dropped by catch-up so far
+        self._due_monotonic = None
+        self._handle = None
+        self._listeners = []
+
+    def add_listener(self, listener):
+        """Call listener with no arguments whenever the next due time changes"""
+        self._listeners.append(listener)
+
+    def start(self, interval=None):
+        """Start (or resume) the scheduler, the first reminder is one interval away"""
+        if interval is not None:
+            self.interval = max(1, int(interval))
+        self.is_running = True
+        self._plan()
+        self._arm()
+        self._changed()
+
+    def pause(self):
+        """Pause the scheduler and cancel the armed timer"""
+        self.is_running = False
+        self.next_due = None
+        self.next_rule = None
+        self._due_monotonic = None
+        self._disarm()
+        self._changed()
+
+    def set_interval(self, interval):
+        """Change the interval, restarting the countdown if running"""
+        interval = max(1, int(interval))
+        if interval == self.interval and self.next_due is not None:
+            return
+        self.interval = interval
+        if self.is_running and self.schedule is None:
+            self._plan()
+            self._arm()
+            self._changed()
+
+    def set_schedule(self, schedule):
+        """Follow a RuleSchedule (None to go back to the interval)"""
+        self.schedule = schedule
+        if self.is_running:
+            self._plan()
+            self._arm()
+            self._changed()
+
+    def remaining(self):
+        """Return the seconds left until the next reminder, or None if paused"""
+        if not self.is_running or self.next_due is None:
+            return None
+        return max(0.0, self._until_due())
+
+    def stop(self):
+        """Cancel any pending timer (used on shutdown)"""
+        self.pause()
+
+    def _until_due(self):
+        """Seconds until the next reminder (negative when it is overdue)"""
+        if self._due_monotonic is not None:
+            return self._due_monotonic - self.monotonic()
+        return self.next_due - self.clock()
+
+    def _plan(self, keep_rhythm=False):
+        """Work out the next due time (and its rule) from now"""
+        now = self.clock()
+        if self.schedule is not None:
+            self._due_monotonic = None
+            self.next_due, self.next_rule = self.schedule.next_after(now)
+            return
+
+        period = self.interval * 60
+        current = self.monotonic()
+        if keep_rhythm and self._due_monotonic is not None:
+            # Next point on the original grid of due times
+            steps = int((current - self._due_monotonic) // period) + 1
+            self._due_monotonic += max(1, steps) * period
+        else:
+            self._due_monotonic = current + period
+        self.next_due, self.next_rule = now + (self._due_monotonic - current), None
+
+    def _arm(self):
+        """Arm the single timer for the next due time"""
+        self._disarm()
+        if self.next_due is None:
+            # Nothing scheduled in the coming week (e.g. prayer times that
+            # cannot be computed yet), look again after max_sleep
+            self._handle = self.timer.call_later(self.max_sleep, self._recheck)
+            return
+        delay = min(max(0.0, self._until_due()), self.max_sleep)
+        self._handle = self.timer.call_later(delay, self._fire)
+
+    def _disarm(self):
+        if self._handle is not None:
+            self.timer.cancel(self._handle)
+            self._handle = None
+
+    def _recheck(self):
+        """Timer callback while nothing is scheduled - plan again from now"""
+        self._handle = None
+        if not self.is_running:
+            return
+        self._plan()
+        self._arm()
+        if self.next_due is not None:
+            self._changed()
+
+    def _changed(self):
+        for listener in self._listeners:
+            listener()
+
+    def _missed_count(self, late):
+        """Number of reminders that fell due while we were late"""
+        if self.schedule is None:
+            return 1 + int(late // (self.interval * 60))
+        return max(1, self.schedule.count_between(self.next_due, self.clock()))
+
+    def _fire(self):
+        """Timer callback - show the reminder if it is really due"""
+        self._handle = None
+        if not self.is_running or self.next_due is None:
+            return
+
+        remaining = self._until_due()
+        if remaining > 0:
+            # Woke up early (periodic check or the wall clock moved back)
+            if self._due_monotonic is not None:
+                self.next_due = self.clock() + remaining
+            self._arm()
+            return
+
+        late = -remaining
+        self.fired_rule = self.next_rule
+        if late <= self.grace:
+            self.missed = 1
+            self._plan(keep_rhythm=True)
+        else:
+            # Suspended or the clock jumped past the due time
+            self.missed = self._missed_count(late)
+            if self.catch_up == "skip":
+                self.skipped += self.missed
+                self.missed = 0
+                self._plan(keep_rhythm=True)
+                self._arm()
+                self._changed()
+                return
+            self._plan(keep_rhythm=self.catch_up == "coalesce")
+
+        self._arm()
+        self.callback()
+        self._changed()
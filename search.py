@@ -0,0 +1,120 @@
+"""
+Duaa search for Athkar Reminder application.
+An inverted index over normalised words that ignores tashkeel, tatweel and
+alef/hamza variants and is updated incrementally as duaas change.
+"""
+
+import bisect
+import re
+
+from arabic import normalize
+
+# Words are runs of letters and digits after normalisation
+WORD = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Split text into normalised words"""
+    return WORD.findall(normalize(text))
+
+
+class DuaaSearchIndex:
+    """
+    Inverted index mapping normalised words to duaa ids.
+
+    All query words must match; the last one may be a prefix so results
+    update while the user is typing.
+    """
+
+    def __init__(self):
+        self._postings = {}     # word -> set of ids
+        self._doc_words = {}    # id -> set of words
+        self._vocabulary = []   # sorted words, for prefix lookups
+
+    def __len__(self):
+        return len(self._doc_words)
+
+    def build(self, entries):
+        """Index (id, text) pairs in bulk, sorting the vocabulary once at the end"""
+        postings = self._postings
+        for duaa_id, text in entries:
+            words = set(tokenize(text))
+            self._doc_words[duaa_id] = words
+            for word in words:
+                posting = postings.get(word)
+                if posting is None:
+                    posting = postings[word] = set()
+                posting.add(duaa_id)
+        self._vocabulary = sorted(postings)
+
+    def add(self, duaa_id, text):
+        """Index one duaa, replacing what was indexed for the id before (an edit)"""
+        if duaa_id in self._doc_words:
+            self.remove(duaa_id)
+        words = set(tokenize(text))
+        self._doc_words[duaa_id] = words
+        for word in words:
+            posting = self._postings.get(word)
+            if posting is None:
+                posting = self._postings[word] = set()
+                bisect.insort(self._vocabulary, word)
+            posting.add(duaa_id)
+
+    def remove(self, duaa_id):
+        """Remove one duaa from the index"""
+        for word in self._doc_words.pop(duaa_id, ()):
+            posting = self._postings[word]
+            posting.discard(duaa_id)
+            if not posting:
+                del self._postings[word]
+                index = bisect.bisect_left(self._vocabulary, word)
+                del self._vocabulary[index]
+
+    def _prefix_matches(self, prefix):
+        """Union of the postings of every word starting with prefix"""
+        matches = set()
+        index = bisect.bisect_left(self._vocabulary, prefix)
+        while index < len(self._vocabulary) and self._vocabulary[index].startswith(prefix):
+            matches |= self._postings[self._vocabulary[index]]
+            index += 1
+        return matches
+
+    def search(self, query):
+        """
+        Find duaas matching a query.
+
+        Args:
+            query (str): Words to look for, in any spelling or vowelling
+
+        Returns:
+            list: Matching ids in ascending order
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+
+        # Exact words first, smallest posting first, then the prefix
+        candidate_sets = [self._postings.get(word, set()) for word in words[:-1]]
+        candidate_sets.sort(key=len)
+        candidate_sets.append(self._prefix_matches(words[-1]))
+
+        result = None
+        for candidates in candidate_sets:
+            result = set(candidates) if result is None else result & candidates
+            if not result:
+                return []
+        return sorted(result)
+
+
+class SearchResults:
+    """Data source for VirtualListbox showing only matching duaas"""
+
+    def __init__(self, store, ids):
+        self.store = store
+        self.ids = ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    def page(self, offset, limit):
+        return [(duaa_id, self.store.get(duaa_id)) for duaa_id in self.ids[offset:offset + limit]]
@@ -0,0 +1,375 @@
+"""
+Duaa selection for Athkar Reminder application.
+
+Decides which duaa a reminder shows next. Every policy picks in O(1)
+amortised time, can be seeded for reproducible tests, and exposes its
+state as plain JSON data so a restart continues the rotation instead of
+starting over.
+
+The JSON store numbers its duaas afresh on every load, so saved states
+name duaas by a hash of their text (duaa_key) rather than by store id.
+Policies note the id of their last pick in `last`, so a front-end can
+weight it (weighted) or ask to review it again (spaced).
+"""
+
+import hashlib
+import random
+from collections import deque
+
+
+def _text(store, duaa_id):
+    """Return the text of an id, or None if it was deleted meanwhile"""
+    try:
+        return store.get(duaa_id)
+    except (KeyError, IndexError):
+        return None
+
+
+def duaa_key(text):
+    """Return a key naming a duaa across restarts"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _key(store, duaa_id, memo):
+    """Return the key of an id (memoised, the text of an id never changes), None if deleted"""
+    key = memo.get(duaa_id)
+    if key is None:
+        text = _text(store, duaa_id)
+        if text is None:
+            return None
+        key = memo[duaa_id] = duaa_key(text)
+    return key
+
+
+def _ids_by_key(store, page_size=1000):
+    """Return the current id of every duaa key in store"""
+    ids = {}
+    offset = 0
+    while True:
+        rows = store.page(offset, page_size)
+        if not rows:
+            return ids
+        offset += len(rows)
+        for duaa_id, text in rows:
+            ids.setdefault(duaa_key(text), duaa_id)
+
+
+class RandomSelection:
+    """
+    Picks a uniformly random duaa (the original behaviour).
+
+    Args:
+        seed: Optional seed so the order of picks can be reproduced
+    """
+
+    name = "random"
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+        # Picks by position, the id of the last one is not tracked
+        self.last = None
+
+    def pick(self, store):
+        """Return the text of the next duaa from store, or None if it is empty"""
+        if not len(store):
+            return None
+        return store[self.rng.randrange(len(store))]
+
+    def state(self, store):
+        """Return the policy state as JSON data"""
+        return {}
+
+    def restore(self, state, store):
+        """Continue from a state returned by state()"""
+
+
+class ShuffleBagSelection:
+    """
+    Shows every duaa once, in shuffled order, before any duaa repeats.
+
+    Each round shuffles the ids once, so a pick is O(1) amortised. The
+    order of a round is derived from the seed and the round number; the
+    saved state names the duaas still in the bag by key, so a restart
+    finishes the round even if duaas were added or deleted meanwhile.
+    Duaas added during a round join the next one, deleted ones are skipped.
+
+    Args:
+        seed: Seed for the shuffles, random (and saved with the state) if None
+    """
+
+    name = "shuffle"
+
+    def __init__(self, seed=None):
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.round = 0
+        self.position = 0
+        self._bag = None
+        self.last = None
+        self._keys = {}
+
+    def pick(self, store):
+        """Return the text of the next duaa from store, or None if it is empty"""
+        for _ in range(2):
+            if self._bag is None:
+                self._bag = self._shuffled(store)
+            while self.position < len(self._bag):
+                duaa_id = self._bag[self.position]
+                self.position += 1
+                text = _text(store, duaa_id)
+                if text is not None:
+                    self.last = duaa_id
+                    return text
+            # Bag exhausted, start the next round
+            self.round += 1
+            self.position = 0
+            self._bag = None
+        return None
+
+    def _shuffled(self, store):
+        bag = store.ids()
+        random.Random(f"{self.seed}:{self.round}").shuffle(bag)
+        if len(bag) > 1 and bag[0] == self.last:
+            # Don't repeat the last duaa of the previous round back-to-back
+            bag[0], bag[-1] = bag[-1], bag[0]
+        return bag
+
+    def state(self, store):
+        remaining = None
+        if self._bag is not None:
+            keys = [_key(store, duaa_id, self._keys) for duaa_id in self._bag[self.position:]]
+            remaining = [key for key in keys if key is not None]
+        last = _key(store, self.last, self._keys) if self.last is not None else None
+        return {"seed": self.seed, "round": self.round, "remaining": remaining, "last": last}
+
+    def restore(self, state, store):
+        self.seed = state.get("seed", self.seed)
+        self.round = state.get("round", 0)
+        self.position = 0
+        self._bag = None
+        self.last = None
+        remaining = state.get("remaining")
+        if remaining is not None:
+            ids = _ids_by_key(store)
+            bag = []
+            seen = set()
+            for key in remaining:
+                duaa_id = ids.get(key)
+                # Deleted duaas are dropped, duaas with the same text are drawn once
+                if duaa_id is not None and duaa_id not in seen:
+                    bag.append(duaa_id)
+                    seen.add(duaa_id)
+            self._bag = bag
+            self.last = ids.get(state.get("last"))
+
+
+class WeightedSelection:
+    """
+    Picks duaas in proportion to their weights, never the same one twice in a row.
+
+    Uses Walker's alias method: O(n) to build the tables, then O(1) per
+    pick. The tables are rebuilt only when the collection or the weights
+    change. When one duaa outweighs the rest, draws keep landing on the
+    duaa shown last; after a few the pick is drawn from the others in O(n).
+
+    Args:
+        weights (dict): Weight per duaa id, ids not listed weigh 1.0
+        seed: Optional seed so the order of picks can be reproduced
+    """
+
+    name = "weighted"
+
+    def __init__(self, weights=None, seed=None):
+        self.weights = dict(weights or {})
+        self.rng = random.Random(seed)
+        self._tables = None
+        self._changes = None
+        self.last = None
+        self._keys = {}
+
+    def set_weight(self, duaa_id, weight):
+        """Change the weight of one duaa"""
+        self.weights[duaa_id] = max(0.0, float(weight))
+        self._tables = None
+
+    def pick(self, store):
+        """Return the text of the next duaa from store, or None if it is empty"""
+        if self._tables is None or self._changes != store.changes:
+            self._build(store)
+        ids, probability, alias = self._tables
+        if not ids:
+            return None
+
+        for _ in range(8):
+            column = self.rng.randrange(len(ids))
+            index = column if self.rng.random() < probability[column] else alias[column]
+            duaa_id = ids[index]
+            if duaa_id == self.last and len(ids) > 1:
+                continue
+            text = _text(store, duaa_id)
+            if text is not None:
+                self.last = duaa_id
+                return text
+            # Deleted without the size changing, rebuild next time
+            self._tables = None
+
+        # Draw from the duaas other than the last one directly
+        others = [duaa_id for duaa_id in ids if duaa_id != self.last]
+        while others:
+            duaa_id = self.rng.choices(others, [self.weights.get(other, 1.0) for other in others])[0]
+            text = _text(store, duaa_id)
+            if text is not None:
+                self.last = duaa_id
+                return text
+            others.remove(duaa_id)
+        # Every other duaa is gone, repeating is better than skipping the reminder
+        return _text(store, self.last) if self.last is not None else None
+
+    def _build(self, store):
+        """Build the alias tables for the current collection"""
+        ids = [duaa_id for duaa_id in store.ids() if self.weights.get(duaa_id, 1.0) > 0]
+        count = len(ids)
+        probability = [0.0] * count
+        alias = [0] * count
+        if count:
+            total = sum(self.weights.get(duaa_id, 1.0) for duaa_id in ids)
+            scaled = [self.weights.get(duaa_id, 1.0) * count / total for duaa_id in ids]
+            small = [i for i, value in enumerate(scaled) if value < 1.0]
+            large = [i for i, value in enumerate(scaled) if value >= 1.0]
+            while small and large:
+                less = small.pop()
+                more = large.pop()
+                probability[less] = scaled[less]
+                alias[less] = more
+                scaled[more] -= 1.0 - scaled[less]
+                (small if scaled[more] < 1.0 else large).append(more)
+            for i in small + large:
+                probability[i] = 1.0
+        self._tables = (ids, probability, alias)
+        self._changes = store.changes
+
+    def state(self, store):
+        weights = {}
+        for duaa_id, weight in self.weights.items():
+            key = _key(store, duaa_id, self._keys)
+            if key is not None:
+                weights[key] = weight
+        last = _key(store, self.last, self._keys) if self.last is not None else None
+        return {"weights": weights, "last": last}
+
+    def restore(self, state, store):
+        ids = _ids_by_key(store)
+        self.weights = {ids[key]: weight for key, weight in state.get("weights", {}).items() if key in ids}
+        self.last = ids.get(state.get("last"))
+        self._tables = None
+
+
+class SpacedRepetitionSelection:
+    """
+    Leitner-box spaced repetition.
+
+    New duaas start in box 0. A shown duaa moves up one box, and box n is
+    visited half as often as box n - 1, so familiar duaas come back less
+    and less often. review_again() sends a duaa back to box 0. Visiting a
+    box pops from a queue, so a pick is O(1) amortised.
+
+    Args:
+        boxes (int): Number of boxes
+        seed: Optional seed for the order new duaas are queued in
+    """
+
+    name = "spaced"
+
+    def __init__(self, boxes=5, seed=None):
+        self.rng = random.Random(seed)
+        self.boxes = [deque() for _ in range(max(1, boxes))]
+        self.turn = 0
+        self.last = None
+        self._known = set()
+        self._changes = None
+        self._keys = {}
+
+    def pick(self, store):
+        """Return the text of the next duaa from store, or None if it is empty"""
+        if self._changes != store.changes:
+            self._sync(store)
+
+        for _ in range(len(self._known) + 1):
+            box = self._next_box()
+            if box is None:
+                return None
+            duaa_id = self.boxes[box].popleft()
+            text = _text(store, duaa_id)
+            if text is None:
+                self._known.discard(duaa_id)
+                continue
+            self.boxes[min(box + 1, len(self.boxes) - 1)].append(duaa_id)
+            self.last = duaa_id
+            return text
+        return None
+
+    def review_again(self, duaa_id):
+        """Move a duaa back to the first box so it is shown often again"""
+        for box in self.boxes:
+            try:
+                box.remove(duaa_id)
+                break
+            except ValueError:
+                pass
+        self.boxes[0].append(duaa_id)
+        self._known.add(duaa_id)
+
+    def _next_box(self):
+        """Box due on this turn (box n every 2**n turns), else the nearest non-empty one"""
+        self.turn += 1
+        due = (self.turn & -self.turn).bit_length() - 1
+        due = min(due, len(self.boxes) - 1)
+        for box in list(range(due, -1, -1)) + list(range(due + 1, len(self.boxes))):
+            if self.boxes[box]:
+                return box
+        return None
+
+    def _sync(self, store):
+        """Queue duaas added since the last pick into the first box"""
+        ids = store.ids()
+        new_ids = [duaa_id for duaa_id in ids if duaa_id not in self._known]
+        self.rng.shuffle(new_ids)
+        self.boxes[0].extend(new_ids)
+        self._known.update(new_ids)
+        self._changes = store.changes
+
+    def state(self, store):
+        boxes = []
+        for box in self.boxes:
+            keys = [_key(store, duaa_id, self._keys) for duaa_id in box]
+            boxes.append([key for key in keys if key is not None])
+        return {"boxes": boxes, "turn": self.turn}
+
+    def restore(self, state, store):
+        boxes = state.get("boxes")
+        if boxes:
+            ids = _ids_by_key(store)
+            self.boxes = [deque() for _ in boxes]
+            self._known = set()
+            for box, keys in zip(self.boxes, boxes):
+                for key in keys:
+                    duaa_id = ids.get(key)
+                    # Deleted duaas are dropped, duaas with the same text are queued once
+                    if duaa_id is not None and duaa_id not in self._known:
+                        box.append(duaa_id)
+                        self._known.add(duaa_id)
+        self.turn = state.get("turn", 0)
+        self._changes = None
+
+
+# Selection policies by settings name
+SELECTIONS = {
+    "random": RandomSelection,
+    "shuffle": ShuffleBagSelection,
+    "weighted": WeightedSelection,
+    "spaced": SpacedRepetitionSelection,
+}
+
+
+def create_selection(name, seed=None):
+    """Create a selection policy by name (unknown names use the shuffle bag)"""
+    return SELECTIONS.get(name, ShuffleBagSelection)(seed=seed)
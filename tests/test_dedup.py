@@ -0,0 +1,132 @@
+"""Tests for exact and near-duplicate detection"""
+
+from dedup import DuplicateIndex, exact_key
+from duaa_store import DuaaStore
+from engine import DEFAULT_DUAAS, ReminderEngine, SettingsStore
+
+LONG = DEFAULT_DUAAS[4]
+
+
+class ManualTimer:
+    """Timer backend whose callbacks are run by the test"""
+
+    def __init__(self):
+        self.pending = []
+
+    def call_later(self, delay, callback):
+        self.pending.append(callback)
+        return callback
+
+    def cancel(self, handle):
+        if handle in self.pending:
+            self.pending.remove(handle)
+
+    def run_all(self):
+        while self.pending:
+            self.pending.pop(0)()
+
+
+def near_copy(text):
+    """The text with one extra word"""
+    words = text.split()
+    words.insert(3, "و")
+    return " ".join(words)
+
+
+def make_store(tmp_path, texts):
+    return DuaaStore(str(tmp_path / "duaas.json"), defaults=texts)
+
+
+def test_exact_key_ignores_diacritics_punctuation_and_spacing():
+    assert exact_key("سُبْحَانَ اللَّهِ، وَبِحَمْدِهِ.") == exact_key("سبحان   الله وبحمده")
+
+
+def test_check_finds_exact_and_near_duplicates(tmp_path):
+    store = make_store(tmp_path, DEFAULT_DUAAS)
+    index = DuplicateIndex(store)
+    assert index.build() == []
+
+    original = store.id_at(4)
+    assert index.check(LONG + "!") == (original, 1.0)
+    duaa_id, similarity = index.check(near_copy(LONG))
+    assert duaa_id == original and 0.8 <= similarity < 1.0
+    assert index.check("نص لا يشبه أي دعاء في المكتبة على الإطلاق") is None
+
+
+def test_build_reports_each_duplicate_once(tmp_path):
+    store = make_store(tmp_path, DEFAULT_DUAAS + [LONG, near_copy(LONG)])
+    duplicates = DuplicateIndex(store).build()
+    assert [(duplicate, original) for duplicate, original, similarity in duplicates] == [
+        (store.id_at(10), store.id_at(4)), (store.id_at(11), store.id_at(4))]
+    assert duplicates[0][2] == 1.0 and duplicates[1][2] < 1.0
+
+
+def test_remove_hands_exact_matches_to_the_remaining_copy(tmp_path):
+    store = make_store(tmp_path, DEFAULT_DUAAS + [LONG])
+    # Exact matching only, so the near-duplicate search cannot cover for it
+    index = DuplicateIndex(store, near=False)
+    for duaa_id, text in store.page(0, 100):
+        index.add(duaa_id, text)
+
+    first, copy = store.id_at(4), store.id_at(10)
+    store.delete(first)
+    index.remove(first)
+    assert index.check(LONG) == (copy, 1.0)
+
+    store.delete(copy)
+    index.remove(copy)
+    assert index.check(LONG) is None
+
+
+def test_remove_empties_the_buckets(tmp_path):
+    store = make_store(tmp_path, DEFAULT_DUAAS)
+    index = DuplicateIndex(store)
+    for duaa_id, text in store.page(0, 100):
+        index.add(duaa_id, text)
+    for duaa_id in store.ids():
+        index.remove(duaa_id)
+    assert index._buckets == {} and index._signatures == {}
+    assert len(index) == 0
+
+
+def test_deleted_original_without_remove_does_not_hide_a_copy(tmp_path):
+    store = make_store(tmp_path, DEFAULT_DUAAS + [LONG])
+    index = DuplicateIndex(store, near=False)
+    for duaa_id, text in store.page(0, 100):
+        index.add(duaa_id, text)
+    copy = store.id_at(10)
+    store.delete(store.id_at(4))
+    assert index.check(LONG) == (copy, 1.0)
+
+
+def test_engine_clean_library(tmp_path):
+    store = make_store(tmp_path, DEFAULT_DUAAS + [LONG, near_copy(LONG), DEFAULT_DUAAS[0]])
+    timer = ManualTimer()
+    engine = ReminderEngine(timer, lambda duaa: None, settings=SettingsStore(str(tmp_path / "settings.json")),
+                            store=store, selection_file=None)
+
+    report = engine.clean_library(dry_run=True)
+    assert (report["exact"], report["near"], report["removed"]) == (2, 1, 0)
+    assert len(store) == 13
+
+    removed = engine.remove_duplicates(report["duplicates"])
+    assert len(removed) == 3
+    assert list(store) == DEFAULT_DUAAS
+    assert engine.find_duplicate(LONG)[0] == store.id_at(4)
+
+    assert engine.clean_library()["removed"] == 0
+
+
+def test_engine_indexes_in_slices_and_skips_duplicates(tmp_path):
+    store = make_store(tmp_path, DEFAULT_DUAAS)
+    timer = ManualTimer()
+    engine = ReminderEngine(timer, lambda duaa: None, settings=SettingsStore(str(tmp_path / "settings.json")),
+                            store=store, selection_file=None)
+    # Nothing is indexed until it is needed
+    assert engine._duplicates is None
+
+    assert engine.add_duaas([LONG, near_copy(LONG), "دعاء جديد"], skip_duplicates=True) == [store.id_at(10)]
+    timer.run_all()
+    assert engine.duplicate_index().ready
+    engine.delete_duaas([store.id_at(10)])
+    assert engine.find_duplicate("دعاء جديد") is None
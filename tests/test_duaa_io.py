@@ -0,0 +1,189 @@
+"""Tests for bulk import and export"""
+
+import json
+import os
+import stat
+import sys
+
+import pytest
+
+import duaa_io
+from duaa_io import detect_format, export_duaas, import_duaas, read_duaas, validate
+from duaa_store import DuaaRecord, DuaaStore, SQLiteDuaaStore
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "json":
+        store = DuaaStore(str(tmp_path / "duaas.json"), defaults=["سبحان الله"])
+    else:
+        store = SQLiteDuaaStore(str(tmp_path / "duaas.db"), str(tmp_path / "duaas.json"),
+                                defaults=["سبحان الله"])
+    yield store
+    store.close()
+
+
+def write(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
+
+def test_detect_format():
+    assert detect_format("a/b.JSON") == "json"
+    assert detect_format("b.ndjson") == "jsonl"
+    assert detect_format("b.dat", "csv") == "csv"
+    with pytest.raises(ValueError):
+        detect_format("b.dat")
+    with pytest.raises(ValueError):
+        detect_format("b.txt", "xml")
+
+
+def test_validate():
+    assert validate("  text  ", "morning") == {"text": "text", "category": "morning",
+                                                "source": None, "translation": None}
+    # The entry's own category wins over the default
+    assert validate({"text": "t", "category": "evening", "source": ""}, "morning")["category"] == "evening"
+    for bad in [42, {}, {"text": "   "}, {"text": "a\x00b"}, {"text": "t", "source": 1},
+                "x" * (duaa_io.MAX_LENGTH + 1)]:
+        with pytest.raises(ValueError):
+            validate(bad)
+
+
+def test_import_txt(store, tmp_path):
+    path = write(tmp_path, "in.txt", "الحمد لله\n\nالله أكبر\n")
+    report = import_duaas(store, path, category="morning")
+    assert (report["read"], report["added"], report["invalid"]) == (2, 2, 0)
+    assert list(store) == ["سبحان الله", "الحمد لله", "الله أكبر"]
+    assert store.record(store.id_at(1)).category == "morning"
+
+
+def test_import_json(store, tmp_path):
+    path = write(tmp_path, "in.json", json.dumps(
+        ["الحمد لله", {"text": "الله أكبر", "category": "evening", "source": "Muslim"}],
+        ensure_ascii=False, indent=2))
+    report = import_duaas(store, path)
+    assert report["added"] == 2
+    assert store.record(store.id_at(2)) == DuaaRecord("الله أكبر", "evening", "Muslim")
+
+
+def test_import_json_across_chunks(store, tmp_path, monkeypatch):
+    texts = [f"duaa number {i}" for i in range(50)]
+    path = write(tmp_path, "in.json", json.dumps(texts, indent=4))
+    original = duaa_io._read_json
+    monkeypatch.setitem(duaa_io.READERS, "json", lambda f: original(f, chunk_size=7))
+    lines = [line for line, entry in read_duaas(path)]
+    assert lines == list(range(2, 52))
+    report = import_duaas(store, path)
+    assert report["added"] == 50
+    assert list(store)[1:] == texts
+
+
+def test_import_jsonl(store, tmp_path):
+    path = write(tmp_path, "in.jsonl",
+                 '"الحمد لله"\n{"text": "الله أكبر", "translation": "Allah is the greatest"}\n')
+    assert import_duaas(store, path)["added"] == 2
+    assert store.record(store.id_at(2)).translation == "Allah is the greatest"
+
+
+def test_import_csv_with_header(store, tmp_path):
+    path = write(tmp_path, "in.csv",
+                 "Category,Text,Source\nmorning,الحمد لله,Bukhari\n,,\nevening,\"الله، أكبر\",\n")
+    report = import_duaas(store, path)
+    assert report["added"] == 2
+    assert store.record(store.id_at(1)) == DuaaRecord("الحمد لله", "morning", "Bukhari")
+    assert store.record(store.id_at(2)) == DuaaRecord("الله، أكبر", "evening")
+
+
+def test_import_csv_without_header(store, tmp_path):
+    path = write(tmp_path, "in.csv", "الحمد لله\nالله أكبر\n")
+    assert import_duaas(store, path)["added"] == 2
+    assert list(store)[1:] == ["الحمد لله", "الله أكبر"]
+
+
+def test_duplicates_are_skipped(store, tmp_path):
+    # Same normalised text as the store, and twice within the file
+    path = write(tmp_path, "in.txt", "سُبْحَانَ اللَّهِ\nالحمد لله\nالْحَمْدُ لِلَّهِ\nالحمد  لله!\n")
+    report = import_duaas(store, path)
+    assert (report["read"], report["added"], report["duplicates"]) == (4, 1, 3)
+    assert list(store) == ["سبحان الله", "الحمد لله"]
+
+
+def test_invalid_lines_are_reported_not_fatal(store, tmp_path):
+    path = write(tmp_path, "in.jsonl", '"الحمد لله"\n{"text": \n42\n{"text": "الله أكبر"}\n')
+    report = import_duaas(store, path)
+    assert (report["read"], report["added"], report["invalid"]) == (4, 2, 2)
+    assert report["errors"][0].startswith("line 2: invalid JSON")
+    assert report["errors"][1].startswith("line 3: expected a string")
+
+
+def test_truncated_json_keeps_what_was_read(store, tmp_path):
+    path = write(tmp_path, "in.json", '["الحمد لله", "الله أكبر", {"text": ')
+    report = import_duaas(store, path)
+    assert report["added"] == 2
+    assert report["invalid"] == 1
+    assert report["errors"][0].startswith("stopped reading")
+
+
+def test_json_that_is_not_an_array_is_rejected(store, tmp_path):
+    path = write(tmp_path, "in.json", '{"text": "الحمد لله"}')
+    with pytest.raises(ValueError):
+        import_duaas(store, path)
+    assert len(store) == 1
+
+
+def test_batches_commit_separately(store, tmp_path):
+    path = write(tmp_path, "in.txt", "".join(f"duaa {i}\n" for i in range(7)))
+    batches = []
+    report = import_duaas(store, path, batch_size=3, on_batch=batches.append)
+    assert report["added"] == 7
+    assert [len(ids) for ids in batches] == [3, 3, 1]
+    assert [store.get(duaa_id) for ids in batches for duaa_id in ids] == [f"duaa {i}" for i in range(7)]
+
+
+@pytest.mark.parametrize("format", duaa_io.FORMATS)
+def test_round_trip(store, tmp_path, format):
+    store.add("الحمد لله", category="morning", source="Bukhari", translation="Praise be to Allah")
+    store.add("اللهم صل، على محمد", category="evening")
+    path = str(tmp_path / f"out.{format}")
+    assert export_duaas(store, path) == 3
+
+    target = DuaaStore(str(tmp_path / "target.json"))
+    report = import_duaas(target, path)
+    assert report["added"] == 3
+    assert report["invalid"] == 0
+    if format == "txt":
+        # Plain text keeps the text only
+        assert list(target) == list(store)
+    else:
+        assert list(target.records()) == list(store.records())
+
+
+def test_txt_export_flattens_line_breaks(store, tmp_path):
+    store.add("الحمد\nلله")
+    path = str(tmp_path / "out.txt")
+    export_duaas(store, path)
+    with open(path, encoding="utf-8") as f:
+        assert f.read().splitlines()[-1] == "الحمد لله"
+
+
+def test_export_json_matches_snapshot_format(tmp_path):
+    store = DuaaStore(str(tmp_path / "duaas.json"), defaults=["a", "b"])
+    path = str(tmp_path / "out.json")
+    export_duaas(store, path)
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == json.dumps(["a", "b"], indent=4) + "\n"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX permissions")
+def test_export_keeps_permissions(store, tmp_path):
+    path = str(tmp_path / "out.csv")
+    umask = os.umask(0o022)
+    try:
+        export_duaas(store, path)
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+        os.chmod(path, 0o664)
+        export_duaas(store, path)
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o664
+    finally:
+        os.umask(umask)
@@ -0,0 +1,248 @@
+"""Tests for the JSON snapshot + operation log store"""
+
+import json
+import os
+import shutil
+import stat
+import sys
+
+import pytest
+
+from duaa_store import CategoryView, DuaaRecord, DuaaStore, SQLiteDuaaStore, atomic_write_bytes
+
+
+def test_log_is_replayed_on_load(tmp_path):
+    path = str(tmp_path / "duaas.json")
+    store = DuaaStore(path, defaults=["a", "b"])
+    store.add("c")
+    store.delete(store.id_at(0))
+
+    assert list(DuaaStore(path)) == ["b", "c"]
+
+
+def test_torn_log_tail_is_dropped(tmp_path):
+    path = str(tmp_path / "duaas.json")
+    store = DuaaStore(path, defaults=["a"])
+    store.add("b")
+    with open(store.log_path, "a", encoding="utf-8") as f:
+        f.write('{"op": "add", "te')
+
+    store = DuaaStore(path)
+    assert list(store) == ["a", "b"]
+    store.add("c")
+    assert list(DuaaStore(path)) == ["a", "b", "c"]
+
+
+def test_stale_log_after_compaction_crash_is_discarded(tmp_path):
+    path = str(tmp_path / "duaas.json")
+    store = DuaaStore(path, defaults=["a"])
+    store.add("b")
+
+    # Crash between replacing the snapshot and removing the log: the new
+    # snapshot is on disk and the old log is still next to it
+    stale = str(tmp_path / "stale.log")
+    shutil.copy(store.log_path, stale)
+    store.compact()
+    shutil.copy(stale, store.log_path)
+
+    store = DuaaStore(path)
+    assert list(store) == ["a", "b"]
+    assert not os.path.exists(store.log_path)
+
+    # Edits made after the crash survive the next restart
+    store.add("NEW")
+    assert list(DuaaStore(path)) == ["a", "b", "NEW"]
+
+
+def test_sqlite_imports_the_json_library_once(tmp_path):
+    json_path = str(tmp_path / "duaas.json")
+    db_path = str(tmp_path / "duaas.db")
+    json_store = DuaaStore(json_path, defaults=["a", "b"])
+    # Edits still in the log are imported too
+    json_store.add("c")
+
+    store = SQLiteDuaaStore(db_path, json_path)
+    assert list(store) == ["a", "b", "c"]
+    store.close()
+
+    store = SQLiteDuaaStore(db_path, json_path)
+    assert list(store) == ["a", "b", "c"]
+    store.close()
+
+
+def test_sqlite_emptied_library_stays_empty(tmp_path):
+    json_path = str(tmp_path / "duaas.json")
+    db_path = str(tmp_path / "duaas.db")
+    DuaaStore(json_path, defaults=["a", "b"])
+
+    store = SQLiteDuaaStore(db_path, json_path)
+    store.delete_many(store.ids())
+    assert list(store) == []
+    store.close()
+
+    store = SQLiteDuaaStore(db_path, json_path)
+    assert len(store) == 0 and list(store) == []
+    store.close()
+
+
+def test_sqlite_delete_many_and_paging(tmp_path):
+    store = SQLiteDuaaStore(str(tmp_path / "duaas.db"), None, defaults=[f"duaa {i}" for i in range(10)])
+    ids = store.ids()
+    store.delete_many(ids[2:5] + [12345])
+    assert len(store) == 7
+    assert [text for duaa_id, text in store.page(0, 3)] == ["duaa 0", "duaa 1", "duaa 5"]
+    assert [duaa_id for duaa_id, text in store.page(5, 10)] == ids[8:]
+    assert store.page(7, 5) == []
+    assert store[-1] == "duaa 9"
+    store.close()
+
+
+def test_sqlite_search_ignores_diacritics(tmp_path):
+    store = SQLiteDuaaStore(str(tmp_path / "duaas.db"), None, defaults=[
+        "سُبْحَانَ اللَّهِ وَبِحَمْدِهِ",
+        "اللَّهُمَّ إِنِّي أَسْأَلُكَ الْهُدَى",
+    ])
+    assert [text for duaa_id, text in store.search("سبحان")] == ["سُبْحَانَ اللَّهِ وَبِحَمْدِهِ"]
+    # Words match as prefixes, all of them must be present
+    assert len(store.search("اللهم اسال")) == 1
+    assert store.search("سبحان الهدى") == []
+    store.delete(store.ids()[0])
+    assert store.search("سبحان") == []
+    store.close()
+
+
+def test_record_json_round_trip():
+    plain = DuaaRecord("a")
+    assert plain.to_json() == "a"
+    assert DuaaRecord.from_json("a") == plain
+
+    full = DuaaRecord("b", "morning", "Muslim", "B")
+    assert full.to_json() == {"text": "b", "category": "morning", "source": "Muslim", "translation": "B"}
+    assert DuaaRecord.from_json(full.to_json()) == full
+    # Empty metadata is the same as none
+    assert DuaaRecord("a", "", "", "").to_json() == "a"
+    assert DuaaRecord.from_json({"text": "c", "source": "x"}).to_json() == {"text": "c", "source": "x"}
+
+
+def test_record_is_compact():
+    record = DuaaRecord("a", "morning", "Muslim")
+    assert not hasattr(record, "__dict__")
+    # Categories and sources repeat across a library and are shared
+    other = DuaaRecord("b", "".join(["morn", "ing"]), "".join(["Mus", "lim"]))
+    assert other.category is record.category
+    assert other.source is record.source
+    assert other.category is sys.intern("morning")
+
+
+def test_legacy_string_array_loads(tmp_path):
+    path = tmp_path / "duaas.json"
+    path.write_text(json.dumps(["a", {"text": "b", "category": "evening"}, "c"]), encoding="utf-8")
+    store = DuaaStore(str(path))
+    assert list(store) == ["a", "b", "c"]
+    assert store.record(store.id_at(0)) == DuaaRecord("a")
+    assert store.categories() == {"evening": 1}
+
+    # Entries without metadata are written back as plain strings
+    store.add("d", category="morning")
+    store.compact()
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == ["a", {"text": "b", "category": "evening"}, "c",
+                                {"text": "d", "category": "morning"}]
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def store(request, tmp_path):
+    defaults = [{"text": "m1", "category": "morning"}, {"text": "e1", "category": "evening"},
+                "plain", {"text": "m2", "category": "morning"}]
+    if request.param == "json":
+        store = DuaaStore(str(tmp_path / "duaas.json"), defaults=defaults)
+    else:
+        store = SQLiteDuaaStore(str(tmp_path / "duaas.db"), None, defaults=defaults)
+    yield store
+    store.close()
+
+
+def texts(store, category):
+    return [store.get(duaa_id) for duaa_id in store.ids(category)]
+
+
+def test_category_index_after_add_and_delete(store):
+    assert store.categories() == {"morning": 2, "evening": 1}
+    assert texts(store, "morning") == ["m1", "m2"]
+
+    store.add("m3", category="morning")
+    store.add_records([{"text": "n1", "category": "night"}])
+    assert store.count("morning") == 3
+    assert texts(store, "night") == ["n1"]
+
+    morning = store.ids("morning")
+    store.delete(morning[0])
+    store.delete_many([morning[2], store.ids("evening")[0]])
+    assert store.categories() == {"morning": 1, "night": 1}
+    assert texts(store, "morning") == ["m2"]
+    assert store.ids("evening") == []
+    assert store.count("evening") == 0
+    assert list(store) == ["plain", "m2", "n1"]
+
+
+def test_category_index_after_recategorise(store):
+    m1, e1, plain, m2 = store.ids()
+    store.set_category(m2, "evening")
+    store.set_category(plain, "morning")
+    store.set_category(e1, None)
+    assert store.categories() == {"morning": 2, "evening": 1}
+    # Categories list their duaas in collection order
+    assert texts(store, "morning") == ["m1", "plain"]
+    assert texts(store, "evening") == ["m2"]
+    assert store.record(plain).category == "morning"
+    assert store.record(e1).category is None
+
+    changes = store.changes
+    store.set_category(m1, "morning")
+    assert store.changes == changes
+    with pytest.raises((KeyError, ValueError)):
+        store.set_category(999, "morning")
+
+
+def test_recategorise_is_logged(tmp_path):
+    path = str(tmp_path / "duaas.json")
+    store = DuaaStore(path, defaults=["a", {"text": "b", "category": "evening"}])
+    a, b = store.ids()
+    store.set_category(a, "morning")
+    store.set_category(b, None)
+    assert os.path.exists(store.log_path)
+
+    reloaded = DuaaStore(path)
+    assert reloaded.categories() == {"morning": 1}
+    assert [record.category for record in reloaded.records()] == ["morning", None]
+
+
+def test_category_view_follows_the_store(store):
+    view = CategoryView(store, "morning")
+    assert len(view) == 2
+    assert [view[0], view[1]] == ["m1", "m2"]
+
+    duaa_id = store.add("m3", category="morning")
+    assert view.ids()[-1] == duaa_id
+    assert view[2] == "m3"
+    store.set_category(store.ids()[0], "evening")
+    assert [view[i] for i in range(len(view))] == ["m2", "m3"]
+    assert view.changes == store.changes
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX permissions")
+def test_atomic_write_keeps_permissions(tmp_path):
+    path = str(tmp_path / "duaas.json")
+    umask = os.umask(0o022)
+    try:
+        atomic_write_bytes(path, b"[]")
+        # A new file gets the umask default, not mkstemp's 0600
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+
+        os.chmod(path, 0o640)
+        store = DuaaStore(path)
+        store.add("a")
+        store.compact()
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+    finally:
+        os.umask(umask)
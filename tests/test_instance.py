@@ -0,0 +1,50 @@
+"""Tests for the single-instance lock file"""
+
+import os
+import stat
+import sys
+
+import pytest
+
+from instance import SingleInstance, read_lock
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX permissions")
+def test_lock_file_is_private(tmp_path):
+    instance = SingleInstance(str(tmp_path / "app.lock"))
+    assert instance.acquire()
+    try:
+        assert stat.S_IMODE(os.stat(instance.path).st_mode) == 0o600
+    finally:
+        instance.close()
+
+
+def test_stale_lock_is_taken_over(tmp_path):
+    path = str(tmp_path / "app.lock")
+    crashed = SingleInstance(path)
+    assert crashed.acquire()
+    # Crash: the socket is gone, the lock file stays
+    crashed._server.close()
+
+    instance = SingleInstance(path)
+    assert instance.acquire()
+    assert read_lock(path)["token"] == instance.token
+    assert not SingleInstance(path).acquire()
+    instance.close()
+
+
+def test_takeover_keeps_a_lock_created_meanwhile(tmp_path):
+    path = str(tmp_path / "app.lock")
+    crashed = SingleInstance(path)
+    assert crashed.acquire()
+    crashed._server.close()
+    stale = read_lock(path)
+
+    # A first launch takes over, a second one acts on what it read before
+    first = SingleInstance(path)
+    assert first.acquire()
+    late = SingleInstance(path)
+    assert not late._remove_stale(stale)
+    assert read_lock(path)["token"] == first.token
+    assert os.listdir(str(tmp_path)) == ["app.lock"]
+    first.close()
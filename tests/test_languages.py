@@ -0,0 +1,103 @@
+"""Tests for the compiled translation catalogs"""
+
+import json
+
+import pytest
+
+import languages
+from languages import ENGLISH, LANGUAGES, Template, _compile_text, get_text, is_rtl, language_names
+
+
+def legacy_get_text(language, key, **kwargs):
+    """get_text before catalogs were compiled, the reference behaviour"""
+    if language not in LANGUAGES:
+        language = "English"
+    text = LANGUAGES[language].get(key, LANGUAGES["English"].get(key, key))
+    if kwargs:
+        try:
+            return text.format(**kwargs)
+        except (KeyError, ValueError):
+            return text
+    return text
+
+
+@pytest.fixture(autouse=True)
+def fresh_catalogs(monkeypatch, tmp_path):
+    """Compile catalogs from scratch and look for extra languages in tmp_path"""
+    monkeypatch.setattr(languages, "_catalogs", {})
+    monkeypatch.setattr(languages, "_external_files", None)
+    monkeypatch.setattr(languages, "LANGUAGES_DIR", str(tmp_path))
+    monkeypatch.setattr(languages, "LANGUAGES", dict(LANGUAGES))
+    monkeypatch.setattr(languages, "RTL_LANGUAGES", set(languages.RTL_LANGUAGES))
+
+
+KWARGS = [
+    {},
+    {"time": "00:05:00"},
+    {"added": 3, "duplicates": 1, "invalid": 0},
+    {"similarity": 92, "text": "سبحان الله"},
+    {"error": "{not a field}", "count": 7},
+    {"unrelated": 1},
+]
+
+
+@pytest.mark.parametrize("language", ["English", "العربية", "Klingon"])
+def test_matches_legacy_lookup(language):
+    for key in ENGLISH:
+        for kwargs in KWARGS:
+            assert get_text(language, key, **kwargs) == legacy_get_text(language, key, **kwargs), (key, kwargs)
+
+
+def test_missing_entries_fall_back_to_english_then_key(monkeypatch):
+    partial = {"app_title": "Rappel", "status_active": "Actif - {time}"}
+    monkeypatch.setitem(languages.LANGUAGES, "Français", partial)
+    assert get_text("Français", "app_title") == "Rappel"
+    assert get_text("Français", "status_active", time="5 min") == "Actif - 5 min"
+    assert get_text("Français", "exit") == ENGLISH["exit"]
+    assert get_text("Français", "no_such_key") == "no_such_key"
+    assert get_text("Klingon", "exit") == ENGLISH["exit"]
+    assert get_text("Klingon", "no_such_key", time=1) == "no_such_key"
+
+
+def test_missing_field_returns_raw_text():
+    assert get_text("English", "status_active") == ENGLISH["status_active"]
+    assert get_text("English", "import_done", added=1) == ENGLISH["import_done"]
+
+
+def test_template_parsing():
+    assert _compile_text("plain") == "plain"
+
+    single = _compile_text("Next in {time}!")
+    assert isinstance(single, Template)
+    assert single.field == "time"
+    assert single.render({"time": 5}) == "Next in 5!"
+
+    several = _compile_text("{a} and {b}")
+    assert several.field is None
+    assert several.render({"a": 1, "b": "x"}) == "1 and x"
+    assert several.render({"a": 1}) == "{a} and {b}"
+
+    # Escaped braces, format specs and positional fields go through str.format
+    assert _compile_text("{{literal}} {n}").render({"n": 2}) == "{literal} 2"
+    assert _compile_text("{n:>3}").render({"n": 7}) == "  7"
+    assert _compile_text("{0}").render({"n": 7}) == "{0}"
+    # A malformed format string stays plain text
+    assert _compile_text("broken {") == "broken {"
+
+
+def test_external_language_file(tmp_path):
+    (tmp_path / "Deutsch.json").write_text(json.dumps({"exit": "Beenden", "status_active": "Aktiv - {time}"}),
+                                           encoding="utf-8")
+    (tmp_path / "עברית.json").write_text(json.dumps({"_rtl": True, "exit": "יציאה"}), encoding="utf-8")
+    (tmp_path / "Broken.json").write_text("{", encoding="utf-8")
+
+    assert language_names()[:2] == ["English", "العربية"]
+    assert set(language_names()) == {"English", "العربية", "Broken", "Deutsch", "עברית"}
+    assert get_text("Deutsch", "exit") == "Beenden"
+    assert get_text("Deutsch", "status_active", time="1h") == "Aktiv - 1h"
+    assert get_text("Deutsch", "show") == ENGLISH["show"]
+    assert is_rtl("עברית")
+    assert get_text("עברית", "_rtl") == "_rtl"
+    assert not is_rtl("Deutsch")
+    # A file that cannot be read falls back to English
+    assert get_text("Broken", "exit") == ENGLISH["exit"]
@@ -0,0 +1,167 @@
+"""
+Reference-value tests for the prayer time calculation.
+
+Each method and asr convention is compared with times worked out
+independently from the NOAA solar position equations, iterated at the
+time of each event, and with a published timetable.
+"""
+
+import math
+from datetime import date
+
+import pytest
+
+from prayer_times import PrayerTimes
+
+# Largest accepted difference, in minutes
+TOLERANCE = 2.0
+
+# The published definitions of each method: fajr and isha twilight angles,
+# or isha a fixed time after maghrib
+ANGLES = {
+    "MWL": {"fajr": 18.0, "isha": 17.0},
+    "UmmAlQura": {"fajr": 18.5, "isha_minutes": 90},
+    "Egyptian": {"fajr": 19.5, "isha": 17.5},
+    "ISNA": {"fajr": 15.0, "isha": 15.0},
+}
+
+# (name, latitude, longitude, date, UTC offset)
+MAKKAH = ("Makkah", 21.4225, 39.8262, date(2024, 6, 21), 3)
+CAIRO = ("Cairo", 30.0444, 31.2357, date(2024, 3, 15), 2)
+NEW_YORK = ("New York", 40.7128, -74.0060, date(2024, 10, 1), -4)
+LONDON_WINTER = ("London", 51.5074, -0.1278, date(2024, 12, 21), 0)
+LONDON_SUMMER = ("London", 51.5074, -0.1278, date(2024, 6, 21), 1)
+
+
+def _sin(d):
+    return math.sin(math.radians(d))
+
+
+def _cos(d):
+    return math.cos(math.radians(d))
+
+
+def sun(jd):
+    """Declination (degrees) and equation of time (minutes), NOAA equations"""
+    t = (jd - 2451545.0) / 36525
+    mean_longitude = (280.46646 + t * (36000.76983 + t * 0.0003032)) % 360
+    anomaly = 357.52911 + t * (35999.05029 - 0.0001537 * t)
+    eccentricity = 0.016708634 - t * (0.000042037 + 0.0000001267 * t)
+    centre = (_sin(anomaly) * (1.914602 - t * (0.004817 + 0.000014 * t))
+              + _sin(2 * anomaly) * (0.019993 - 0.000101 * t) + _sin(3 * anomaly) * 0.000289)
+    omega = 125.04 - 1934.136 * t
+    longitude = mean_longitude + centre - 0.00569 - 0.00478 * _sin(omega)
+    obliquity = (23 + (26 + (21.448 - t * (46.815 + t * (0.00059 - t * 0.001813))) / 60) / 60
+                 + 0.00256 * _cos(omega))
+    declination = math.degrees(math.asin(_sin(obliquity) * _sin(longitude)))
+    y = math.tan(math.radians(obliquity / 2)) ** 2
+    equation = 4 * math.degrees(
+        y * _sin(2 * mean_longitude) - 2 * eccentricity * _sin(anomaly)
+        + 4 * eccentricity * y * _sin(anomaly) * _cos(2 * mean_longitude)
+        - 0.5 * y * y * _sin(4 * mean_longitude) - 1.25 * eccentricity ** 2 * _sin(2 * anomaly))
+    return declination, equation
+
+
+def reference(latitude, longitude, day, utc_offset, angle=None, direction=0, asr_factor=None, estimate=12.0):
+    """
+    Local time (hours) of one event, None if the sun never reaches the angle.
+
+    angle is in degrees below the horizon; direction is -1 before noon, 1
+    after it and 0 for noon itself. asr_factor replaces angle for asr.
+    """
+    midnight = date.toordinal(day) + 1721424.5  # Julian day at 0h UT
+    when = estimate
+    for _ in range(4):
+        declination, equation = sun(midnight + (when - utc_offset) / 24)
+        noon = 12 - longitude / 15 - equation / 60 + utc_offset
+        if direction == 0:
+            return noon
+        if asr_factor is not None:
+            altitude = math.degrees(math.atan(1 / (asr_factor + math.tan(math.radians(abs(latitude - declination))))))
+            angle = -altitude
+        cosine = (-_sin(angle) - _sin(latitude) * _sin(declination)) / (_cos(latitude) * _cos(declination))
+        if not -1 <= cosine <= 1:
+            return None
+        when = noon + direction * math.degrees(math.acos(cosine)) / 15
+    return when
+
+
+def reference_times(place, method, asr):
+    name, latitude, longitude, day, utc_offset = place
+    angles = ANGLES[method]
+    times = {
+        "fajr": reference(latitude, longitude, day, utc_offset, angles["fajr"], -1, estimate=5),
+        "sunrise": reference(latitude, longitude, day, utc_offset, 0.833, -1, estimate=6),
+        "dhuhr": reference(latitude, longitude, day, utc_offset),
+        "asr": reference(latitude, longitude, day, utc_offset, direction=1,
+                         asr_factor=2 if asr == "hanafi" else 1, estimate=15),
+        "maghrib": reference(latitude, longitude, day, utc_offset, 0.833, 1, estimate=18),
+    }
+    if "isha_minutes" in angles:
+        times["isha"] = times["maghrib"] + angles["isha_minutes"] / 60
+    else:
+        times["isha"] = reference(latitude, longitude, day, utc_offset, angles["isha"], 1, estimate=20)
+    return times
+
+
+def minutes_apart(first, second):
+    return abs((first - second + 12) % 24 - 12) * 60
+
+
+@pytest.mark.parametrize("asr", ["standard", "hanafi"])
+@pytest.mark.parametrize("method, place", [
+    ("MWL", LONDON_WINTER),
+    ("MWL", MAKKAH),
+    ("UmmAlQura", MAKKAH),
+    ("Egyptian", CAIRO),
+    ("ISNA", NEW_YORK),
+])
+def test_times_match_reference(method, place, asr):
+    name, latitude, longitude, day, utc_offset = place
+    times = PrayerTimes(latitude, longitude, method=method, asr=asr).hours(day, utc_offset)
+    for prayer, expected in reference_times(place, method, asr).items():
+        assert expected is not None
+        assert minutes_apart(times[prayer], expected) <= TOLERANCE, (name, method, asr, prayer)
+
+
+def test_hanafi_asr_is_later():
+    name, latitude, longitude, day, utc_offset = CAIRO
+    standard = PrayerTimes(latitude, longitude, asr="standard").hours(day, utc_offset)["asr"]
+    hanafi = PrayerTimes(latitude, longitude, asr="hanafi").hours(day, utc_offset)["asr"]
+    # About an hour later in Cairo in March
+    assert 0.75 < hanafi - standard < 1.5
+
+
+def test_umm_al_qura_timetable():
+    # Published Umm al-Qura timetable for Makkah, 21 June 2024
+    published = {"fajr": "04:12", "sunrise": "05:39", "dhuhr": "12:22",
+                 "asr": "15:42", "maghrib": "19:06", "isha": "20:36"}
+    name, latitude, longitude, day, utc_offset = MAKKAH
+    times = PrayerTimes(latitude, longitude, method="UmmAlQura").hours(day, utc_offset)
+    for prayer, expected in published.items():
+        hours, minutes = map(int, expected.split(":"))
+        assert minutes_apart(times[prayer], hours + minutes / 60) <= TOLERANCE, prayer
+
+
+@pytest.mark.parametrize("method", ["MWL", "Egyptian"])
+def test_high_latitude_night_portion(method):
+    # The sun stays above -16 degrees in London at midsummer, so fajr and
+    # isha come from the night portion rule
+    name, latitude, longitude, day, utc_offset = LONDON_SUMMER
+    angles = ANGLES[method]
+    assert reference(latitude, longitude, day, utc_offset, angles["fajr"], -1, estimate=3) is None
+
+    times = PrayerTimes(latitude, longitude, method=method).hours(day, utc_offset)
+    expected = reference_times(LONDON_SUMMER, "MWL", "standard")
+    assert minutes_apart(times["sunrise"], expected["sunrise"]) <= TOLERANCE
+    assert minutes_apart(times["maghrib"], expected["maghrib"]) <= TOLERANCE
+
+    night = 24 - (expected["maghrib"] - expected["sunrise"])
+    assert minutes_apart(times["fajr"], expected["sunrise"] - angles["fajr"] / 60 * night) <= TOLERANCE
+    assert minutes_apart(times["isha"], expected["maghrib"] + angles["isha"] / 60 * night) <= TOLERANCE
+
+
+def test_polar_day_has_no_sunrise():
+    times = PrayerTimes(78.2232, 15.6267).hours(date(2024, 6, 21), 2)
+    assert times["sunrise"] is None and times["maghrib"] is None
+    assert times["dhuhr"] is not None
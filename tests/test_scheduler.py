@@ -0,0 +1,230 @@
+"""Tests for the reminder scheduler's handling of clock jumps and suspend"""
+
+from datetime import datetime
+
+import pytest
+
+from scheduler import ReminderScheduler, RuleSchedule, ScheduleRule
+
+MINUTE = 60
+
+# 09:00 local time on a Monday
+NINE = datetime(2024, 1, 1, 9, 0).timestamp()
+
+
+class FakeTime:
+    """
+    Injected wall clock, suspend-aware monotonic clock and timer backend.
+
+    Timers run on their own clock, which stops while suspended like the
+    monotonic clocks event loops use.
+    """
+
+    def __init__(self, wall):
+        self.wall = wall
+        self.boot = 1000.0
+        self.timer_time = 0.0
+        self.pending = []
+
+    def call_later(self, delay, callback):
+        handle = object()
+        self.pending.append((self.timer_time + delay, handle, callback))
+        return handle
+
+    def cancel(self, handle):
+        self.pending = [entry for entry in self.pending if entry[1] is not handle]
+
+    def run(self, seconds):
+        """Let seconds pass, firing timers as they fall due"""
+        end = self.timer_time + seconds
+        while True:
+            due = [entry for entry in self.pending if entry[0] <= end]
+            if not due:
+                break
+            entry = min(due, key=lambda entry: entry[0])
+            self.pending.remove(entry)
+            self._advance(entry[0] - self.timer_time)
+            entry[2]()
+        self._advance(end - self.timer_time)
+
+    def jump(self, seconds):
+        """Move the wall clock only (NTP or a manual change)"""
+        self.wall += seconds
+
+    def suspend(self, seconds):
+        """Sleep: wall and boot time move on, timers do not"""
+        self.wall += seconds
+        self.boot += seconds
+
+    def _advance(self, seconds):
+        self.wall += seconds
+        self.boot += seconds
+        self.timer_time += seconds
+
+
+def interval_scheduler(fake, catch_up, fired):
+    scheduler = ReminderScheduler(fake, lambda: fired.append((fake.wall, scheduler.missed)),
+                                  interval=10, clock=lambda: fake.wall,
+                                  monotonic=lambda: fake.boot, catch_up=catch_up)
+    scheduler.start()
+    return scheduler
+
+
+def rule_scheduler(fake, catch_up, fired):
+    schedule = RuleSchedule([ScheduleRule("09:00", "17:00", every=10)])
+    scheduler = ReminderScheduler(fake, lambda: fired.append((fake.wall, scheduler.missed)),
+                                  clock=lambda: fake.wall, schedule=schedule,
+                                  monotonic=lambda: fake.boot, catch_up=catch_up)
+    scheduler.start()
+    return scheduler
+
+
+@pytest.mark.parametrize("catch_up", ["skip", "fire_once", "coalesce"])
+def test_interval_ignores_backward_jump(catch_up):
+    fake = FakeTime(NINE)
+    fired = []
+    interval_scheduler(fake, catch_up, fired)
+    fake.run(5 * MINUTE)
+    fake.jump(-60 * MINUTE)
+    fake.run(5 * MINUTE - 1)
+    assert fired == []
+    fake.run(1)
+    # Due ten minutes after the start by the monotonic clock, not an hour later
+    assert fired == [(NINE - 50 * MINUTE, 1)]
+
+
+@pytest.mark.parametrize("catch_up", ["skip", "fire_once", "coalesce"])
+def test_interval_ignores_forward_jump(catch_up):
+    fake = FakeTime(NINE)
+    fired = []
+    scheduler = interval_scheduler(fake, catch_up, fired)
+    fake.run(5 * MINUTE)
+    fake.jump(60 * MINUTE)
+    fake.run(5 * MINUTE - 1)
+    assert fired == []
+    fake.run(1)
+    # Not counted as missed reminders
+    assert fired == [(NINE + 70 * MINUTE, 1)]
+    assert scheduler.skipped == 0
+
+
+def test_interval_suspend_skip():
+    fake = FakeTime(NINE)
+    fired = []
+    scheduler = interval_scheduler(fake, "skip", fired)
+    fake.run(5 * MINUTE)
+    fake.suspend(35 * MINUTE)
+    fake.run(10 * MINUTE)
+    # 09:10 .. 09:40 were missed; the next reminder keeps the 10 minute grid
+    assert scheduler.skipped == 4
+    assert fired == [(NINE + 50 * MINUTE, 1)]
+
+
+def test_interval_suspend_fire_once():
+    fake = FakeTime(NINE)
+    fired = []
+    interval_scheduler(fake, "fire_once", fired)
+    fake.run(5 * MINUTE)
+    fake.suspend(35 * MINUTE)
+    fake.run(5 * MINUTE)
+    assert len(fired) == 1
+    woke = fired[0][0]
+    assert NINE + 40 * MINUTE <= woke <= NINE + 45 * MINUTE
+    # The countdown restarts from the catch-up reminder
+    fake.run(15 * MINUTE)
+    assert [when for when, missed in fired] == [woke, woke + 10 * MINUTE]
+
+
+def test_interval_suspend_coalesce():
+    fake = FakeTime(NINE)
+    fired = []
+    interval_scheduler(fake, "coalesce", fired)
+    fake.run(5 * MINUTE)
+    fake.suspend(35 * MINUTE)
+    fake.run(5 * MINUTE)
+    # One reminder standing for 09:10, 09:20, 09:30 and 09:40
+    assert len(fired) == 1 and fired[0][1] == 4
+    fake.run(10 * MINUTE)
+    assert fired[1] == (NINE + 50 * MINUTE, 1)
+
+
+@pytest.mark.parametrize("catch_up", ["skip", "fire_once", "coalesce"])
+def test_rules_backward_jump_does_not_repeat(catch_up):
+    fake = FakeTime(NINE + MINUTE)
+    fired = []
+    scheduler = rule_scheduler(fake, catch_up, fired)
+    fake.run(4 * MINUTE)
+    fake.jump(-60 * MINUTE)
+    # 08:05 now: nothing fires until 09:10 comes round again
+    fake.run(65 * MINUTE - 1)
+    assert fired == []
+    fake.run(1)
+    assert fired == [(NINE + 10 * MINUTE, 1)]
+    assert scheduler.skipped == 0
+
+
+@pytest.mark.parametrize("move", ["jump", "suspend"])
+@pytest.mark.parametrize("catch_up", ["skip", "fire_once", "coalesce"])
+def test_rules_forward_jump_and_suspend(catch_up, move):
+    fake = FakeTime(NINE + MINUTE)
+    fired = []
+    scheduler = rule_scheduler(fake, catch_up, fired)
+    fake.run(4 * MINUTE)
+    getattr(fake, move)(60 * MINUTE)
+    # 10:05 now: 09:10 .. 10:00 were jumped over
+    fake.run(5 * MINUTE)
+    if catch_up == "skip":
+        assert scheduler.skipped == 6
+        assert fired == [(NINE + 70 * MINUTE, 1)]
+    else:
+        assert len(fired) == 2
+        when, missed = fired[0]
+        assert NINE + 65 * MINUTE <= when < NINE + 70 * MINUTE
+        # The catch-up reminder stands for the six missed times
+        assert missed == 6
+        # Back on the schedule straight away
+        assert fired[1] == (NINE + 70 * MINUTE, 1)
+
+
+class LaterSchedule(RuleSchedule):
+    """Nothing can be scheduled before `start`, like prayer times that are not known yet"""
+
+    def __init__(self, rules, start):
+        super().__init__(rules)
+        self.start = start
+
+    def next_after(self, timestamp):
+        if timestamp < self.start:
+            return None, None
+        return super().next_after(timestamp)
+
+
+def test_empty_schedule_is_checked_again():
+    fake = FakeTime(NINE)
+    fired = []
+    changes = []
+    schedule = LaterSchedule([ScheduleRule("09:00", "17:00", every=10)], NINE + 60 * MINUTE)
+    scheduler = ReminderScheduler(fake, lambda: fired.append(fake.wall), clock=lambda: fake.wall,
+                                  schedule=schedule, monotonic=lambda: fake.boot)
+    scheduler.add_listener(lambda: changes.append(scheduler.next_due))
+    scheduler.start()
+    assert scheduler.next_due is None
+    assert scheduler.remaining() is None
+    # Not idle forever: a re-check is armed max_sleep away
+    assert [entry[0] for entry in fake.pending] == [scheduler.max_sleep]
+
+    fake.run(55 * MINUTE)
+    assert scheduler.next_due is None
+    assert len(fake.pending) == 1
+    # The 10:00 re-check finds 10:10
+    fake.run(5 * MINUTE)
+    assert scheduler.next_due == NINE + 70 * MINUTE
+    assert changes[-1] == NINE + 70 * MINUTE
+    fake.run(10 * MINUTE)
+    assert fired == [NINE + 70 * MINUTE]
+
+    # A paused scheduler stops re-checking
+    scheduler.set_schedule(LaterSchedule([], 0))
+    assert len(fake.pending) == 1
+    scheduler.pause()
+    assert fake.pending == []
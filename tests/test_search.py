@@ -0,0 +1,121 @@
+"""Tests for the duaa search index"""
+
+from search import DuaaSearchIndex, SearchResults, tokenize
+
+DUAAS = [
+    (0, "سُبْحَانَ اللَّهِ وَبِحَمْدِهِ"),
+    (1, "أَسْتَغْفِرُ اللَّهَ وَأَتُوبُ إِلَيْهِ"),
+    (2, "اللَّهُمَّ صَلِّ عَلَى مُحَمَّدٍ"),
+    (3, "رَبَّنَا آتِنَا فِي الدُّنْيَا حَسَنَةً"),
+    (4, "Glory be to Allah"),
+]
+
+
+def built():
+    index = DuaaSearchIndex()
+    index.build(DUAAS)
+    return index
+
+
+def test_tokenize_strips_tashkeel_and_tatweel():
+    assert tokenize("سُبْحَـــانَ اللَّهِ") == ["سبحان", "الله"]
+
+
+def test_search_ignores_tashkeel():
+    assert built().search("سبحان الله") == [0]
+
+
+def test_search_folds_alef_hamza_and_ta_marbuta():
+    index = built()
+    # أستغفر typed with a bare alef
+    assert index.search("استغفر") == [1]
+    # آتنا typed with a bare alef, حسنة with ha for ta marbuta
+    assert index.search("اتنا حسنه") == [3]
+    # على typed with ya for alef maqsura
+    assert index.search("علي") == [2]
+
+
+def test_search_is_case_insensitive_for_latin():
+    assert built().search("GLORY allah") == [4]
+
+
+def test_last_word_matches_as_prefix():
+    index = built()
+    assert index.search("استغ") == [1]
+    assert index.search("ال") == [0, 1, 2, 3]
+    # Only the last word may be a prefix
+    assert index.search("ال سبحان") == []
+
+
+def test_all_words_must_match():
+    index = built()
+    # The last word is a prefix, so it also finds اللهم
+    assert index.search("الله") == [0, 1, 2]
+    assert index.search("الله وبحمده") == [0]
+    # Earlier words match whole words only
+    assert index.search("الله محمد") == []
+    assert index.search("اللهم محمد") == [2]
+
+
+def test_empty_query_finds_nothing():
+    assert built().search("  ") == []
+
+
+def test_add_makes_duaa_searchable():
+    index = built()
+    index.add(5, "لَا إِلَهَ إِلَّا اللَّهُ")
+    assert len(index) == 6
+    assert index.search("اله") == [5]
+    assert index.search("الله") == [0, 1, 2, 5]
+
+
+def test_remove_drops_duaa_and_unused_words():
+    index = built()
+    index.remove(0)
+    assert len(index) == 4
+    assert index.search("سبحان") == []
+    assert index.search("الله") == [1, 2]
+    # Prefix lookups don't see words only the removed duaa had
+    assert index.search("سب") == []
+    # Removing an unknown id is harmless
+    index.remove(42)
+    assert len(index) == 4
+
+
+def test_add_same_id_replaces_old_words():
+    index = built()
+    index.add(0, "الْحَمْدُ لِلَّهِ")
+    assert index.search("سبحان") == []
+    assert index.search("الحمد") == [0]
+    assert index.search("الله وبحمده") == []
+    assert index.search("الله") == [1, 2]
+
+
+def test_incremental_updates_match_a_fresh_build():
+    index = built()
+    index.remove(1)
+    index.add(6, "حَسْبِيَ اللَّهُ")
+    index.add(2, "اللَّهُمَّ اغْفِرْ لِي")
+
+    fresh = DuaaSearchIndex()
+    fresh.build([(0, DUAAS[0][1]), (2, "اللَّهُمَّ اغْفِرْ لِي"), (3, DUAAS[3][1]),
+                 (4, DUAAS[4][1]), (6, "حَسْبِيَ اللَّهُ")])
+    assert index._postings == fresh._postings
+    assert index._vocabulary == fresh._vocabulary
+    for query in ["الله", "ال", "اللهم", "حسب", "محمد", "استغفر"]:
+        assert index.search(query) == fresh.search(query)
+
+
+class ListStore:
+    def __init__(self, texts):
+        self.texts = texts
+
+    def get(self, duaa_id):
+        return self.texts[duaa_id]
+
+
+def test_search_results_pages_matching_duaas():
+    index = built()
+    results = SearchResults(ListStore(dict(DUAAS)), index.search("الله"))
+    assert len(results) == 3
+    assert results.page(1, 10) == [(1, DUAAS[1][1]), (2, DUAAS[2][1])]
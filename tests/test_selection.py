@@ -0,0 +1,120 @@
+"""Tests for the duaa selection policies"""
+
+import pytest
+
+from duaa_store import DuaaStore
+from engine import ReminderEngine, SettingsStore
+from selection import ShuffleBagSelection, SpacedRepetitionSelection, WeightedSelection
+
+
+class ManualTimer:
+    """Timer backend that never fires on its own"""
+
+    def call_later(self, delay, callback):
+        return None
+
+    def cancel(self, handle):
+        pass
+
+
+def test_weighted_pick_never_skips_a_reminder(tmp_path):
+    store = DuaaStore(str(tmp_path / "duaas.json"), defaults=["a", "b"])
+    for weights in ({}, {store.id_at(0): 50}):
+        selection = WeightedSelection(weights, seed=1)
+        picks = [selection.pick(store) for _ in range(2000)]
+        assert None not in picks
+        assert all(first != second for first, second in zip(picks, picks[1:]))
+
+
+def test_weighted_state_follows_the_text_across_restarts(tmp_path):
+    path = str(tmp_path / "duaas.json")
+    store = DuaaStore(path, defaults=["a", "b", "c"])
+    selection = WeightedSelection(seed=1)
+    selection.set_weight(store.id_at(2), 5.0)
+    store.delete(store.id_at(0))
+    state = selection.state(store)
+
+    # The store numbers its duaas afresh on load
+    store = DuaaStore(path)
+    restored = WeightedSelection(seed=1)
+    restored.restore(state, store)
+    assert {store.get(duaa_id): weight for duaa_id, weight in restored.weights.items()} == {"c": 5.0}
+
+
+def test_spaced_boxes_follow_the_text_across_restarts(tmp_path):
+    path = str(tmp_path / "duaas.json")
+    store = DuaaStore(path, defaults=["a", "b", "c", "d"])
+    selection = SpacedRepetitionSelection(seed=1)
+    for _ in range(3):
+        selection.pick(store)
+    store.delete(store.id_at(0))
+    expected = [[store.get(duaa_id) for duaa_id in box if duaa_id in store.ids()] for box in selection.boxes]
+    state = selection.state(store)
+
+    store = DuaaStore(path)
+    restored = SpacedRepetitionSelection(seed=1)
+    restored.restore(state, store)
+    assert [[store.get(duaa_id) for duaa_id in box] for box in restored.boxes] == expected
+
+
+def test_shuffle_round_survives_edits_and_restart(tmp_path):
+    path = str(tmp_path / "duaas.json")
+    store = DuaaStore(path, defaults=[f"duaa {i}" for i in range(20)])
+    selection = ShuffleBagSelection(seed=3)
+    shown = [selection.pick(store) for _ in range(8)]
+    store.add("new duaa")
+    undrawn = [store.get(duaa_id) for duaa_id in selection._bag[selection.position:]]
+    store.delete(selection._bag[-1])
+    state = selection.state(store)
+
+    store = DuaaStore(path)
+    restored = ShuffleBagSelection(seed=3)
+    restored.restore(state, store)
+    rest = [restored.pick(store) for _ in range(len(undrawn) - 1)]
+    # The rest of the round: every undrawn duaa but the deleted one, no repeats
+    assert sorted(rest) == sorted(undrawn[:-1])
+    assert not set(rest) & set(shown)
+    assert restored.round == 0
+
+
+def test_weighted_and_spaced_notice_an_add_and_delete_of_the_same_size(tmp_path):
+    store = DuaaStore(str(tmp_path / "duaas.json"), defaults=["a", "b", "c"])
+    weighted = WeightedSelection(seed=1)
+    spaced = SpacedRepetitionSelection(seed=1)
+    weighted.pick(store)
+    spaced.pick(store)
+
+    store.delete(store.id_at(0))
+    store.add("new")
+    assert "new" in {weighted.pick(store) for _ in range(200)}
+    assert "new" in {spaced.pick(store) for _ in range(20)}
+
+
+def make_engine(tmp_path, policy):
+    settings = SettingsStore(str(tmp_path / "settings.json"))
+    settings["selection"] = policy
+    store = DuaaStore(str(tmp_path / "duaas.json"), defaults=["a", "b", "c", "d"])
+    return ReminderEngine(ManualTimer(), lambda duaa: None, settings=settings, store=store,
+                          selection_file=str(tmp_path / "state.json"))
+
+
+def test_engine_weights_the_last_shown_duaa(tmp_path):
+    engine = make_engine(tmp_path, "weighted")
+    shown = engine.next_duaa()
+    duaa_id = engine.set_weight(0)
+    assert engine.store.get(duaa_id) == shown
+    assert shown not in {engine.next_duaa() for _ in range(200)}
+
+    # Kept across a restart
+    engine = make_engine(tmp_path, "weighted")
+    assert shown not in {engine.next_duaa() for _ in range(200)}
+
+
+def test_engine_review_again(tmp_path):
+    engine = make_engine(tmp_path, "spaced")
+    for _ in range(8):
+        engine.next_duaa()
+    duaa_id = engine.review_again(engine.store.id_at(2))
+    assert duaa_id in engine.selection.boxes[0]
+    with pytest.raises(ValueError):
+        engine.set_weight(2.0)
@@ -0,0 +1,48 @@
+"""Tests for the system theme sources"""
+
+import os
+import sys
+import threading
+
+import pytest
+
+from theme import CachedThemeSource, GSettingsThemeSource
+
+
+@pytest.fixture
+def fake_gsettings(tmp_path, monkeypatch):
+    """Put a gsettings on PATH whose monitor reports one change, then blocks"""
+    script = tmp_path / "gsettings"
+    script.write_text("#!/bin/sh\n"
+                      "echo \"color-scheme: 'prefer-dark'\"\n"
+                      "exec sleep 60\n")
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ.get('PATH', '')}")
+    monkeypatch.delenv("GTK_THEME", raising=False)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="shell script stands in for gsettings")
+def test_close_stops_gsettings_monitor(fake_gsettings):
+    changed = threading.Event()
+    source = CachedThemeSource(GSettingsThemeSource())
+    assert source.watch(changed.set)
+    assert changed.wait(5)
+
+    process = source.source._process
+    assert process.poll() is None
+    source.close()
+    assert process.returncode is not None
+    assert source.source._process is None
+    # Closing twice is harmless
+    source.close()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="shell script stands in for gsettings")
+def test_watch_again_replaces_monitor(fake_gsettings):
+    source = GSettingsThemeSource()
+    assert source.watch(lambda: None)
+    first = source._process
+    assert source.watch(lambda: None)
+    assert first.returncode is not None
+    assert source._process is not first
+    source.close()
@@ -0,0 +1,395 @@
+"""
+Theme support for Athkar Reminder application.
+Detects the system light/dark mode through a pluggable source and pushes
+precomputed ttk style tables only when the mode actually changes.
+"""
+
+import os
+import subprocess
+import threading
+import time
+
+
+class ThemeSource:
+    """Base class for system theme sources"""
+
+    def is_dark(self):
+        """Return True if the system is in dark mode"""
+        return False
+
+    def watch(self, callback):
+        """
+        Call callback (from any thread) whenever the theme may have changed.
+
+        Returns:
+            bool: False if the source cannot notify and has to be polled
+        """
+        return False
+
+    def close(self):
+        """Stop watching for changes"""
+
+
+class StaticThemeSource(ThemeSource):
+    """Fixed theme source, used for tests and unsupported platforms"""
+
+    def __init__(self, dark=False):
+        self.dark = dark
+        self._callbacks = []
+
+    def is_dark(self):
+        return self.dark
+
+    def set_dark(self, dark):
+        """Change the mode and notify watchers"""
+        self.dark = dark
+        for callback in self._callbacks:
+            callback()
+
+    def watch(self, callback):
+        self._callbacks.append(callback)
+        return True
+
+
+class RegistryThemeSource(ThemeSource):
+    """Windows theme source reading the AppsUseLightTheme registry value"""
+
+    KEY_PATH = r"Software\Microsoft\Windows\CurrentVersion\Themes\Personalize"
+
+    def is_dark(self):
+        try:
+            import winreg
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, self.KEY_PATH) as key:
+                value, regtype = winreg.QueryValueEx(key, "AppsUseLightTheme")
+            return value == 0
+        except Exception:
+            return False
+
+    def watch(self, callback):
+        # RegNotifyChangeKeyValue blocks until the key changes
+        try:
+            import win32api
+            import win32con
+        except ImportError:
+            return False
+
+        def wait_for_changes():
+            try:
+                key = win32api.RegOpenKeyEx(win32con.HKEY_CURRENT_USER, self.KEY_PATH,
+                                            0, win32con.KEY_NOTIFY | win32con.KEY_READ)
+                while True:
+                    win32api.RegNotifyChangeKeyValue(key, False,
+                                                     win32con.REG_NOTIFY_CHANGE_LAST_SET,
+                                                     None, False)
+                    callback()
+            except Exception as e:
+                print(f"Error watching theme changes: {e}")
+
+        threading.Thread(target=wait_for_changes, daemon=True).start()
+        return True
+
+
+class GSettingsThemeSource(ThemeSource):
+    """Freedesktop theme source using gsettings, with a GTK_THEME override"""
+
+    SCHEMA = "org.gnome.desktop.interface"
+
+    def __init__(self):
+        self._process = None
+
+    def is_dark(self):
+        # An explicit GTK_THEME (e.g. "Adwaita:dark") wins over gsettings
+        gtk_theme = os.environ.get("GTK_THEME")
+        if gtk_theme:
+            return "dark" in gtk_theme.lower()
+        try:
+            scheme = subprocess.run(["gsettings", "get", self.SCHEMA, "color-scheme"],
+                                    capture_output=True, text=True, timeout=2).stdout
+            if "dark" in scheme:
+                return True
+            theme = subprocess.run(["gsettings", "get", self.SCHEMA, "gtk-theme"],
+                                   capture_output=True, text=True, timeout=2).stdout
+            return "dark" in theme.lower()
+        except Exception:
+            return False
+
+    def watch(self, callback):
+        if os.environ.get("GTK_THEME"):
+            # Fixed by the environment, nothing will change
+            return True
+        # Only one monitor per source, a new watch replaces the old one
+        self.close()
+        try:
+            process = subprocess.Popen(["gsettings", "monitor", self.SCHEMA],
+                                       stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                       text=True)
+        except Exception:
+            return False
+        self._process = process
+
+        def read_changes():
+            for line in process.stdout:
+                if line.startswith(("color-scheme", "gtk-theme")):
+                    callback()
+
+        threading.Thread(target=read_changes, daemon=True).start()
+        return True
+
+    def close(self):
+        """Terminate the gsettings monitor process"""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.terminate()
+            process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        except Exception as e:
+            print(f"Error stopping theme monitor: {e}")
+
+
+class CachedThemeSource(ThemeSource):
+    """
+    Memoizes another theme source for a limited time.
+
+    The main window and notification windows share one instance so the
+    system is only queried when the cached value expired or was invalidated.
+
+    Args:
+        source (ThemeSource): The source to cache
+        ttl (float): Seconds a looked-up value stays valid
+        clock: Function returning monotonic time in seconds
+    """
+
+    def __init__(self, source, ttl=15.0, clock=time.monotonic):
+        self.source = source
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._value = None
+        self._expires = 0.0
+        self._lock = threading.Lock()
+        self._invalidation_hooks = []
+
+    def is_dark(self):
+        with self._lock:
+            now = self.clock()
+            if self._value is not None and now < self._expires:
+                self.hits += 1
+                return self._value
+            self.misses += 1
+            self._value = self.source.is_dark()
+            self._expires = now + self.ttl
+            return self._value
+
+    def invalidate(self):
+        """Drop the cached value so the next lookup queries the system"""
+        with self._lock:
+            self._value = None
+        for hook in self._invalidation_hooks:
+            hook()
+
+    def add_invalidation_hook(self, hook):
+        """Call hook with no arguments after the cache was invalidated"""
+        self._invalidation_hooks.append(hook)
+
+    def stats(self):
+        """Return the cache hit/miss counters"""
+        return {"hits": self.hits, "misses": self.misses}
+
+    def watch(self, callback):
+        # A change notification invalidates the cache before it is forwarded
+        def on_change():
+            self.invalidate()
+            callback()
+
+        if self.source.watch(on_change):
+            return True
+        return False
+
+    def close(self):
+        self.source.close()
+
+
+def default_theme_source():
+    """Return the theme source for the current platform"""
+    from platforms import get_platform
+    return get_platform().theme_source()
+
+
+# Precomputed style tables for each mode: (style, options) pairs pushed
+# with style.configure and style.map
+STYLE_TABLES = {
+    "dark": {
+        "root_bg": "#1e1e1e",
+        "listbox": {"bg": "#2d2d2d", "fg": "#ffffff"},
+        "configure": [
+            ("TFrame", {"background": "#1e1e1e"}),
+            ("TLabel", {"background": "#1e1e1e", "foreground": "#ffffff"}),
+            ("TLabelframe", {"background": "#1e1e1e", "foreground": "#ffffff"}),
+            ("TLabelframe.Label", {"background": "#1e1e1e", "foreground": "#ffffff"}),
+            ("TButton", {"background": "#333333", "foreground": "#ffffff"}),
+            # Card frames in About tab
+            ("Card.TFrame", {"background": "#343a40"}),
+            # Special styles for About tab
+            ("About.TFrame", {"background": "#1e1e1e"}),
+            ("AboutCard.TFrame", {"background": "#2d3339"}),
+            ("AboutTitle.TLabel", {"background": "#2d3339", "foreground": "#ffffff", "font": ("Segoe UI", 24, "bold")}),
+            ("AboutVersion.TLabel", {"background": "#2d3339", "foreground": "#6c757d", "font": ("Segoe UI", 12)}),
+            ("AboutContent.TLabel", {"background": "#2d3339", "foreground": "#ffffff", "font": ("Segoe UI", 12)}),
+            ("AboutDeveloperTitle.TLabel", {"background": "#2d3339", "foreground": "#6c757d", "font": ("Segoe UI", 14, "bold")}),
+            # Separators
+            ("TSeparator", {"background": "#495057"}),
+            # Notebook and tabs
+            ("TNotebook", {"background": "#1e1e1e", "borderwidth": 0}),
+            ("TNotebook.Tab", {"background": "#2d2d2d", "foreground": "#ffffff",
+                               "padding": [10, 2], "font": ("Segoe UI", 11)}),
+            # RTL styles for Arabic
+            ("RTL.TLabel", {"background": "#1e1e1e", "foreground": "#ffffff"}),
+            ("RTL.Title.TLabel", {"background": "#1e1e1e", "foreground": "#ffffff"}),
+            ("RTL.Header.TLabel", {"background": "#1e1e1e", "foreground": "#ffffff"}),
+            ("RTL.Content.TLabel", {"background": "#1e1e1e", "foreground": "#ffffff"}),
+            ("RTL.Status.TLabel", {"background": "#1e1e1e", "foreground": "#ffffff"}),
+            # RTL styles for About tab
+            ("RTL.AboutTitle.TLabel", {"background": "#2d3339", "foreground": "#ffffff", "font": ("Dubai", 24, "bold"), "justify": "right"}),
+            ("RTL.AboutContent.TLabel", {"background": "#2d3339", "foreground": "#ffffff", "font": ("Dubai", 14), "justify": "right"}),
+            ("RTL.AboutDeveloperTitle.TLabel", {"background": "#2d3339", "foreground": "#6c757d", "font": ("Dubai", 16, "bold"), "justify": "right"}),
+        ],
+        "map": [
+            ("TNotebook.Tab", {"background": [("selected", "#3d3d3d")],
+                               "foreground": [("selected", "#ffffff")]}),
+        ],
+    },
+    "light": {
+        "root_bg": "#f0f0f0",
+        "listbox": {"bg": "#ffffff", "fg": "#000000"},
+        "configure": [
+            ("TFrame", {"background": "#f0f0f0"}),
+            ("TLabel", {"background": "#f0f0f0", "foreground": "#000000"}),
+            ("TLabelframe", {"background": "#f0f0f0", "foreground": "#000000"}),
+            ("TLabelframe.Label", {"background": "#f0f0f0", "foreground": "#000000"}),
+            ("TButton", {"background": "#e1e1e1", "foreground": "#000000"}),
+            # Card frames in About tab
+            ("Card.TFrame", {"background": "#ffffff"}),
+            # Special styles for About tab
+            ("About.TFrame", {"background": "#f0f0f0"}),
+            ("AboutCard.TFrame", {"background": "#ffffff"}),
+            ("AboutTitle.TLabel", {"background": "#ffffff", "foreground": "#212529", "font": ("Segoe UI", 24, "bold")}),
+            ("AboutVersion.TLabel", {"background": "#ffffff", "foreground": "#6c757d", "font": ("Segoe UI", 12)}),
+            ("AboutContent.TLabel", {"background": "#ffffff", "foreground": "#212529", "font": ("Segoe UI", 12)}),
+            ("AboutDeveloperTitle.TLabel", {"background": "#ffffff", "foreground": "#6c757d", "font": ("Segoe UI", 14, "bold")}),
+            # Separators
+            ("TSeparator", {"background": "#dee2e6"}),
+            # Notebook and tabs
+            ("TNotebook", {"background": "#f0f0f0", "borderwidth": 0}),
+            ("TNotebook.Tab", {"background": "#e1e1e1", "foreground": "#000000",
+                               "padding": [10, 2], "font": ("Segoe UI", 11)}),
+            # RTL styles for Arabic
+            ("RTL.TLabel", {"background": "#f0f0f0", "foreground": "#000000"}),
+            ("RTL.Title.TLabel", {"background": "#f0f0f0", "foreground": "#000000"}),
+            ("RTL.Header.TLabel", {"background": "#f0f0f0", "foreground": "#000000"}),
+            ("RTL.Content.TLabel", {"background": "#f0f0f0", "foreground": "#000000"}),
+            ("RTL.Status.TLabel", {"background": "#f0f0f0", "foreground": "#000000"}),
+            # RTL styles for About tab
+            ("RTL.AboutTitle.TLabel", {"background": "#ffffff", "foreground": "#212529", "font": ("Dubai", 24, "bold"), "justify": "right"}),
+            ("RTL.AboutContent.TLabel", {"background": "#ffffff", "foreground": "#212529", "font": ("Dubai", 14), "justify": "right"}),
+            ("RTL.AboutDeveloperTitle.TLabel", {"background": "#ffffff", "foreground": "#6c757d", "font": ("Dubai", 16, "bold"), "justify": "right"}),
+        ],
+        "map": [
+            ("TNotebook.Tab", {"background": [("selected", "#ffffff")],
+                               "foreground": [("selected", "#000000")]}),
+        ],
+    },
+}
+
+
+class ThemeManager:
+    """
+    Applies the system theme to a Tk root window.
+
+    Styles are only pushed to Tk when the mode reported by the source differs
+    from the one already applied, so steady state causes no relayout.
+
+    Args:
+        root: The Tk root window
+        source (ThemeSource): Where the current mode is read from
+        poll_interval (int): Milliseconds between checks when the source cannot notify
+    """
+
+    def __init__(self, root, source, poll_interval=5000):
+        self.root = root
+        self.source = source
+        self.poll_interval = poll_interval
+        self.mode = None
+        self._listeners = []
+        self._poll_job = None
+
+        # Select the base theme once; styles below are configured on top of it
+        from tkinter import ttk
+        self.style = ttk.Style(root)
+        self.style.theme_use("clam")
+
+    @property
+    def is_dark(self):
+        return self.mode == "dark"
+
+    @property
+    def palette(self):
+        """The style table for the applied mode"""
+        return STYLE_TABLES[self.mode or "light"]
+
+    def add_listener(self, listener):
+        """Call listener(palette) after a new mode was applied"""
+        self._listeners.append(listener)
+
+    def apply(self, force=False):
+        """
+        Apply the current system mode if it changed.
+
+        Returns:
+            bool: True if styles were pushed to Tk
+        """
+        mode = "dark" if self.source.is_dark() else "light"
+        if mode == self.mode and not force:
+            return False
+
+        self.mode = mode
+        table = STYLE_TABLES[mode]
+        self.root.configure(bg=table["root_bg"])
+        for style_name, options in table["configure"]:
+            self.style.configure(style_name, **options)
+        for style_name, options in table["map"]:
+            self.style.map(style_name, **options)
+
+        for listener in self._listeners:
+            listener(table)
+        return True
+
+    def start(self):
+        """Start following system theme changes"""
+        if not self.source.watch(self._on_source_changed):
+            self._poll()
+
+    def close(self):
+        """Stop following system theme changes"""
+        if self._poll_job is not None:
+            try:
+                self.root.after_cancel(self._poll_job)
+            except Exception:
+                pass
+            self._poll_job = None
+        self.source.close()
+
+    def _on_source_changed(self):
+        # May be called from a watcher thread, hop onto the Tk event loop
+        try:
+            self.root.after(0, self.apply)
+        except Exception:
+            pass
+
+    def _poll(self):
+        self.apply()
+        self._poll_job = self.root.after(self.poll_interval, self._poll)